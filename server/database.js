@@ -6,6 +6,12 @@ const fs = require('fs');
 let db = null;
 let isTurso = false;
 
+// SQL_TRACE_FILE: append every query/get/run with its parameters and duration as JSON lines
+// (read by tests/sql_audit.py). Parameters are logged verbatim, so only use it against test data.
+const traceStream = process.env.SQL_TRACE_FILE
+  ? fs.createWriteStream(process.env.SQL_TRACE_FILE, { flags: 'a' })
+  : null;
+
 const init = async () => {
   try {
     // Check if we're using Turso (production) or local SQLite (development)
@@ -43,7 +49,8 @@ const init = async () => {
       console.log('   (Set TURSO_DATABASE_URL and TURSO_AUTH_TOKEN to use Turso)');
       
       const sqlite3 = require('sqlite3').verbose();
-      const dbPath = path.join(__dirname, 'financial_tracker.db');
+      // DB_PATH lets the test harness point the server at a snapshot of a template database
+      const dbPath = process.env.DB_PATH || path.join(__dirname, 'financial_tracker.db');
       
       // Ensure database directory exists
       const dbDir = path.dirname(dbPath);
@@ -529,10 +536,30 @@ const run = (sql, params = []) => {
   });
 };
 
+const traced = (kind, fn) => {
+  if (!traceStream) return fn;
+  return (sql, params = []) => {
+    const start = process.hrtime.bigint();
+    const record = (error) => {
+      traceStream.write(JSON.stringify({
+        kind,
+        sql,
+        params,
+        ms: Number(process.hrtime.bigint() - start) / 1e6,
+        error: error ? error.message : undefined
+      }) + '\n');
+    };
+    return fn(sql, params).then(
+      result => { record(); return result; },
+      err => { record(err); throw err; }
+    );
+  };
+};
+
 module.exports = {
   init,
-  query,
-  get,
-  run,
+  query: traced('query', query),
+  get: traced('get', get),
+  run: traced('run', run),
   get db() { return db; }
 };
@@ -0,0 +1,65 @@
+"""
+HTTP client for the Financial Planner REST API
+Lets fixtures talk to the backend directly instead of driving the UI
+"""
+import requests
+
+
+class ApiError(Exception):
+    """Raised when the API answers with an unexpected status code"""
+
+    def __init__(self, response, message=None):
+        self.response = response
+        self.status_code = response.status_code
+        try:
+            body = response.json()
+            detail = body.get('message') or body.get('error') or body
+        except ValueError:
+            detail = response.text[:200]
+        super().__init__(message or f"{response.request.method} {response.url} -> {response.status_code}: {detail}")
+
+
+class ApiClient:
+    """Pooled requests.Session bound to the API base URL and an optional JWT"""
+
+    def __init__(self, api_url, token=None, timeout=30):
+        self.api_url = api_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.token = None
+        if token:
+            self.set_token(token)
+
+    def set_token(self, token):
+        """Authenticate every following request with this JWT"""
+        self.token = token
+        self.session.headers['Authorization'] = f"Bearer {token}"
+
+    def request(self, method, path, expected=(200,), **kwargs):
+        """Send a request and raise ApiError unless the status is expected"""
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.request(method, f"{self.api_url}/{path.lstrip('/')}", **kwargs)
+        if expected and response.status_code not in expected:
+            raise ApiError(response)
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request('GET', path, **kwargs)
+
+    def post(self, path, json=None, **kwargs):
+        return self.request('POST', path, json=json, **kwargs)
+
+    def put(self, path, json=None, **kwargs):
+        return self.request('PUT', path, json=json, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request('DELETE', path, **kwargs)
+
+    def login(self, email, password):
+        """Log in via POST /api/auth/login and keep the returned token"""
+        data = self.post('auth/login', json={'email': email, 'password': password}).json()
+        self.set_token(data['token'])
+        return data
+
+    def close(self):
+        self.session.close()
@@ -0,0 +1,134 @@
+"""
+Local Express server for isolated test runs
+Starts server/index.js against a private copy of a template SQLite database and restores that copy between test modules
+"""
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import time
+
+import requests
+
+SERVER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server')
+
+# Server env that would point it at a database other than the snapshot
+DROPPED_ENV = ('TURSO_DATABASE_URL', 'TURSO_AUTH_TOKEN', 'DATABASE_URL')
+
+
+def free_port():
+    """A TCP port nothing is listening on right now"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+class DatabaseSnapshot:
+    """Working copy of a template database that can be put back to the template's state"""
+
+    def __init__(self, template, path):
+        if not os.path.exists(template):
+            raise FileNotFoundError(f"Template database {template} not found - build one with datagen.py")
+        self.template = os.path.abspath(template)
+        self.path = os.path.abspath(str(path))
+        self.restores = 0
+        self.dirty = False
+
+    def create(self):
+        """Plain file copy; only safe while nothing has the working copy open"""
+        start = time.perf_counter()
+        shutil.copyfile(self.template, self.path)
+        self.dirty = False
+        return time.perf_counter() - start
+
+    def restore(self):
+        """Overwrite the working copy with the template through the SQLite backup API
+
+        Unlike a file copy this is safe while the server holds the database open: the backup
+        takes the write lock and the server's connection sees the new pages on its next query.
+        """
+        start = time.perf_counter()
+        source = sqlite3.connect(f"file:{self.template}?mode=ro", uri=True)
+        target = sqlite3.connect(self.path, timeout=30)
+        try:
+            source.backup(target)
+        finally:
+            target.close()
+            source.close()
+        self.restores += 1
+        self.dirty = False
+        return time.perf_counter() - start
+
+
+class AppServer:
+    """`node index.js` on a given port and database file"""
+
+    def __init__(self, db_path, port=None, log_path=None, env=None, inspect_port=None):
+        self.db_path = db_path
+        self.port = port or free_port()
+        self.inspect_port = inspect_port
+        self.cwd = SERVER_DIR
+        self.log_path = log_path or os.path.splitext(db_path)[0] + '.server.log'
+        self.extra_env = env or {}
+        self.process = None
+        self._log = None
+
+    @property
+    def url(self):
+        return f"http://localhost:{self.port}"
+
+    def environment(self):
+        env = {key: value for key, value in os.environ.items() if key not in DROPPED_ENV}
+        env.update({
+            'DB_PATH': self.db_path,
+            'PORT': str(self.port),
+            'NODE_ENV': 'development',
+            'DISABLE_RATE_LIMIT': 'true',
+        })
+        env.update(self.extra_env)
+        return env
+
+    def start(self, timeout=60):
+        """Launch the server and wait for /health"""
+        self._log = open(self.log_path, 'w', encoding='utf-8')
+        command = ['node', 'index.js']
+        if self.inspect_port:
+            # Inspector for CPU profiling; loopback only, it allows running arbitrary code
+            command.insert(1, f"--inspect=127.0.0.1:{self.inspect_port}")
+        self.process = subprocess.Popen(
+            command, cwd=self.cwd, env=self.environment(),
+            stdout=self._log, stderr=subprocess.STDOUT
+        )
+        try:
+            self.wait_until_ready(timeout)
+        except Exception:
+            self.stop()
+            raise
+        return self
+
+    def wait_until_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited with code {self.process.returncode}; see {self.log_path}")
+            try:
+                if requests.get(f"{self.url}/health", timeout=1).ok:
+                    return
+            except requests.RequestException:
+                pass
+            time.sleep(0.2)
+        raise TimeoutError(f"Server on port {self.port} not ready after {timeout}s; see {self.log_path}")
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+        self.process = None
+        if self._log:
+            self._log.close()
+            self._log = None
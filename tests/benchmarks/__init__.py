@@ -0,0 +1,4 @@
+"""
+Performance benchmarks for the Financial Planner backend and UI
+Run with: python -m benchmarks.<name>
+"""
@@ -0,0 +1,154 @@
+"""
+GET /api/dashboard latency as a user's history grows
+Seeds one user per size straight into SQLite, times the endpoint and reports the scaling curve
+
+Run with: python -m benchmarks.dashboard_scaling --sizes 1000,10000,100000
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+from api_client import ApiClient
+from db_seed import connect, create_user, delete_user, hash_password, seed_financial_history
+from perf_stats import summarize, fmt_ms
+from settings import BACKEND_URL, SQLITE_DB_PATH
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+BENCH_PASSWORD = 'Bench1234!@#$'
+
+
+def time_endpoint(client, path, samples, warmup):
+    """Latencies in ms of `samples` sequential requests after `warmup` unmeasured ones"""
+    for _ in range(warmup):
+        client.get(path)
+    latencies = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def scaling_exponent(size_a, ms_a, size_b, ms_b):
+    """Log-log slope between two points: ~0 flat, ~1 linear, >1 super-linear"""
+    if not ms_a or not ms_b or size_a == size_b:
+        return None
+    return math.log(ms_b / ms_a) / math.log(size_b / size_a)
+
+
+def run_benchmark(db_path, api_url, sizes, samples=20, warmup=3, keep_data=False):
+    """Seed a user per size, time the dashboard and return the report dict"""
+    conn = connect(db_path)
+    password_hash = hash_password(BENCH_PASSWORD)
+    results = []
+    try:
+        for size in sizes:
+            user_id, email = create_user(conn, BENCH_PASSWORD, name=f"Dashboard benchmark {size}", password_hash=password_hash)
+            try:
+                seed_start = time.perf_counter()
+                seed_financial_history(conn, user_id, expenses=size, income=size, seed=size)
+                seed_s = time.perf_counter() - seed_start
+
+                client = ApiClient(api_url)
+                try:
+                    client.login(email, BENCH_PASSWORD)
+                    stats = summarize(time_endpoint(client, 'dashboard', samples, warmup))
+                finally:
+                    client.close()
+            finally:
+                if not keep_data:
+                    delete_user(conn, user_id)
+
+            results.append({
+                'expenses': size,
+                'income': size,
+                'seed_s': seed_s,
+                'p50_ms': stats['p50'],
+                'p95_ms': stats['p95'],
+                'max_ms': stats['max'],
+            })
+            print(f"  {size:>9,} rows: p50 {fmt_ms(stats['p50'])} ms, p95 {fmt_ms(stats['p95'])} ms (seeded in {seed_s:.1f}s)")
+    finally:
+        conn.close()
+
+    for previous, current in zip(results, results[1:]):
+        current['exponent'] = scaling_exponent(previous['expenses'], previous['p50_ms'], current['expenses'], current['p50_ms'])
+
+    return {'endpoint': 'GET /api/dashboard', 'api_url': api_url, 'samples': samples, 'results': results}
+
+
+def compare_to_baseline(report, baseline, tolerance):
+    """p50 regressions beyond `tolerance` (fraction) against a previous report"""
+    previous = {row['expenses']: row for row in baseline.get('results', [])}
+    regressions = []
+    for row in report['results']:
+        old = previous.get(row['expenses'])
+        if old and old.get('p50_ms') and row['p50_ms'] > old['p50_ms'] * (1 + tolerance):
+            change = (row['p50_ms'] / old['p50_ms'] - 1) * 100
+            regressions.append(
+                f"{row['expenses']:,} rows: p50 {fmt_ms(row['p50_ms'])} ms vs baseline {fmt_ms(old['p50_ms'])} ms (+{change:.0f}%)"
+            )
+    return regressions
+
+
+def format_report(report):
+    """Scaling curve as a plain-text table"""
+    lines = [
+        f"{report['endpoint']} scaling ({report['samples']} samples per size)",
+        f"{'Rows':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'exponent':>10}",
+    ]
+    for row in report['results']:
+        exponent = row.get('exponent')
+        lines.append(
+            f"{row['expenses']:>10,}{fmt_ms(row['p50_ms']):>10}{fmt_ms(row['p95_ms']):>10}{fmt_ms(row['max_ms']):>10}"
+            f"{'-' if exponent is None else f'{exponent:.2f}':>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.dashboard_scaling", description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=",".join(str(s) for s in DEFAULT_SIZES), help="Comma-separated expense/income row counts")
+    parser.add_argument('--samples', type=int, default=20, help="Measured requests per size")
+    parser.add_argument('--warmup', type=int, default=3, help="Unmeasured requests per size")
+    parser.add_argument('--db-path', default=SQLITE_DB_PATH, help="SQLite file the server uses (default: %(default)s)")
+    parser.add_argument('--api-url', default=f"{BACKEND_URL}/api", help="API base URL (default: %(default)s)")
+    parser.add_argument('--output', help="Write the JSON report to this path")
+    parser.add_argument('--baseline', help="Previous JSON report to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.25, help="Allowed p50 growth vs baseline (default: %(default)s)")
+    parser.add_argument('--max-p50-ms', type=float, help="Fail if any size has a p50 above this")
+    parser.add_argument('--keep-data', action='store_true', help="Keep the benchmark users instead of deleting them")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    print(f"Benchmarking {args.api_url}/dashboard with {', '.join(f'{s:,}' for s in sizes)} rows per user")
+    report = run_benchmark(args.db_path, args.api_url, sizes, args.samples, args.warmup, args.keep_data)
+    print()
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.output}")
+
+    failures = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures += compare_to_baseline(report, json.load(f), args.tolerance)
+    if args.max_p50_ms is not None:
+        failures += [
+            f"{row['expenses']:,} rows: p50 {fmt_ms(row['p50_ms'])} ms exceeds {fmt_ms(args.max_p50_ms)} ms"
+            for row in report['results'] if row['p50_ms'] > args.max_p50_ms
+        ]
+    if failures:
+        print("\n❌ Dashboard performance regression:")
+        for failure in failures:
+            print(f"  - {failure}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
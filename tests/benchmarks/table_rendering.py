@@ -0,0 +1,206 @@
+"""
+Expenses and Income table rendering at scale, on a mobile viewport
+Seeds one user per row count straight into SQLite, then measures time to first row, full render,
+long tasks and scroll frame rate of /expenses and /income at 375x667
+
+Run with: python -m benchmarks.table_rendering --sizes 1000,10000,50000
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from api_client import ApiClient
+from browser_state import inject_auth
+from conftest import create_chrome_driver
+from db_seed import connect, create_user, delete_user, hash_password, seed_financial_history
+from perf_stats import percentile, fmt_ms
+from settings import API_URL, BASE_URL, SQLITE_DB_PATH
+from waits import TABLE_ROWS
+
+DEFAULT_SIZES = [1000, 10000, 50000]
+PAGES = ['expenses', 'income']
+BENCH_PASSWORD = 'Bench1234!@#$'
+MOBILE_VIEWPORT = {'width': 375, 'height': 667, 'deviceScaleFactor': 2, 'mobile': True}
+FRAME_MS = 1000 / 60
+
+# Beyond these a table needs virtualization or pagination
+MAX_RENDER_MS = 1000
+MAX_P95_FRAME_MS = 2 * FRAME_MS
+
+# Installed before the app boots: row-count changes of the table body, the paint after each one, and long tasks
+TABLE_OBSERVER_JS = """
+(function () {
+    if (window.__qaTable) { return; }
+    var t = window.__qaTable = { rows: 0, firstRow: null, lastChange: null, painted: null, longTasks: [] };
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (e) { t.longTasks.push([e.startTime, e.duration]); });
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {}
+    var observer = new MutationObserver(function () {
+        var rows = document.querySelectorAll('%s').length;
+        if (rows === t.rows) { return; }
+        t.rows = rows;
+        t.lastChange = performance.now();
+        if (rows && t.firstRow === null) { t.firstRow = t.lastChange; }
+        // Two frames later the rows have been laid out and painted
+        requestAnimationFrame(function () { requestAnimationFrame(function () { t.painted = performance.now(); }); });
+    });
+    document.addEventListener('DOMContentLoaded', function () {
+        observer.observe(document.body, { childList: true, subtree: true });
+    });
+})();
+""" % TABLE_ROWS
+
+# Scrolls the page a fixed distance per frame and returns the frame timestamps
+SCROLL_JS = """
+var done = arguments[arguments.length - 1];
+var duration = arguments[0], step = arguments[1];
+var scroller = document.scrollingElement;
+scroller.scrollTop = 0;
+var frames = [];
+function frame(ts) {
+    frames.push(ts);
+    scroller.scrollTop += step;
+    var atBottom = scroller.scrollTop + scroller.clientHeight >= scroller.scrollHeight;
+    if (ts - frames[0] < duration && !atBottom) { requestAnimationFrame(frame); } else { done(frames); }
+}
+requestAnimationFrame(function () { requestAnimationFrame(frame); });
+"""
+
+
+def frame_stats(frames):
+    """Frame rate, p95 frame time and dropped frames from requestAnimationFrame timestamps"""
+    intervals = [b - a for a, b in zip(frames, frames[1:])]
+    if not intervals:
+        return {'fps': None, 'p95_frame_ms': None, 'dropped_frames': 0}
+    return {
+        'fps': len(intervals) * 1000 / sum(intervals),
+        'p95_frame_ms': percentile(intervals, 95),
+        'dropped_frames': sum(max(0, round(interval / FRAME_MS) - 1) for interval in intervals),
+    }
+
+
+def measure_page(driver, base_url, page, expected_rows, timeout=180, scroll_ms=3000, scroll_step=60):
+    """One cold load of /<page>: render timings, long tasks during the load and scroll smoothness"""
+    driver.get(f"{base_url}/{page}")
+    deadline = time.monotonic() + timeout
+    while True:
+        state = driver.execute_script("return window.__qaTable || null;")
+        if state and state['rows'] >= expected_rows and state['painted'] and state['painted'] >= state['lastChange']:
+            break
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"/{page}: {state and state['rows']} of {expected_rows} rows after {timeout}s")
+        time.sleep(0.1)
+
+    long_tasks = [duration for start, duration in state['longTasks'] if start <= state['painted']]
+    driver.set_script_timeout(scroll_ms / 1000 + 30)
+    frames = driver.execute_async_script(SCROLL_JS, scroll_ms, scroll_step)
+    return dict(
+        frame_stats(frames),
+        first_row_ms=state['firstRow'],
+        render_ms=state['painted'],
+        long_tasks=len(long_tasks),
+        long_task_ms=sum(long_tasks),
+        max_long_task_ms=max(long_tasks, default=0),
+    )
+
+
+def median_run(runs):
+    """Per-metric median over repeated runs"""
+    return {key: statistics.median(run[key] for run in runs if run[key] is not None)
+            if any(run[key] is not None for run in runs) else None for key in runs[0]}
+
+
+def verdict(row):
+    if row['render_ms'] > MAX_RENDER_MS or (row['p95_frame_ms'] or 0) > MAX_P95_FRAME_MS:
+        return 'virtualize'
+    return 'ok'
+
+
+def run_benchmark(db_path, base_url, api_url, sizes, pages=PAGES, runs=3, keep_data=False):
+    """Seed a user per size, measure every page and return the report dict"""
+    conn = connect(db_path)
+    password_hash = hash_password(BENCH_PASSWORD)
+    driver = create_chrome_driver()
+    results = []
+    try:
+        driver.execute_cdp_cmd('Emulation.setDeviceMetricsOverride', MOBILE_VIEWPORT)
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': TABLE_OBSERVER_JS})
+        for size in sizes:
+            # Premium, so the free tier's monthly limits never hide rows
+            user_id, email = create_user(conn, BENCH_PASSWORD, name=f"Table benchmark {size}", tier='premium',
+                                         password_hash=password_hash)
+            try:
+                seed_financial_history(conn, user_id, expenses=size, income=size, accounts=1, seed=size)
+                client = ApiClient(api_url)
+                try:
+                    auth = client.login(email, BENCH_PASSWORD)
+                finally:
+                    client.close()
+                inject_auth(driver, base_url, auth['token'], auth['user'])
+
+                for page in pages:
+                    row = dict(median_run([measure_page(driver, base_url, page, size) for _ in range(runs)]),
+                               page=page, rows=size)
+                    row['verdict'] = verdict(row)
+                    results.append(row)
+                    print(f"  /{page} {size:>7,} rows: first row {fmt_ms(row['first_row_ms'])} ms, "
+                          f"rendered {fmt_ms(row['render_ms'])} ms, {row['fps'] or 0:.0f} fps scrolling")
+            finally:
+                if not keep_data:
+                    delete_user(conn, user_id)
+    finally:
+        driver.quit()
+        conn.close()
+
+    return {'viewport': MOBILE_VIEWPORT, 'runs': runs, 'results': results}
+
+
+def format_report(report):
+    """Per page and row count, as a plain-text table"""
+    viewport = report['viewport']
+    lines = [
+        f"Table rendering at {viewport['width']}x{viewport['height']} (median of {report['runs']} cold loads)",
+        f"{'Page':<11}{'Rows':>8}{'1st row ms':>12}{'render ms':>11}{'long tasks':>12}{'longest ms':>12}"
+        f"{'fps':>6}{'p95 frame':>11}{'dropped':>9}  verdict",
+    ]
+    for row in report['results']:
+        lines.append(
+            f"/{row['page']:<10}{row['rows']:>8,}{fmt_ms(row['first_row_ms']):>12}{fmt_ms(row['render_ms']):>11}"
+            f"{row['long_tasks']:>12.0f}{fmt_ms(row['max_long_task_ms']):>12}{row['fps'] or 0:>6.0f}"
+            f"{fmt_ms(row['p95_frame_ms']):>11}{row['dropped_frames']:>9.0f}  {row['verdict']}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.table_rendering", description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', default=",".join(str(s) for s in DEFAULT_SIZES), help="Comma-separated expense/income row counts")
+    parser.add_argument('--pages', default=",".join(PAGES), help="Pages to measure (default: %(default)s)")
+    parser.add_argument('--runs', type=int, default=3, help="Cold loads per page and size")
+    parser.add_argument('--db-path', default=SQLITE_DB_PATH, help="SQLite file the server uses (default: %(default)s)")
+    parser.add_argument('--base-url', default=BASE_URL, help="App URL (default: %(default)s)")
+    parser.add_argument('--api-url', default=API_URL, help="API base URL (default: %(default)s)")
+    parser.add_argument('--output', help="Write the JSON report to this path")
+    parser.add_argument('--keep-data', action='store_true', help="Keep the benchmark users instead of deleting them")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    pages = [p.strip().strip('/') for p in args.pages.split(",") if p.strip()]
+    print(f"Benchmarking {', '.join('/' + p for p in pages)} with {', '.join(f'{s:,}' for s in sizes)} rows")
+    report = run_benchmark(args.db_path, args.base_url, args.api_url, sizes, pages, args.runs, args.keep_data)
+    print()
+    print(format_report(report))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""
+Helpers that put the browser into a known application state without UI interaction
+"""
+import json
+from urllib.parse import urlparse
+
+# Matches the --window-size the Chrome/Edge drivers are started with
+DEFAULT_WINDOW_SIZE = (1920, 1080)
+
+# Preferences the theme and text-size controls persist, with the defaults they write back on every mount
+# (ThemeContext.js, TextSizeControl.js)
+UI_PREFERENCE_DEFAULTS = {
+    'themeName': 'light',
+    'textSize': 'medium',
+    'fontFamily': 'default',
+    'lineHeight': 'normal',
+    'alertColor': 'blue',
+    'warningColor': 'orange',
+}
+
+# The client keeps its session in localStorage (see client/src/context/AuthContext.js),
+# so seeding these two keys is all it takes to start authenticated.
+AUTH_STORAGE_SCRIPT = """
+try {{
+    window.localStorage.setItem('auth_token', {token});
+    window.localStorage.setItem('user', {user});
+}} catch (e) {{}}
+"""
+
+
+# Email of the user the app is logged in as, or null
+AUTHENTICATED_USER_JS = """
+try {
+    if (!window.localStorage.getItem('auth_token')) { return null; }
+    return (JSON.parse(window.localStorage.getItem('user') || '{}') || {}).email || null;
+} catch (e) { return null; }
+"""
+
+# Closes modals and the mobile menu through their overlay click handlers and drops UI preferences
+# that differ from the defaults. Returns true when one did: those are only read when the app boots.
+RESET_UI_JS = """
+document.querySelectorAll('.modal, .sidebar-overlay').forEach(function (overlay) { overlay.click(); });
+var defaults = arguments[0], dirty = false;
+Object.keys(defaults).forEach(function (key) {
+    var value = window.localStorage.getItem(key);
+    if (value !== null && value !== defaults[key]) { dirty = true; window.localStorage.removeItem(key); }
+});
+return dirty;
+"""
+
+# Client-side navigation: react-router's BrowserRouter follows popstate without reloading the page
+SPA_NAVIGATE_JS = """
+window.history.pushState({}, '', arguments[0]);
+window.dispatchEvent(new PopStateEvent('popstate', { state: window.history.state }));
+"""
+
+
+def supports_cdp(driver):
+    """Chrome and Edge expose the DevTools protocol; Safari does not"""
+    return hasattr(driver, 'execute_cdp_cmd')
+
+
+def inject_auth(driver, base_url, token, user, path='/dashboard'):
+    """Open `path` already logged in with a JWT obtained over HTTP"""
+    script = AUTH_STORAGE_SCRIPT.format(token=json.dumps(token), user=json.dumps(json.dumps(user)))
+
+    if supports_cdp(driver):
+        # Write the token before the app's own scripts run, so one page load is enough
+        identifier = driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': script})['identifier']
+        try:
+            driver.get(f"{base_url}{path}")
+        finally:
+            # Only this navigation should be authenticated; logout tests must still be able to log out
+            driver.execute_cdp_cmd('Page.removeScriptToEvaluateOnNewDocument', {'identifier': identifier})
+    else:
+        # localStorage is per-origin, so load any page of the app first
+        if not driver.current_url.startswith(base_url):
+            driver.get(f"{base_url}/login")
+        driver.execute_script(script)
+        driver.get(f"{base_url}{path}")
+
+    return driver
+
+
+def on_app(driver, base_url):
+    """Whether the browser is currently showing a page of the app"""
+    current, app = urlparse(driver.current_url), urlparse(base_url)
+    return (current.scheme, current.netloc) == (app.scheme, app.netloc)
+
+
+def authenticated_user(driver, base_url):
+    """Email of the user the app is logged in as, or None (also None when off the app)"""
+    if not on_app(driver, base_url):
+        return None
+    return driver.execute_script(AUTHENTICATED_USER_JS)
+
+
+def reset_viewport(driver, size=DEFAULT_WINDOW_SIZE):
+    """Undo device emulation and window resizes left behind by a previous test"""
+    if supports_cdp(driver):
+        driver.execute_cdp_cmd('Emulation.clearDeviceMetricsOverride', {})
+    width, height = size
+    current = driver.get_window_size()
+    if (current['width'], current['height']) != (width, height):
+        driver.set_window_size(width, height)
+
+
+def reset_app_state(driver, base_url, path='/dashboard'):
+    """Bring a reused, logged-in browser back to a clean state at `path` without a new session
+
+    Resets the viewport, closes modals and the mobile menu, clears changed theme/text-size preferences
+    and routes client-side. Only reloads when a preference differed from its default. Returns whether it reloaded.
+    """
+    reset_viewport(driver)
+    if not on_app(driver, base_url):
+        driver.get(f"{base_url}{path}")
+        return True
+
+    if driver.execute_script(RESET_UI_JS, UI_PREFERENCE_DEFAULTS):
+        driver.get(f"{base_url}{path}")
+        return True
+
+    if urlparse(driver.current_url).path != path:
+        driver.execute_script(SPA_NAVIGATE_JS, path)
+    return False
@@ -0,0 +1,121 @@
+"""
+Performance budgets and baseline comparison
+Limits live in perf_budgets.json; the baseline is the p50 of the last green run
+"""
+import json
+import os
+import time
+
+from perf_stats import summarize, fmt_ms
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+BUDGETS_PATH = os.path.join(TESTS_DIR, 'perf_budgets.json')
+BASELINE_PATH = os.getenv('TEST_PERF_BASELINE', os.path.join(TESTS_DIR, 'perf_baseline.json'))
+
+# Budget key -> measured metric, per section
+ROUTE_LIMITS = {'max_ttfb_ms': 'ttfb_ms', 'max_dom_content_loaded_ms': 'dom_content_loaded_ms'}
+API_LIMITS = {'max_ttfb_ms': 'ttfb_ms', 'max_payload_bytes': 'payload_bytes'}
+SECTION_LIMITS = {'routes': ROUTE_LIMITS, 'api': API_LIMITS}
+
+
+def load_json(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_budgets(path=BUDGETS_PATH):
+    """Budgets file as a dict with 'routes', 'api' and 'baseline' sections"""
+    return load_json(path)
+
+
+def measure_endpoint(client, path, samples=5, warmup=1):
+    """Time-to-first-byte and JSON payload size of GET /api/<path>, summarized over `samples` requests"""
+    for _ in range(warmup):
+        client.get(path)
+    ttfb, sizes = [], []
+    for _ in range(samples):
+        start = time.perf_counter()
+        response = client.get(path, stream=True)
+        # Headers are in once get() returns with stream=True; the body is read afterwards
+        ttfb.append((time.perf_counter() - start) * 1000)
+        sizes.append(len(response.content))
+    return {'ttfb_ms': summarize(ttfb), 'payload_bytes': summarize(sizes)}
+
+
+def _fmt(metric, value):
+    return f"{value:,.0f} B" if metric.endswith('bytes') else f"{fmt_ms(value)} ms"
+
+
+def check_limits(name, measured, limits, metric_map, stat='p95'):
+    """Violations of one route's or endpoint's budget (compares the given percentile)"""
+    violations = []
+    for key, limit in limits.items():
+        metric = metric_map.get(key)
+        value = (measured.get(metric) or {}).get(stat) if metric else None
+        if value is not None and value > limit:
+            violations.append(f"{name}: {metric} {stat} {_fmt(metric, value)} exceeds budget {_fmt(metric, limit)}")
+    return violations
+
+
+def check_budgets(timings, budgets):
+    """Every budget violation in a perf_timings.json document"""
+    violations = []
+    for section, metric_map in SECTION_LIMITS.items():
+        measured = timings.get(section, {})
+        for name, limits in budgets.get(section, {}).items():
+            if name in measured:
+                violations += check_limits(name, measured[name], limits, metric_map)
+    return violations
+
+
+def baseline_snapshot(timings):
+    """p50 of every budgeted metric, stored as the baseline after a green run"""
+    snapshot = {}
+    for section, metric_map in SECTION_LIMITS.items():
+        snapshot[section] = {
+            name: {metric: (values.get(metric) or {}).get('p50') for metric in metric_map.values()}
+            for name, values in timings.get(section, {}).items()
+        }
+    return snapshot
+
+
+def compare_to_baseline(timings, baseline, settings):
+    """p50 regressions beyond the tolerance in the budgets file's 'baseline' section"""
+    tolerance = settings.get('tolerance', 0.25)
+    regressions = []
+    for section, metric_map in SECTION_LIMITS.items():
+        previous = baseline.get(section, {})
+        for name, values in timings.get(section, {}).items():
+            for metric in metric_map.values():
+                old = (previous.get(name) or {}).get(metric)
+                new = (values.get(metric) or {}).get('p50')
+                if not old or new is None:
+                    continue
+                # Ignore changes too small to matter, however large relative to a tiny baseline
+                min_delta = settings.get('min_delta_bytes' if metric.endswith('bytes') else 'min_delta_ms', 0)
+                if new > old * (1 + tolerance) and new - old > min_delta:
+                    regressions.append(
+                        f"{name}: {metric} p50 {_fmt(metric, new)} vs baseline {_fmt(metric, old)} "
+                        f"(+{(new / old - 1) * 100:.0f}%)"
+                    )
+    return regressions
+
+
+def evaluate(timings_path, budgets_path=BUDGETS_PATH, baseline_path=BASELINE_PATH):
+    """Budget violations and baseline regressions for a finished run"""
+    timings = load_json(timings_path)
+    budgets = load_budgets(budgets_path)
+    violations = check_budgets(timings, budgets)
+    regressions = []
+    if os.path.exists(baseline_path):
+        regressions = compare_to_baseline(timings, load_json(baseline_path), budgets.get('baseline', {}))
+    return violations, regressions
+
+
+def write_baseline(timings_path, baseline_path=BASELINE_PATH):
+    """Store this run's p50 values as the new baseline, keeping entries a partial run did not measure"""
+    baseline = load_json(baseline_path) if os.path.exists(baseline_path) else {}
+    for section, values in baseline_snapshot(load_json(timings_path)).items():
+        baseline.setdefault(section, {}).update(values)
+    with open(baseline_path, 'w', encoding='utf-8') as f:
+        json.dump(baseline, f, indent=2)
@@ -0,0 +1,252 @@
+"""
+Change-aware test selection
+Maps client pages, CSS files and server route handlers to the test modules that exercise them,
+so a pre-merge run only covers what a diff can have broken (plus a smoke core)
+
+Standalone: python change_map.py origin/main
+"""
+import os
+import re
+import subprocess
+import sys
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+CLIENT_SRC = 'client/src/'
+
+# Always run: proves login and the main page still work whatever the change
+SMOKE_CORE = [
+    'test_api_smoke.py',
+    'test_authentication.py::TestAuthentication::test_login_with_valid_credentials',
+    'test_dashboard.py::TestDashboard::test_dashboard_loads',
+]
+
+# Files the runners and tools write under tests/: never a reason to run anything
+RUNTIME_ARTIFACTS = {
+    'tests/perf_timings.json', 'tests/perf_baseline.json', 'tests/test_durations.json', 'tests/perf_history.db',
+    'tests/template.db', 'tests/template.json', 'tests/junit.xml',
+}
+RUNTIME_DIRS = ('tests/har/', 'tests/server_profiles/', 'tests/endurance/', 'tests/.build_cache/')
+
+# Changes here can break any test: run the whole suite
+RUN_ALL = {
+    'client/package.json', 'client/src/App.js', 'client/src/index.js', 'client/src/App.css', 'client/src/index.css',
+    'client/src/setupProxy.js', 'client/src/services/api.js', 'client/src/context/AuthContext.js',
+    'client/src/components/AuthGuard.js', 'client/src/components/Layout.js', 'client/src/components/Layout.css',
+    'server/package.json', 'server/index.js', 'server/database.js', 'server/middleware/auth.js',
+    'server/routes/index.js', 'tests/requirements.txt',
+}
+
+# Client sources -> test modules that render them. Pages listed with no tests are covered by the smoke core only.
+CLIENT_TESTS = {
+    'client/src/pages/Login.js': ['test_authentication.py'],
+    'client/src/pages/Register.js': ['test_authentication.py'],
+    'client/src/pages/ForgotPassword.js': ['test_authentication.py'],
+    'client/src/pages/ResetPassword.js': ['test_authentication.py'],
+    'client/src/pages/VerifyEmail.js': ['test_authentication.py'],
+    'client/src/pages/CompleteProfile.js': ['test_authentication.py'],
+    'client/src/pages/Dashboard.js': ['test_dashboard.py', 'test_ui_customization.py'],
+    'client/src/pages/DashboardEnhanced.js': ['test_dashboard.py', 'test_ui_customization.py'],
+    'client/src/pages/BankAccounts.js': ['test_bank_accounts.py', 'test_dashboard.py', 'test_subscription_limits.py'],
+    'client/src/pages/CreditDebt.js': ['test_credit_debt.py', 'test_subscription_limits.py'],
+    'client/src/pages/CreditCards.js': ['test_credit_debt.py', 'test_subscription_limits.py'],
+    'client/src/pages/Expenses.js': ['test_expenses_income.py', 'test_mobile_table_visibility.py'],
+    'client/src/pages/Income.js': ['test_expenses_income.py', 'test_mobile_table_visibility.py'],
+    'client/src/pages/Upgrade.js': ['test_subscription_limits.py'],
+    'client/src/pages/Savings.js': [],
+    'client/src/pages/Stocks.js': [],
+    'client/src/pages/Budget.js': [],
+    'client/src/pages/FinancialGoals.js': [],
+    'client/src/pages/BillReminders.js': [],
+    'client/src/pages/Installments.js': [],
+    'client/src/pages/Loans.js': [],
+    'client/src/components/Navbar.js': ['test_navigation.py', 'test_ui_customization.py'],
+    'client/src/components/Navbar.css': ['test_navigation.py', 'test_ui_customization.py'],
+    'client/src/components/TextSizeControl.js': ['test_ui_customization.py'],
+    'client/src/components/TextSizeControl.css': ['test_ui_customization.py'],
+    'client/src/components/ExportButton.js': ['test_dashboard.py'],
+    'client/src/components/PremiumBanner.js': ['test_subscription_limits.py'],
+    'client/src/components/PremiumFeature.js': ['test_subscription_limits.py'],
+    'client/src/context/ThemeContext.js': ['test_ui_customization.py'],
+    'client/src/utils/currencyConverter.js': ['test_dashboard.py', 'test_expenses_income.py'],
+    'client/src/utils/exportUtils.js': ['test_dashboard.py'],
+    'client/src/utils/banksData.js': ['test_bank_accounts.py'],
+    'client/src/mobile.css': ['test_mobile_table_visibility.py', 'test_navigation.py'],
+}
+
+# API resource (first path segment of a handler in server/routes/*.js) -> test modules that call it
+API_TESTS = {
+    'subscription': ['test_subscription_limits.py', 'test_perf_budgets.py'],
+    'bank-accounts': ['test_bank_accounts.py', 'test_dashboard.py', 'test_subscription_limits.py', 'test_perf_budgets.py'],
+    'credit-cards': ['test_credit_debt.py', 'test_subscription_limits.py', 'test_perf_budgets.py'],
+    'debit-cards': ['test_credit_debt.py'],
+    'expenses': ['test_expenses_income.py', 'test_mobile_table_visibility.py', 'test_perf_budgets.py'],
+    'income': ['test_expenses_income.py', 'test_mobile_table_visibility.py', 'test_perf_budgets.py'],
+    'dashboard': ['test_dashboard.py', 'test_ui_customization.py', 'test_perf_budgets.py'],
+    'export': ['test_dashboard.py'],
+    'financial-goals': ['test_perf_budgets.py'],
+    'loans': ['test_perf_budgets.py'],
+    'savings': [],
+    'stocks': [],
+    'budget': [],
+    'installments': [],
+    'bill-reminders': [],
+    # auth.js
+    'register': ['test_authentication.py'],
+    'verify-email': ['test_authentication.py'],
+    'resend-verification': ['test_authentication.py'],
+    'forgot-password': ['test_authentication.py'],
+    'reset-password': ['test_authentication.py'],
+    'google': ['test_authentication.py'],
+    'complete-profile': ['test_authentication.py'],
+    'me': ['test_authentication.py'],
+}
+# Handlers every test depends on (the fixtures log in through them)
+API_RUN_ALL = {'login'}
+
+# Whole server files without per-handler mapping
+SERVER_TESTS = {
+    'server/routes/stripe.js': ['test_subscription_limits.py'],
+    'server/middleware/subscription.js': ['test_subscription_limits.py', 'test_bank_accounts.py', 'test_credit_debt.py'],
+}
+
+ROUTE_HANDLER = re.compile(r"^router\.(?:get|post|put|patch|delete)\(\s*['\"]/([^/'\"?:]*)")
+HUNK = re.compile(r"^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@")
+
+
+def git(*args, cwd=TESTS_DIR):
+    return subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def repo_root():
+    return git('rev-parse', '--show-toplevel').strip()
+
+
+def changed_files(ref, root):
+    """Files changed between `ref` and the working tree, plus untracked files, leaving out runtime artifacts"""
+    # NUL-separated: tracked paths can contain spaces
+    files = git('diff', '--name-only', '-z', ref, cwd=root).split('\0')
+    files += git('ls-files', '--others', '--exclude-standard', '-z', cwd=root).split('\0')
+    return sorted({path for path in files if path and path not in RUNTIME_ARTIFACTS and not path.startswith(RUNTIME_DIRS)})
+
+
+def changed_lines(ref, path, root):
+    """Line numbers touched in the working-tree version of `path` (deletions count as the line after them)"""
+    lines = set()
+    for line in git('diff', '-U0', ref, '--', path, cwd=root).splitlines():
+        match = HUNK.match(line)
+        if match:
+            start, count = int(match.group(1)), int(match.group(2) or 1)
+            lines.update(range(start, start + max(count, 1)))
+    return lines
+
+
+def route_handlers(source):
+    """[(first_line, resource)] for each router.<method>('/resource...') in an Express routes file"""
+    handlers = []
+    for number, line in enumerate(source.splitlines(), 1):
+        match = ROUTE_HANDLER.match(line.strip())
+        if match:
+            handlers.append((number, match.group(1)))
+    return handlers
+
+
+def touched_resources(source, lines):
+    """API resources whose handler bodies contain any of `lines`; None if a change is outside every handler"""
+    handlers = route_handlers(source)
+    resources = set()
+    for line in lines:
+        owner = None
+        for start, resource in handlers:
+            if start <= line:
+                owner = resource
+        if owner is None:
+            # Imports or shared helpers above the first handler
+            return None
+        resources.add(owner)
+    return resources
+
+
+def importers_of(css_path, root):
+    """Client source files that import the given stylesheet"""
+    name = os.path.basename(css_path)
+    pattern = re.compile(r"import\s+['\"][./\w-]*" + re.escape(name) + r"['\"]")
+    folder = os.path.dirname(css_path)
+    importers = []
+    for filename in os.listdir(os.path.join(root, folder)):
+        if filename.endswith('.js'):
+            with open(os.path.join(root, folder, filename), encoding='utf-8') as f:
+                if pattern.search(f.read()):
+                    importers.append(f"{folder}/{filename}")
+    return importers
+
+
+def tests_for_file(path, ref, root):
+    """(test modules, reason) for one changed file; modules is None when everything must run"""
+    if path in RUN_ALL:
+        return None, "shared by every page"
+    if path.startswith('tests/'):
+        name = path[len('tests/'):]
+        if re.fullmatch(r'test_\w+\.py', name):
+            return [name], "test module changed"
+        if name.endswith('.py') or name.endswith('.json'):
+            return None, "test infrastructure changed"
+        return [], "not code"
+    if path in CLIENT_TESTS:
+        return CLIENT_TESTS[path], "client source"
+    if path.startswith(CLIENT_SRC) and path.endswith('.css'):
+        modules = set()
+        for importer in importers_of(path, root):
+            found, _ = tests_for_file(importer, ref, root)
+            if found is None:
+                return None, f"stylesheet of {importer}"
+            modules.update(found)
+        return sorted(modules), "stylesheet"
+    if path in SERVER_TESTS:
+        return SERVER_TESTS[path], "server module"
+    if path.startswith('server/routes/') and path.endswith('.js'):
+        full_path = os.path.join(root, path)
+        if not os.path.exists(full_path):
+            return None, "route file removed"
+        with open(full_path, encoding='utf-8') as f:
+            resources = touched_resources(f.read(), changed_lines(ref, path, root))
+        if resources is None or resources & API_RUN_ALL or resources - set(API_TESTS):
+            return None, "route change outside mapped handlers"
+        return sorted({module for resource in resources for module in API_TESTS[resource]}), \
+            f"handlers: {', '.join(sorted(resources))}"
+    if path.startswith(CLIENT_SRC) or (path.startswith('server/') and path.endswith('.js')):
+        # Unknown application source: be safe
+        return None, "unmapped application source"
+    return [], "not exercised by the UI suite"
+
+
+def select_tests(ref, root=None):
+    """(pytest targets relative to tests/, {file: reason}); targets is None when the full suite must run"""
+    root = root or repo_root()
+    modules, reasons = set(), {}
+    for path in changed_files(ref, root):
+        found, reason = tests_for_file(path, ref, root)
+        reasons[path] = reason
+        if found is None:
+            return None, reasons
+        modules.update(found)
+    modules = {m for m in modules if os.path.exists(os.path.join(TESTS_DIR, m))}
+    smoke = [nodeid for nodeid in SMOKE_CORE if nodeid.split('::', 1)[0] not in modules
+             and os.path.exists(os.path.join(TESTS_DIR, nodeid.split('::', 1)[0]))]
+    return sorted(modules) + smoke, reasons
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    ref = argv[0] if argv else 'HEAD'
+    targets, reasons = select_tests(ref)
+    for path, reason in reasons.items():
+        print(f"  {path}: {reason}")
+    if targets is None:
+        print("➡️  Full suite")
+    else:
+        print("➡️  " + " ".join(targets))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""
+Cached production build of the React client
+`npm run build` runs only when the client sources change; builds are kept per source hash
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+CLIENT_DIR = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'client'))
+CACHE_DIR = os.getenv('TEST_BUILD_CACHE', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.build_cache'))
+
+# Everything `react-scripts build` bakes into the bundle
+SOURCE_DIRS = ['src', 'public']
+SOURCE_FILES = ['package.json', 'package-lock.json', '.env', '.env.local', '.env.production', '.env.production.local']
+# Build-time settings that must not leak in from a developer's shell
+BUILD_ENV = {'REACT_APP_API_URL': '/api', 'GENERATE_SOURCEMAP': 'false'}
+
+
+def source_hash(client_dir=CLIENT_DIR):
+    """SHA-256 over the path and content of every build input"""
+    digest = hashlib.sha256()
+    paths = [os.path.join(client_dir, name) for name in SOURCE_FILES]
+    for folder in SOURCE_DIRS:
+        for root, dirs, files in os.walk(os.path.join(client_dir, folder)):
+            dirs.sort()
+            paths += [os.path.join(root, name) for name in sorted(files)]
+    for path in paths:
+        if os.path.isfile(path):
+            digest.update(os.path.relpath(path, client_dir).replace(os.sep, '/').encode())
+            with open(path, 'rb') as f:
+                digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()[:16]
+
+
+def client_build(cache_dir=CACHE_DIR, client_dir=CLIENT_DIR):
+    """Path of a production build for the current sources, building it only on a cache miss"""
+    key = source_hash(client_dir)
+    build_dir = os.path.join(cache_dir, key)
+    if os.path.exists(os.path.join(build_dir, 'index.html')):
+        print(f"📦 Client build {key} (cached)")
+        return build_dir
+
+    if not os.path.isdir(os.path.join(client_dir, 'node_modules')):
+        raise RuntimeError(f"{client_dir}/node_modules is missing - run `npm install` in client/ first")
+
+    # Build next to the cache entry and rename, so an interrupted build is never picked up
+    partial = f"{build_dir}.partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    env = dict(os.environ, BUILD_PATH=partial, **BUILD_ENV)
+    print(f"📦 Building client {key}...")
+    start = time.perf_counter()
+    npm = 'npm.cmd' if sys.platform == 'win32' else 'npm'
+    result = subprocess.run([npm, 'run', 'build'], cwd=client_dir, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Client build failed:\n{result.stdout[-4000:]}\n{result.stderr[-4000:]}")
+    shutil.rmtree(build_dir, ignore_errors=True)
+    os.replace(partial, build_dir)
+    print(f"📦 Client build {key} ready in {time.perf_counter() - start:.0f}s")
+    prune_cache(cache_dir, keep=key)
+    return build_dir
+
+
+def prune_cache(cache_dir=CACHE_DIR, keep=None, limit=3):
+    """Delete all but the `limit` most recent builds"""
+    entries = [os.path.join(cache_dir, name) for name in os.listdir(cache_dir) if not name.endswith('.partial')]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[limit:]:
+        if os.path.basename(path) != keep:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    print(client_build())
@@ -12,27 +12,55 @@ from selenium.webdriver.safari.service import Service as SafariService
 from selenium.webdriver.safari.options import Options as SafariOptions
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
 from faker import Faker
 import os
-from dotenv import load_dotenv
+import time
+from urllib.parse import urlparse
+from app_server import AppServer, DatabaseSnapshot, free_port
+from client_build import client_build
+from datagen import build_template
+from device_profiles import apply_profile, clear_profile, parse_profiles
+from driver_resolver import resolve_driver
+from worker_browser import current_worker_id, start_browser
+from api_client import ApiClient
+from browser_state import authenticated_user, inject_auth, reset_app_state, supports_cdp
+from waits import install_network_hook
+from seed_data import seed_dataset, teardown_dataset
+from settings import (
+    BASE_URL, TEST_EMAIL, TEST_PASSWORD, ADMIN_EMAIL, ADMIN_PASSWORD, API_URL, LOGIN_MODE,
+    BROWSER, CHROME_DRIVER_PATH, EDGE_DRIVER_PATH, NETWORK_AUDIT, DB_TEMPLATE, BACKEND_URL,
+    MANAGED_APP, CLIENT_BUILD_DIR, DEVICE_PROFILES, SERVER_PROFILE, TRAFFIC_CAPTURE,
+)
 
-load_dotenv()
+# Loaded by pytest so their asserts are rewritten: the fixtures below import their helpers lazily
+pytest_plugins = ['perf_timing', 'network_audit', 'traffic_capture', 'scheduler', 'server_profiler']
 
 fake = Faker()
 
-# Test configuration
-BASE_URL = os.getenv('TEST_BASE_URL', 'http://localhost:3000')
-TEST_EMAIL = os.getenv('TEST_EMAIL', 'test@example.com')
-TEST_PASSWORD = os.getenv('TEST_PASSWORD', 'Test1234!@#$')
-ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@test.com')
-ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'Admin1234!@#$')
+WORKER_ID = current_worker_id()
 
-# Browser configuration
-BROWSER = os.getenv('TEST_BROWSER', 'chrome').lower()  # chrome, edge, safari
-CHROME_DRIVER_PATH = os.getenv('CHROME_DRIVER_PATH', r'C:\chromedriver\chromedriver.exe')
-EDGE_DRIVER_PATH = os.getenv('EDGE_DRIVER_PATH', None)  # Auto-detect if not set
+# The session starts its own server (and restores its database before every module)
+ISOLATED = bool(DB_TEMPLATE or MANAGED_APP)
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "smoke: browserless API checks that run before the UI suite")
+    config.addinivalue_line("markers", "endurance: long navigation loops that check for memory leaks (TEST_ENDURANCE_CYCLES)")
+    if not MANAGED_APP and config.getoption('numprocesses', default=None) not in (None, 0, 1):
+        # Workers would share one database and TEST_EMAIL, racing for its seed rows and free-tier limits;
+        # the dev server also proxies /api to one backend port, so only one snapshot server can sit behind it
+        raise pytest.UsageError("Parallel workers need TEST_MANAGED_APP=1, which gives each worker its own server and database")
+    if SERVER_PROFILE and not ISOLATED:
+        raise pytest.UsageError("TEST_SERVER_PROFILE profiles the server the session starts; set TEST_DB_TEMPLATE or TEST_MANAGED_APP")
+    try:
+        parse_profiles(DEVICE_PROFILES)
+    except ValueError as e:
+        raise pytest.UsageError(f"TEST_DEVICE_PROFILES: {e}")
+    if MANAGED_APP and not CLIENT_BUILD_DIR:
+        # Build (or find in the cache) once, before xdist starts workers; they inherit the variable
+        try:
+            os.environ['TEST_CLIENT_BUILD_DIR'] = client_build()
+        except RuntimeError as e:
+            raise pytest.UsageError(f"TEST_MANAGED_APP: {e}")
 
 def create_chrome_driver():
     """Create Chrome WebDriver"""
@@ -51,26 +79,30 @@ def create_chrome_driver():
     # User agent to avoid detection
     chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
     
-    # Try to use manual path first, then fallback to ChromeDriverManager
+    # Record CDP Network events for the per-route XHR/fetch audit and the HAR capture
+    if NETWORK_AUDIT or TRAFFIC_CAPTURE:
+        from network_audit import enable_performance_log
+        enable_performance_log(chrome_options)
+    
+    # Try to use manual path first, then a cached driver matching the installed Chrome
     if os.path.exists(CHROME_DRIVER_PATH):
         print(f"Using ChromeDriver from: {CHROME_DRIVER_PATH}")
         service = ChromeService(CHROME_DRIVER_PATH)
     else:
-        print(f"ChromeDriver not found at {CHROME_DRIVER_PATH}, trying ChromeDriverManager...")
         try:
-            # Try to get latest ChromeDriver version
-            driver_path = ChromeDriverManager().install()
-            service = ChromeService(driver_path)
+            resolution = resolve_driver('chrome')
+            print(f"Using {resolution}")
+            service = ChromeService(resolution.path)
         except Exception as e:
-            print(f"Error: ChromeDriverManager failed: {e}")
+            print(f"Error: ChromeDriver resolution failed: {e}")
             print("\nTroubleshooting:")
             print("  1. Ensure Chrome browser is installed")
             print("  2. Or download ChromeDriver manually from: https://chromedriver.chromium.org/")
-            print("  3. Extract to: C:\\chromedriver\\chromedriver.exe")
+            print("  3. Cache it with: python driver_resolver.py --add /path/to/chromedriver")
             print("  4. Or try using Edge browser instead (set TEST_BROWSER=edge in .env)")
             raise
     
-    return webdriver.Chrome(service=service, options=chrome_options)
+    return start_browser(webdriver.Chrome, service, chrome_options)
 
 def create_edge_driver():
     """Create Edge WebDriver"""
@@ -86,19 +118,27 @@ def create_edge_driver():
     edge_options.add_experimental_option("excludeSwitches", ["enable-automation"])
     edge_options.add_experimental_option('useAutomationExtension', False)
     
-    # Try to use manual path first, then fallback to EdgeDriverManager
+    # Try to use manual path first, then a cached driver matching the installed Edge
     if EDGE_DRIVER_PATH and os.path.exists(EDGE_DRIVER_PATH):
         print(f"Using EdgeDriver from: {EDGE_DRIVER_PATH}")
         service = EdgeService(EDGE_DRIVER_PATH)
     else:
-        print("Using EdgeDriverManager to auto-install EdgeDriver...")
         try:
-            service = EdgeService(EdgeChromiumDriverManager().install())
+            resolution = resolve_driver('edge')
+            print(f"Using {resolution}")
+            service = EdgeService(resolution.path)
         except Exception as e:
-            print(f"Error: Could not install EdgeDriver: {e}")
+            print(f"Error: Could not resolve EdgeDriver: {e}")
             raise
     
-    return webdriver.Edge(service=service, options=edge_options)
+    return start_browser(webdriver.Edge, service, edge_options)
+
+def start_browser(driver_class, service, options):
+    """Launch the browser and report how long the driver session took to start"""
+    start = time.perf_counter()
+    driver = driver_class(service=service, options=options)
+    print(f"Browser session started in {(time.perf_counter() - start) * 1000:.0f} ms")
+    return driver
 
 def create_safari_driver():
     """Create Safari WebDriver (macOS only)"""
@@ -116,31 +156,34 @@ def create_safari_driver():
         print("Enable it in Safari: Develop > Allow Remote Automation")
         raise
 
-@pytest.fixture(scope="session")
-def driver():
+def create_driver():
     """Create and configure WebDriver based on BROWSER environment variable"""
+    if BROWSER == 'chrome':
+        driver = create_chrome_driver()
+    elif BROWSER == 'edge':
+        driver = create_edge_driver()
+    elif BROWSER == 'safari':
+        driver = create_safari_driver()
+    else:
+        raise ValueError(f"Unsupported browser: {BROWSER}. Use 'chrome', 'edge', or 'safari'")
+    
+    from perf_timing import install_perf_observers
+    driver.implicitly_wait(10)
+    install_network_hook(driver)
+    install_perf_observers(driver)
+    return driver
+
+@pytest.fixture(scope="session")
+def driver(base_url, pytestconfig):
+    """Pre-warmed browser for this test process (one per xdist worker), timing every page it loads"""
+    # pytest runs one test at a time per process, so parallel browsers come from xdist workers
     print(f"\n{'='*60}")
-    print(f"Initializing {BROWSER.upper()} WebDriver...")
+    print(f"Initializing {BROWSER.upper()} WebDriver for worker {WORKER_ID}...")
     print(f"{'='*60}\n")
     
     try:
-        if BROWSER == 'chrome':
-            driver = create_chrome_driver()
-        elif BROWSER == 'edge':
-            driver = create_edge_driver()
-        elif BROWSER == 'safari':
-            driver = create_safari_driver()
-        else:
-            raise ValueError(f"Unsupported browser: {BROWSER}. Use 'chrome', 'edge', or 'safari'")
-        
-        driver.implicitly_wait(10)
+        raw_driver = start_browser(create_driver, warm_url=base_url)
         print(f"✅ {BROWSER.upper()} WebDriver initialized successfully\n")
-        
-        yield driver
-        
-        driver.quit()
-        print(f"\n✅ {BROWSER.upper()} WebDriver closed\n")
-        
     except Exception as e:
         print(f"\n❌ Failed to initialize {BROWSER.upper()} WebDriver: {e}\n")
         print("\nTroubleshooting:")
@@ -154,6 +197,15 @@ def driver():
             print("  - Safari WebDriver only works on macOS")
             print("  - Enable 'Allow Remote Automation' in Safari > Develop menu")
         raise
+    
+    from perf_timing import wrap_driver
+    yield wrap_driver(pytestconfig, raw_driver)
+    
+    try:
+        raw_driver.quit()
+    except Exception as e:
+        print(f"⚠️  Error closing browser: {e}")
+    print(f"\n✅ {BROWSER.upper()} WebDriver closed for worker {WORKER_ID}\n")
 
 @pytest.fixture
 def wait(driver):
@@ -171,10 +223,128 @@ def test_user():
         'currency': 'USD'
     }
 
+@pytest.fixture(scope="session")
+def api_client(api_url):
+    """HTTP client for the backend API (shared connection pool)"""
+    client = ApiClient(api_url)
+    yield client
+    client.close()
+
+@pytest.fixture(scope="session")
+def auth_session(api_client, api_url):
+    """Log in once over HTTP and cache the JWT and user for the whole session"""
+    # On snapshots restores keep user ids, so the token stays valid across modules
+    print(f"\n🔑 Logging in {TEST_EMAIL} via {api_url}/auth/login")
+    return api_client.login(TEST_EMAIL, TEST_PASSWORD)
+
+@pytest.fixture(scope="session")
+def app_server(request, tmp_path_factory):
+    """Express server for this session, running against a private copy of a template database
+
+    TEST_MANAGED_APP: free port, serving the cached production client build; TEST_DB_TEMPLATE alone:
+    the backend port behind the dev server's proxy. Without a template, a small one is generated.
+    """
+    workdir = tmp_path_factory.mktemp('app')
+    template = DB_TEMPLATE
+    if not template:
+        template = str(workdir / 'template.db')
+        build_template(template, users=0)
+    snapshot = DatabaseSnapshot(template, workdir / 'financial_tracker.db')
+    copy_s = snapshot.create()
+    inspect_port = free_port() if SERVER_PROFILE else None
+    if MANAGED_APP:
+        server = AppServer(snapshot.path, env={'CLIENT_BUILD_DIR': os.environ['TEST_CLIENT_BUILD_DIR']}, inspect_port=inspect_port)
+    else:
+        server = AppServer(snapshot.path, port=urlparse(BACKEND_URL).port, inspect_port=inspect_port)
+    server.start()
+    print(f"\n🗄️  Server on {server.url} using a copy of {template} ({copy_s * 1000:.0f} ms to copy)")
+    server.snapshot = snapshot
+    from server_profiler import server_profiler
+    profiler = server_profiler(request.config)
+    if profiler:
+        profiler.attach(server)
+        print(f"🔥 CPU profiling the server through its inspector on port {inspect_port}")
+    yield server
+    if profiler:
+        profiler.detach()
+    server.stop()
+    print(f"\n🗄️  Server stopped after {snapshot.restores} database restore(s)")
+
+@pytest.fixture(scope="session")
+def base_url(request):
+    """Root URL of the app under test"""
+    if MANAGED_APP:
+        return request.getfixturevalue('app_server').url
+    if DB_TEMPLATE:
+        request.getfixturevalue('app_server')
+    return BASE_URL
+
+@pytest.fixture(scope="session")
+def api_url(base_url):
+    """Root URL of the REST API (same origin as the managed app)"""
+    return f"{base_url}/api" if MANAGED_APP else API_URL
+
+@pytest.fixture(scope="module", autouse=True)
+def db_snapshot(request):
+    """Every test module starts from the template's rows, with no cleanup requests (isolated runs only)"""
+    if not ISOLATED:
+        yield None
+        return
+    snapshot = request.getfixturevalue('app_server').snapshot
+    if snapshot.dirty:
+        restore_s = snapshot.restore()
+        print(f"\n🗄️  Database restored for {request.module.__name__} in {restore_s * 1000:.0f} ms")
+    snapshot.dirty = True
+    yield snapshot
+
+def _seed_scope(fixture_name, config):
+    # Snapshot restores wipe the seeded rows, so seed again for each module
+    return 'module' if ISOLATED else 'session'
+
+@pytest.fixture(scope=_seed_scope)
+def seeded_data(request, api_client, auth_session):
+    """Deterministic dataset for TEST_EMAIL, created through the API (once per session, or per module on snapshots)"""
+    if ISOLATED:
+        request.getfixturevalue('db_snapshot')
+    seeded = seed_dataset(api_client)
+    yield seeded
+    # On snapshots the next restore removes the rows without any requests
+    if not ISOLATED:
+        teardown_dataset(api_client, seeded)
+
+def pytest_generate_tests(metafunc):
+    # Mobile tests run once per configured device profile, e.g. test_mobile_menu[low-end-3g]
+    profiles = parse_profiles(DEVICE_PROFILES)
+    if profiles and 'device_profile' in metafunc.fixturenames:
+        metafunc.parametrize('device_profile', profiles, indirect=True)
+
 @pytest.fixture
-def logged_in_driver(driver, wait):
-    """Fixture that logs in and returns driver"""
-    driver.get(f"{BASE_URL}/login")
+def device_profile(request, logged_in_driver):
+    """CPU and network throttling of a named device profile for one test; page timings are tagged with it"""
+    name = getattr(request, 'param', None)
+    if name in (None, 'desktop'):
+        # Unthrottled: samples keep their plain route key and its budgets
+        yield name
+        return
+    if not supports_cdp(logged_in_driver):
+        pytest.skip(f"Device profile {name} needs the DevTools protocol (Chrome or Edge)")
+    from perf_timing import page_recorder
+    recorder = page_recorder(request.config)
+    if recorder:
+        # The page loaded while logging in was not throttled: record it untagged first
+        recorder.flush()
+        recorder.tags['profile'] = name
+    apply_profile(logged_in_driver, name)
+    yield name
+    if recorder:
+        # Pages still open are measured under this profile, before it is lifted
+        recorder.flush()
+        recorder.tags.pop('profile', None)
+    clear_profile(logged_in_driver)
+
+def login_via_ui(driver, wait, base_url=BASE_URL):
+    """Log in by filling in the login form"""
+    driver.get(f"{base_url}/login")
     
     # Wait for login form
     email_input = wait.until(EC.presence_of_element_located(("id", "email")))
@@ -190,7 +360,21 @@ def logged_in_driver(driver, wait):
     
     # Wait for dashboard
     wait.until(EC.url_contains("/dashboard"))
+
+@pytest.fixture
+def logged_in_driver(request, driver, wait, base_url):
+    """Fixture that logs in and returns driver"""
+    if authenticated_user(driver, base_url) == TEST_EMAIL:
+        # Still logged in from the previous test: reset UI state instead of logging in again
+        reset_app_state(driver, base_url)
+        wait.until(EC.url_contains("/dashboard"))
+    elif LOGIN_MODE == 'ui':
+        login_via_ui(driver, wait, base_url)
+    elif LOGIN_MODE == 'api':
+        auth = request.getfixturevalue('auth_session')
+        inject_auth(driver, base_url, auth['token'], auth['user'])
+        wait.until(EC.url_contains("/dashboard"))
+    else:
+        raise ValueError(f"Unsupported login mode: {LOGIN_MODE}. Use 'api' or 'ui'")
     
     return driver
-
-
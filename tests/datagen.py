@@ -0,0 +1,107 @@
+"""
+Template database generator for scale tests
+Builds a fresh financial_tracker.db-compatible file: the verified test user with a UI-sized dataset,
+plus bulk users with millions of expenses, income, loan and installment rows
+
+Run with: python datagen.py --output template.db --users 2 --expenses 1000000 --income 250000
+"""
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+from db_seed import bulk_load, create_schema, create_user, hash_password, seed_financial_history
+from settings import TEST_EMAIL, TEST_PASSWORD
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template.db')
+BULK_PASSWORD = 'Bulk1234!@#$'
+
+# Stays inside the free tier (2 bank accounts, 2 cards) so the UI tests can still add records
+TEST_USER_DATASET = {'expenses': 200, 'income': 48, 'accounts': 1, 'loans': 2, 'installments': 3}
+
+
+def count_rows(conn, user_id):
+    """Rows per data table for one user"""
+    tables = ['bank_accounts', 'credit_cards', 'savings', 'expenses', 'income', 'loans', 'installments']
+    return {table: conn.execute(f'SELECT COUNT(*) FROM {table} WHERE user_id = ?', (user_id,)).fetchone()[0]
+            for table in tables}
+
+
+def build_template(output, users=1, expenses=100000, income=25000, loans=200, installments=10000,
+                   accounts=8, months=36, tier='premium', seed=0):
+    """Write a new template database and return its manifest (users, passwords, row counts)"""
+    if os.path.exists(output):
+        os.remove(output)
+
+    conn = sqlite3.connect(output)
+    conn.execute('PRAGMA foreign_keys = ON')
+    manifest = {'path': os.path.abspath(output), 'users': []}
+    try:
+        with bulk_load(conn):
+            create_schema(conn)
+
+            start = time.perf_counter()
+            with conn:
+                user_id, email = create_user(conn, TEST_PASSWORD, email=TEST_EMAIL, name='QA Test User')
+            seed_financial_history(conn, user_id, seed=seed, **TEST_USER_DATASET)
+            manifest['users'].append({'email': email, 'password': TEST_PASSWORD, 'tier': 'free',
+                                      'rows': count_rows(conn, user_id)})
+            print(f"👤 {email}: UI dataset")
+
+            password_hash = hash_password(BULK_PASSWORD)
+            for number in range(1, users + 1):
+                with conn:
+                    user_id, email = create_user(conn, BULK_PASSWORD, email=f"bulk-{number}@example.com",
+                                                 name=f"Bulk User {number}", tier=tier, password_hash=password_hash)
+                user_start = time.perf_counter()
+                seed_financial_history(conn, user_id, expenses=expenses, income=income, accounts=accounts,
+                                       months=months, seed=seed + number, loans=loans, installments=installments)
+                rows = count_rows(conn, user_id)
+                manifest['users'].append({'email': email, 'password': BULK_PASSWORD, 'tier': tier, 'rows': rows})
+                print(f"👤 {email}: {sum(rows.values()):,} rows in {time.perf_counter() - user_start:.1f}s")
+
+            conn.execute('ANALYZE')
+    finally:
+        conn.close()
+
+    manifest['build_s'] = time.perf_counter() - start
+    manifest['size_bytes'] = os.path.getsize(output)
+    with open(manifest_path(output), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def manifest_path(template_path):
+    """Sidecar JSON describing the users inside a template"""
+    return os.path.splitext(template_path)[0] + '.json'
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build a template SQLite database for scale tests")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="Template file to write (default: %(default)s)")
+    parser.add_argument('--users', type=int, default=1, help="Bulk users besides the test user")
+    parser.add_argument('--expenses', type=int, default=100000, help="Expenses per bulk user")
+    parser.add_argument('--income', type=int, default=25000, help="Income rows per bulk user")
+    parser.add_argument('--loans', type=int, default=200, help="Loans per bulk user")
+    parser.add_argument('--installments', type=int, default=10000, help="Installments per bulk user")
+    parser.add_argument('--accounts', type=int, default=8, help="Bank accounts per bulk user")
+    parser.add_argument('--months', type=int, default=36, help="History span in months")
+    parser.add_argument('--tier', default='premium', help="Subscription tier of the bulk users")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed (same seed, same data)")
+    args = parser.parse_args(argv)
+
+    print(f"🏗️  Building {args.output}")
+    manifest = build_template(
+        args.output, users=args.users, expenses=args.expenses, income=args.income, loans=args.loans,
+        installments=args.installments, accounts=args.accounts, months=args.months, tier=args.tier, seed=args.seed
+    )
+    total = sum(sum(user['rows'].values()) for user in manifest['users'])
+    print(f"✅ {total:,} rows, {manifest['size_bytes'] / 1024 / 1024:.1f} MB in {manifest['build_s']:.1f}s")
+    print(f"📝 Manifest: {manifest_path(args.output)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
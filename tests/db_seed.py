@@ -0,0 +1,205 @@
+"""
+Direct SQLite seeding for scale tests
+Writes rows straight into the schema created by server/database.js, bypassing the API
+"""
+import os
+import random
+import re
+import sqlite3
+import uuid
+from contextlib import contextmanager
+from datetime import date, timedelta
+from itertools import repeat
+
+import bcrypt
+from faker import Faker
+
+# Currencies the dashboard knows how to convert (EXCHANGE_RATES in server/routes/protected.js)
+CURRENCIES = ['USD', 'SGD', 'EUR', 'GBP', 'PKR', 'INR', 'JPY', 'AUD']
+EXPENSE_CATEGORIES = ['Food', 'Transportation', 'Utilities', 'Entertainment', 'Shopping', 'Healthcare', 'Education', 'Other']
+INCOME_TYPES = ['Salary', 'Freelance', 'Business', 'Investment', 'Rental', 'Other']
+PAYMENT_METHODS = ['Cash', 'Credit Card', 'Debit Card', 'Bank Transfer']
+LOAN_TYPES = ['Personal', 'Auto', 'Mortgage', 'Student', 'Business']
+
+# The server creates its schema at startup; reading the DDL from there keeps both in sync
+SCHEMA_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server', 'database.js')
+DDL_PATTERN = re.compile(r"run\(`((?:CREATE TABLE|CREATE INDEX)[^`]*)`\)", re.S)
+
+
+def schema_statements(source_path=SCHEMA_SOURCE):
+    """CREATE TABLE / CREATE INDEX statements from server/database.js, in order"""
+    with open(source_path, encoding='utf-8') as f:
+        return DDL_PATTERN.findall(f.read())
+
+
+def create_schema(conn, source_path=SCHEMA_SOURCE):
+    """Create the server's tables in an empty database, without starting the server"""
+    with conn:
+        for statement in schema_statements(source_path):
+            conn.execute(statement)
+
+
+@contextmanager
+def bulk_load(conn):
+    """Trade durability for speed while building a throwaway or template database"""
+    conn.execute('PRAGMA synchronous = OFF')
+    conn.execute('PRAGMA journal_mode = MEMORY')
+    try:
+        yield conn
+    finally:
+        conn.execute('PRAGMA journal_mode = DELETE')
+        conn.execute('PRAGMA synchronous = FULL')
+
+
+def connect(db_path):
+    """Open the server's database; the schema must already exist (start the server once)"""
+    conn = sqlite3.connect(db_path, timeout=30)
+    conn.execute('PRAGMA foreign_keys = ON')
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    missing = {'users', 'expenses', 'income', 'bank_accounts'} - tables
+    if missing:
+        conn.close()
+        raise RuntimeError(
+            f"{db_path} has no {', '.join(sorted(missing))} table(s) - start the server once so it creates the schema"
+        )
+    return conn
+
+
+def hash_password(password, rounds=10):
+    """bcrypt hash the server's bcryptjs can verify"""
+    hashed = bcrypt.hashpw(password.encode(), bcrypt.gensalt(rounds)).decode()
+    # Same algorithm; the $2a$ prefix is the one bcryptjs itself writes
+    return '$2a$' + hashed[4:]
+
+
+def create_user(conn, password, email=None, name=None, currency='USD', tier='free', password_hash=None):
+    """Insert a verified user and return (user_id, email)"""
+    email = email or f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    cursor = conn.execute(
+        'INSERT INTO users (email, password_hash, name, country, default_currency, subscription_tier, '
+        'subscription_status, email_verified) VALUES (?, ?, ?, ?, ?, ?, ?, 1)',
+        (email.lower(), password_hash or hash_password(password), name or 'Benchmark User', 'United States',
+         currency, tier, 'active')
+    )
+    return cursor.lastrowid, email.lower()
+
+
+def delete_user(conn, user_id):
+    """Remove a user; ON DELETE CASCADE removes all of their rows"""
+    with conn:
+        conn.execute('DELETE FROM users WHERE id = ?', (user_id,))
+
+
+def delete_users(db_path, user_ids):
+    """Remove the users a load run created, with everything they wrote"""
+    conn = connect(db_path)
+    try:
+        for user_id in user_ids:
+            delete_user(conn, user_id)
+    finally:
+        conn.close()
+
+
+def _date_pool(months):
+    """Every ISO date in the last `months` months"""
+    today = date.today()
+    return [(today - timedelta(days=offset)).isoformat() for offset in range(months * 30)]
+
+
+def _dates(count, months, rng):
+    """ISO dates spread uniformly over the last `months` months"""
+    return rng.choices(_date_pool(months), k=count)
+
+
+def _random_rows(rng, count, columns, chunk=100000):
+    """Rows whose columns are drawn from pools (lists) or fixed values, generated a chunk at a time
+
+    Drawing whole columns with rng.choices is several times faster than building rows value by value,
+    and chunking keeps memory flat for millions of rows.
+    """
+    for offset in range(0, count, chunk):
+        size = min(chunk, count - offset)
+        yield from zip(*(
+            rng.choices(column, k=size) if isinstance(column, list) else repeat(column, size)
+            for column in columns
+        ))
+
+
+def seed_financial_history(conn, user_id, expenses=1000, income=1000, accounts=8, months=36, seed=0,
+                           loans=0, installments=0):
+    """Bulk-insert accounts, cards, savings, expenses, income, loans and installments for one user in a single transaction
+
+    Rows are produced by generators, so millions of them never sit in memory at once.
+    """
+    rng = random.Random(seed)
+    fake = Faker()
+    Faker.seed(seed)
+    descriptions = [fake.sentence(nb_words=4).rstrip('.') for _ in range(200)]
+    companies = [fake.company() for _ in range(50)]
+    days = _date_pool(months)
+
+    with conn:
+        conn.executemany(
+            'INSERT INTO bank_accounts (user_id, account_name, bank_name, account_type, country, currency, current_balance) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            [(user_id, f"Account {i + 1}", rng.choice(companies), 'Checking', 'United States',
+              CURRENCIES[i % len(CURRENCIES)], round(rng.uniform(100, 50000), 2)) for i in range(accounts)]
+        )
+        conn.executemany(
+            'INSERT INTO credit_cards (user_id, name, bank_name, currency, credit_limit, current_balance) '
+            'VALUES (?, ?, ?, ?, ?, ?)',
+            [(user_id, f"Card {i + 1}", rng.choice(companies), CURRENCIES[(i + 3) % len(CURRENCIES)],
+              round(rng.uniform(1000, 20000), 2), round(rng.uniform(0, 1000), 2)) for i in range(max(1, accounts // 2))]
+        )
+        conn.executemany(
+            'INSERT INTO savings (user_id, account_name, account_type, currency, current_balance) VALUES (?, ?, ?, ?, ?)',
+            [(user_id, f"Savings {i + 1}", 'Savings', CURRENCIES[(i + 5) % len(CURRENCIES)],
+              round(rng.uniform(500, 100000), 2)) for i in range(max(1, accounts // 2))]
+        )
+        conn.executemany(
+            'INSERT INTO expenses (user_id, category, description, amount, currency, payment_method, date) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            _random_rows(rng, expenses, [user_id, EXPENSE_CATEGORIES, descriptions, _amounts(rng, 1, 500),
+                                         CURRENCIES, PAYMENT_METHODS, days])
+        )
+        conn.executemany(
+            'INSERT INTO income (user_id, amount, currency, income_type, frequency, source, date) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            _random_rows(rng, income, [user_id, _amounts(rng, 50, 8000), CURRENCIES, INCOME_TYPES,
+                                       'Monthly', companies, days])
+        )
+        conn.executemany(
+            'INSERT INTO loans (user_id, loan_name, loan_type, lender_name, principal_amount, remaining_balance, '
+            'monthly_payment, interest_rate, currency, start_date, payment_day, status) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            _loan_rows(user_id, loans, months, rng, companies)
+        )
+        conn.executemany(
+            'INSERT INTO installments (user_id, description, total_amount, remaining_amount, monthly_payment, '
+            'interest_rate, currency, start_date, end_date, status) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            _installment_rows(user_id, installments, months, rng, descriptions)
+        )
+
+
+def _amounts(rng, low, high, size=4096):
+    """Pool of rounded money amounts between low and high"""
+    return [round(rng.uniform(low, high), 2) for _ in range(size)]
+
+
+def _loan_rows(user_id, count, months, rng, lenders):
+    for number, start in enumerate(_dates(count, months, rng), 1):
+        principal = round(rng.uniform(1000, 250000), 2)
+        yield (user_id, f"Loan {number}", rng.choice(LOAN_TYPES), rng.choice(lenders), principal,
+               round(principal * rng.uniform(0.05, 1), 2), round(principal / rng.choice([12, 36, 60, 360]), 2),
+               round(rng.uniform(1, 15), 2), rng.choice(CURRENCIES), start, rng.randint(1, 28),
+               'active' if rng.random() < 0.8 else 'paid')
+
+
+def _installment_rows(user_id, count, months, rng, descriptions):
+    for start in _dates(count, months, rng):
+        total = round(rng.uniform(100, 5000), 2)
+        term = rng.choice([3, 6, 12, 24])
+        end = (date.fromisoformat(start) + timedelta(days=term * 30)).isoformat()
+        yield (user_id, rng.choice(descriptions), total, round(total * rng.random(), 2), round(total / term, 2),
+               round(rng.uniform(0, 20), 2), rng.choice(CURRENCIES), start, end,
+               'active' if rng.random() < 0.7 else 'completed')
@@ -0,0 +1,43 @@
+"""
+Named device profiles for the mobile tests
+CPU and network throttling applied through the DevTools protocol (Chrome and Edge)
+"""
+
+# Throughputs are bytes/s and latency is ms, as Network.emulateNetworkConditions expects them.
+# mid-range-phone matches Lighthouse's mobile preset (slow 4G, 4x CPU); low-end-3g is DevTools' "Fast 3G" on a 6x slower CPU.
+PROFILES = {
+    'desktop': {'cpu_slowdown': 1, 'network': None},
+    'mid-range-phone': {
+        'cpu_slowdown': 4,
+        'network': {'latency': 150, 'downloadThroughput': 1638400 // 8, 'uploadThroughput': 750000 // 8},
+    },
+    'low-end-3g': {
+        'cpu_slowdown': 6,
+        'network': {'latency': 562.5, 'downloadThroughput': 180000, 'uploadThroughput': 84375},
+    },
+}
+
+NO_THROTTLING = {'offline': False, 'latency': 0, 'downloadThroughput': -1, 'uploadThroughput': -1}
+
+
+def parse_profiles(value):
+    """Profile names from a comma-separated setting; unknown names are an error"""
+    names = [name.strip() for name in (value or '').split(',') if name.strip()]
+    unknown = [name for name in names if name not in PROFILES]
+    if unknown:
+        raise ValueError(f"Unknown device profile(s) {', '.join(unknown)}; choose from {', '.join(PROFILES)}")
+    return names
+
+
+def apply_profile(driver, name):
+    """Throttle the browser's CPU and network to the named profile"""
+    profile = PROFILES[name]
+    driver.execute_cdp_cmd('Emulation.setCPUThrottlingRate', {'rate': profile['cpu_slowdown']})
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.emulateNetworkConditions', dict(NO_THROTTLING, **(profile['network'] or {})))
+
+
+def clear_profile(driver):
+    """Back to full speed, so the reused browser does not slow down the next test"""
+    driver.execute_cdp_cmd('Emulation.setCPUThrottlingRate', {'rate': 1})
+    driver.execute_cdp_cmd('Network.emulateNetworkConditions', NO_THROTTLING)
@@ -0,0 +1,205 @@
+"""
+Offline WebDriver resolution
+Matches chromedriver/msedgedriver from local caches to the installed browser's version without any network access
+
+Provision an air-gapped runner with: python driver_resolver.py --add /path/to/chromedriver
+"""
+import argparse
+import glob
+import os
+import re
+import shutil
+import subprocess
+import sys
+import time
+
+DRIVER_CACHE = os.path.expanduser(os.getenv('TEST_DRIVER_CACHE', os.path.join('~', '.cache', 'qa-drivers')))
+# Fail instead of falling back to webdriver-manager's download when no cached driver matches
+OFFLINE = os.getenv('TEST_DRIVER_OFFLINE', '0').lower() in ('1', 'true', 'yes')
+
+BROWSERS = {
+    'chrome': {
+        'driver': 'chromedriver',
+        'commands': ['google-chrome', 'google-chrome-stable', 'chromium', 'chromium-browser',
+                     '/Applications/Google Chrome.app/Contents/MacOS/Google Chrome'],
+        'registry': r'Software\Google\Chrome\BLBeacon',
+    },
+    'edge': {
+        'driver': 'msedgedriver',
+        'commands': ['microsoft-edge', 'microsoft-edge-stable',
+                     '/Applications/Microsoft Edge.app/Contents/MacOS/Microsoft Edge'],
+        'registry': r'Software\Microsoft\Edge\BLBeacon',
+    },
+}
+
+# Caches other tools leave behind: ours, webdriver-manager's and Selenium Manager's
+SEARCH_ROOTS = [DRIVER_CACHE, os.path.expanduser(os.path.join('~', '.wdm', 'drivers')),
+                os.path.expanduser(os.path.join('~', '.cache', 'selenium'))]
+
+VERSION = re.compile(r'\d+\.\d+\.\d+(?:\.\d+)?')
+
+_resolved = {}
+
+
+class DriverResolution:
+    """Outcome of one lookup: where the driver is, which versions matched and how long it took"""
+
+    def __init__(self, browser, path, browser_version, driver_version, source, seconds):
+        self.browser = browser
+        self.path = path
+        self.browser_version = browser_version
+        self.driver_version = driver_version
+        self.source = source
+        self.seconds = seconds
+
+    def __str__(self):
+        return (f"{BROWSERS[self.browser]['driver']} {self.driver_version or '?'} for {self.browser} "
+                f"{self.browser_version or '?'} from {self.source} in {self.seconds * 1000:.0f} ms")
+
+
+def major(version):
+    return version.split('.', 1)[0] if version else None
+
+
+def _command_version(command):
+    try:
+        output = subprocess.run([command, '--version'], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    match = VERSION.search(output)
+    return match.group(0) if match else None
+
+
+def _registry_version(key):
+    import winreg
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(hive, key) as handle:
+                return winreg.QueryValueEx(handle, 'version')[0]
+        except OSError:
+            continue
+    return None
+
+
+def browser_version(browser):
+    """Installed browser version, read locally (registry on Windows, `--version` elsewhere)"""
+    spec = BROWSERS[browser]
+    if sys.platform == 'win32':
+        return _registry_version(spec['registry'])
+    for command in spec['commands']:
+        if os.path.isabs(command) and not os.path.exists(command):
+            continue
+        if not os.path.isabs(command) and not shutil.which(command):
+            continue
+        version = _command_version(command)
+        if version:
+            return version
+    return None
+
+
+def _binary_name(driver):
+    return driver + '.exe' if sys.platform == 'win32' else driver
+
+
+def cached_drivers(driver, roots=None):
+    """[(version, path)] for every driver binary under the cache roots
+
+    The version is taken from the path (all three caches keep one directory per version), so the
+    hot path never runs the binaries.
+    """
+    found = []
+    for root in roots or SEARCH_ROOTS:
+        pattern = os.path.join(root, '**', _binary_name(driver))
+        for path in glob.glob(pattern, recursive=True):
+            if not os.access(path, os.X_OK) or os.path.isdir(path):
+                continue
+            versions = [part for part in path.split(os.sep) if VERSION.fullmatch(part)]
+            if versions:
+                found.append((versions[-1], path))
+    return found
+
+
+def _version_key(version):
+    return tuple(int(part) for part in version.split('.'))
+
+
+def pick_driver(candidates, wanted):
+    """Cached driver for the browser version: same build if possible, else the newest of the same major"""
+    if not wanted:
+        return max(candidates, key=lambda item: _version_key(item[0]), default=None)
+    same_major = [item for item in candidates if major(item[0]) == major(wanted)]
+    same_build = [item for item in same_major if item[0].split('.')[:3] == wanted.split('.')[:3]]
+    return max(same_build or same_major, key=lambda item: _version_key(item[0]), default=None)
+
+
+def add_to_cache(binary, driver=None, cache_dir=DRIVER_CACHE):
+    """Copy a driver binary into <cache>/<driver>/<version>/ and return its new path"""
+    driver = driver or os.path.splitext(os.path.basename(binary))[0]
+    version = _command_version(binary)
+    if not version:
+        raise RuntimeError(f"Could not read the version of {binary}")
+    target_dir = os.path.join(cache_dir, driver, version)
+    os.makedirs(target_dir, exist_ok=True)
+    target = os.path.join(target_dir, _binary_name(driver))
+    shutil.copy2(binary, target)
+    os.chmod(target, 0o755)
+    return target
+
+
+def _download(browser):
+    """webdriver-manager install (network), kept off the hot path: the result is added to the cache"""
+    if browser == 'chrome':
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    from webdriver_manager.microsoft import EdgeChromiumDriverManager
+    return EdgeChromiumDriverManager().install()
+
+
+def resolve_driver(browser, offline=OFFLINE):
+    """DriverResolution for 'chrome' or 'edge', memoized for the process (one lookup per pool)"""
+    if browser in _resolved:
+        return _resolved[browser]
+    start = time.perf_counter()
+    driver = BROWSERS[browser]['driver']
+    wanted = browser_version(browser)
+    match = pick_driver(cached_drivers(driver), wanted)
+    if match:
+        resolution = DriverResolution(browser, match[1], wanted, match[0], 'cache', time.perf_counter() - start)
+    elif offline:
+        raise RuntimeError(
+            f"No cached {driver} for {browser} {wanted or '(version unknown)'} under {', '.join(SEARCH_ROOTS)}. "
+            f"Provision one with: python driver_resolver.py --add /path/to/{driver}"
+        )
+    else:
+        path = add_to_cache(_download(browser), driver)
+        resolution = DriverResolution(browser, path, wanted, _command_version(path), 'download',
+                                      time.perf_counter() - start)
+    _resolved[browser] = resolution
+    return resolution
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resolve WebDriver binaries from the local cache")
+    parser.add_argument('--browser', default='chrome', choices=sorted(BROWSERS))
+    parser.add_argument('--add', metavar='BINARY', help="Copy the browser's driver binary into the cache")
+    parser.add_argument('--list', action='store_true', help="List cached drivers")
+    args = parser.parse_args(argv)
+
+    driver = BROWSERS[args.browser]['driver']
+    if args.add:
+        print(f"✅ Cached {add_to_cache(args.add, driver)}")
+        return 0
+    if args.list:
+        for version, path in sorted(cached_drivers(driver), key=lambda item: _version_key(item[0])):
+            print(f"  {version:<18} {path}")
+        return 0
+    try:
+        print(f"✅ {resolve_driver(args.browser, offline=True)}")
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,4 @@
+"""
+HTTP load tests for the Financial Planner API
+Run with: python -m load --users 20 --duration 30
+"""
@@ -0,0 +1,44 @@
+"""
+Command line entry point: python -m load
+"""
+import argparse
+import asyncio
+import sys
+
+from settings import BACKEND_URL, TEST_EMAIL, TEST_PASSWORD
+from load.engine import ENDPOINTS, run_load_test
+from load.report import format_summary, write_summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m load", description="Load test the Financial Planner API")
+    parser.add_argument('--api-url', default=f"{BACKEND_URL}/api", help="API base URL (default: %(default)s)")
+    parser.add_argument('--users', type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument('--duration', type=float, default=30.0, help="Test duration in seconds")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="Seconds over which users are started")
+    parser.add_argument('--think-time', type=float, default=0.0, help="Pause between requests of one user (s)")
+    parser.add_argument('--endpoints', default=",".join(ENDPOINTS), help="Comma-separated subset of: " + ", ".join(ENDPOINTS))
+    parser.add_argument('--summary-file', help="Write the JSON summary to this path")
+    args = parser.parse_args(argv)
+
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = [name for name in endpoints if name not in ENDPOINTS]
+    if unknown:
+        parser.error(f"unknown endpoint(s): {', '.join(unknown)}")
+
+    summary = asyncio.run(run_load_test(
+        args.api_url, TEST_EMAIL, TEST_PASSWORD,
+        users=args.users, duration=args.duration, endpoints=endpoints,
+        think_time=args.think_time, ramp_up=args.ramp_up,
+    ))
+    print(format_summary(summary))
+    if args.summary_file:
+        write_summary(summary, args.summary_file)
+        print(f"\nSummary saved to: {args.summary_file}")
+
+    failed = sum(result['failures'] for result in summary['endpoints'].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
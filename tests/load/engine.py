@@ -0,0 +1,116 @@
+"""
+Asyncio load generator: each virtual user owns one pooled keep-alive connection
+"""
+import asyncio
+import time
+from collections import Counter
+
+import aiohttp
+
+from perf_stats import summarize
+
+# Hot read endpoints exercised by production users
+ENDPOINTS = {
+    'dashboard': ('GET', '/dashboard'),
+    'expenses': ('GET', '/expenses'),
+    'export': ('GET', '/export/all'),
+}
+
+
+class EndpointStats:
+    """Latencies and outcomes collected for one endpoint"""
+
+    def __init__(self, name, method, path):
+        self.name = name
+        self.method = method
+        self.path = path
+        self.latencies_ms = []
+        self.statuses = Counter()
+        self.errors = Counter()
+        self.bytes = 0
+
+    def record(self, latency_ms, status=None, size=0, error=None):
+        self.latencies_ms.append(latency_ms)
+        if error:
+            self.errors[error] += 1
+        else:
+            self.statuses[status] += 1
+            self.bytes += size
+
+    @property
+    def failures(self):
+        return sum(self.errors.values()) + sum(n for status, n in self.statuses.items() if status >= 400)
+
+    def summary(self, elapsed_s):
+        stats = summarize(self.latencies_ms)
+        return {
+            'endpoint': f"{self.method} /api{self.path}",
+            'requests': stats['count'],
+            'failures': self.failures,
+            'rps': stats['count'] / elapsed_s if elapsed_s else 0.0,
+            'p50_ms': stats['p50'],
+            'p95_ms': stats['p95'],
+            'p99_ms': stats['p99'],
+            'max_ms': stats['max'],
+            'avg_bytes': self.bytes / stats['count'] if stats['count'] else 0,
+            'statuses': {str(status): n for status, n in self.statuses.items()},
+            'errors': dict(self.errors),
+        }
+
+
+async def login(api_url, email, password):
+    """Obtain a JWT for the virtual users"""
+    async with aiohttp.ClientSession() as session:
+        async with session.post(f"{api_url}/auth/login", json={'email': email, 'password': password}) as response:
+            data = await response.json(content_type=None)
+            if response.status != 200:
+                raise RuntimeError(f"Login failed ({response.status}): {data.get('message') or data.get('error')}")
+            return data['token']
+
+
+async def virtual_user(index, api_url, token, stats, deadline, think_time):
+    """Cycle through the endpoints until the deadline, one request at a time"""
+    connector = aiohttp.TCPConnector(limit=1)  # one keep-alive connection per virtual user
+    headers = {'Authorization': f"Bearer {token}"}
+    timeout = aiohttp.ClientTimeout(total=30)
+    endpoints = list(stats.values())
+
+    async with aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout) as session:
+        i = index  # stagger the starting endpoint so users don't move in lockstep
+        while time.monotonic() < deadline:
+            endpoint = endpoints[i % len(endpoints)]
+            i += 1
+            start = time.perf_counter()
+            try:
+                async with session.request(endpoint.method, f"{api_url}{endpoint.path}") as response:
+                    body = await response.read()
+                    endpoint.record((time.perf_counter() - start) * 1000, response.status, len(body))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                endpoint.record((time.perf_counter() - start) * 1000, error=type(e).__name__)
+            if think_time:
+                await asyncio.sleep(think_time)
+
+
+async def run_load_test(api_url, email, password, users=10, duration=30.0, endpoints=None, think_time=0.0, ramp_up=0.0):
+    """Drive `users` concurrent virtual users for `duration` seconds and return the summary"""
+    endpoints = endpoints or list(ENDPOINTS)
+    stats = {name: EndpointStats(name, *ENDPOINTS[name]) for name in endpoints}
+    token = await login(api_url, email, password)
+
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+    tasks = []
+    for index in range(users):
+        tasks.append(asyncio.create_task(virtual_user(index, api_url, token, stats, deadline, think_time)))
+        if ramp_up:
+            await asyncio.sleep(ramp_up / users)
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    return {
+        'api_url': api_url,
+        'users': users,
+        'duration_s': elapsed,
+        'think_time_s': think_time,
+        'endpoints': {name: endpoint.summary(elapsed) for name, endpoint in stats.items()},
+    }
@@ -0,0 +1,321 @@
+"""
+Replay of recorded browser traffic at scale
+Turns the HAR files the UI tests record (TEST_TRAFFIC_CAPTURE=1) into one script of API calls per journey and
+re-issues them from N virtual users, each logged in as its own user, with the recorded think time between calls
+
+Run with: python -m load.replay har/ --users 20 --duration 60
+"""
+import argparse
+import asyncio
+import glob
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+
+import aiohttp
+
+from settings import BACKEND_URL, SQLITE_DB_PATH
+from load.engine import EndpointStats, login
+from load.report import format_summary, write_summary
+
+API_PREFIX = '/api'
+# Logging in is done once per virtual user; replaying it would only measure bcrypt
+SKIPPED_PREFIXES = ('/api/auth/',)
+REPLAYED_TYPES = ('xhr', 'fetch')
+REPLAY_PASSWORD = 'Replay1234!@#$'
+ID_SEGMENT = re.compile(r"/(\d+)(?=/|\?|$)")
+
+
+def _header(headers, name):
+    return next((h['value'] for h in headers if h['name'].lower() == name), None)
+
+
+def _json(text):
+    try:
+        return json.loads(text) if text else None
+    except ValueError:
+        return None
+
+
+def load_journey(path, include_auth=False):
+    """{'name', 'steps', 'tokens'} of the API calls one HAR file recorded, in the order they were sent"""
+    with open(path, encoding='utf-8') as f:
+        log = json.load(f)['log']
+    steps, tokens, previous = [], set(), None
+    for entry in sorted(log['entries'], key=lambda e: e['startedDateTime']):
+        request, response = entry['request'], entry['response']
+        url = urlparse(request['url'])
+        if (not url.path.startswith(API_PREFIX + '/') or entry.get('_resourceType') not in REPLAYED_TYPES
+                or entry.get('_error') or not response.get('status')):
+            continue
+        if not include_auth and url.path.startswith(SKIPPED_PREFIXES):
+            continue
+        started = datetime.fromisoformat(entry['startedDateTime'].replace('Z', '+00:00'))
+        authorization = _header(request['headers'], 'authorization') or ''
+        if authorization.startswith('Bearer '):
+            tokens.add(authorization[len('Bearer '):])
+        steps.append({
+            'method': request['method'],
+            'path': url.path[len(API_PREFIX):] + (f"?{url.query}" if url.query else ''),
+            'content_type': _header(request['headers'], 'content-type'),
+            'body': (request.get('postData') or {}).get('text'),
+            'authorized': bool(authorization),
+            'status': response['status'],
+            'response': _json(response.get('content', {}).get('text')),
+            'gap_s': (started - previous).total_seconds() if previous else 0.0,
+        })
+        previous = started
+    return {'name': log.get('comment') or os.path.basename(path), 'steps': steps, 'tokens': tokens}
+
+
+def load_journeys(paths, include_auth=False):
+    """Journeys from HAR files and directories of them, leaving out those without API calls"""
+    files = []
+    for path in paths:
+        files += sorted(glob.glob(os.path.join(path, '*.har'))) if os.path.isdir(path) else [path]
+    journeys = [load_journey(path, include_auth) for path in files]
+    return [journey for journey in journeys if journey['steps']]
+
+
+def endpoint_name(method, path):
+    """'PUT /bank-accounts/{id}': recorded ids and query strings folded into one endpoint"""
+    return method, ID_SEGMENT.sub('/{id}', path.split('?', 1)[0])
+
+
+def resource(name):
+    """Shared key for a path segment and an id field: 'bank-accounts' and 'bank_account_id' -> 'bank_account'"""
+    return re.sub(r"(_id|s)$", "", name.replace('-', '_'))
+
+
+def path_resource(path):
+    """Resource the ids in a response to `path` belong to: its last non-numeric segment"""
+    segments = [segment for segment in path.split('?', 1)[0].split('/') if segment and not segment.isdigit()]
+    return resource(segments[-1]) if segments else ''
+
+
+def id_resource(key, owner):
+    """Resource an id field refers to, or None for fields that are not ids (and for user_id, which replay never reuses)"""
+    if key == 'id':
+        return owner
+    if key.endswith('_id') and key != 'user_id':
+        return resource(key)
+    return None
+
+
+class Correlation:
+    """Maps the ids a journey recorded to the ids in the virtual user's own responses, per resource"""
+
+    def __init__(self, recorded_tokens, token):
+        self.tokens = recorded_tokens
+        self.token = token
+        self.ids = {}
+
+    def learn(self, recorded, actual, owner):
+        """Pair up id fields of a recorded and a replayed response (objects by key, lists by position)"""
+        if isinstance(recorded, dict) and isinstance(actual, dict):
+            for key, value in recorded.items():
+                if key not in actual:
+                    continue
+                target = id_resource(key, owner)
+                if target and isinstance(value, int) and isinstance(actual[key], int):
+                    if value != actual[key]:
+                        self.ids[(target, value)] = actual[key]
+                else:
+                    self.learn(value, actual[key], owner)
+        elif isinstance(recorded, list) and isinstance(actual, list):
+            for recorded_item, actual_item in zip(recorded, actual):
+                self.learn(recorded_item, actual_item, owner)
+
+    def _swap_tokens(self, text):
+        for token in self.tokens:
+            text = text.replace(token, self.token)
+        return text
+
+    def path(self, path):
+        def swap(match):
+            owner = resource(path[:match.start()].rsplit('/', 1)[-1])
+            return f"/{self.ids.get((owner, int(match.group(1))), match.group(1))}"
+        path = self._swap_tokens(path)
+        return ID_SEGMENT.sub(swap, path)
+
+    def _body_ids(self, value, owner):
+        if isinstance(value, dict):
+            mapped = {}
+            for key, item in value.items():
+                target = id_resource(key, owner)
+                mapped[key] = self._mapped(target, item) if target else self._body_ids(item, owner)
+            return mapped
+        if isinstance(value, list):
+            return [self._body_ids(item, owner) for item in value]
+        return value
+
+    def _mapped(self, target, value):
+        try:
+            mapped = self.ids.get((target, int(value)))
+        except (TypeError, ValueError):
+            return value
+        if mapped is None:
+            return value
+        return mapped if isinstance(value, int) else str(mapped)
+
+    def body(self, text, path):
+        if text is None:
+            return None
+        text = self._swap_tokens(text)
+        data = _json(text)
+        return text if data is None else json.dumps(self._body_ids(data, path_resource(path)))
+
+
+def think_time(step, scale, maximum, fixed):
+    if fixed is not None:
+        return fixed
+    return min(step['gap_s'] * scale, maximum)
+
+
+async def replay_journey(session, api_url, journey, token, stats, deadline, think):
+    """One pass through a journey's calls; returns False once the deadline has passed"""
+    correlation = Correlation(journey['tokens'], token)
+    for step in journey['steps']:
+        pause = think(step)
+        if pause:
+            await asyncio.sleep(pause)
+        if time.monotonic() >= deadline:
+            return False
+        key = endpoint_name(step['method'], step['path'])
+        endpoint = stats.setdefault(key, EndpointStats(f"{key[0]} {key[1]}", *key))
+        headers = {'Authorization': f"Bearer {token}"} if step['authorized'] else {}
+        if step['content_type']:
+            headers['Content-Type'] = step['content_type']
+        body = correlation.body(step['body'], step['path'])
+        start = time.perf_counter()
+        try:
+            async with session.request(step['method'], f"{api_url}{correlation.path(step['path'])}", headers=headers,
+                                       data=body.encode() if body is not None else None) as response:
+                content = await response.read()
+                endpoint.record((time.perf_counter() - start) * 1000, response.status, len(content))
+                if response.status < 400 and step['response'] is not None:
+                    correlation.learn(step['response'], _json(content.decode('utf-8', 'replace')), path_resource(step['path']))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            endpoint.record((time.perf_counter() - start) * 1000, error=type(e).__name__)
+    return True
+
+
+async def replay_user(index, api_url, token, journeys, stats, deadline, think, iterations):
+    """Run the journeys round-robin, starting at a different one per user, until the deadline or iteration count"""
+    connector = aiohttp.TCPConnector(limit=1)  # one keep-alive connection per virtual user, like a browser tab's API calls
+    timeout = aiohttp.ClientTimeout(total=30)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+        done = 0
+        while iterations is None or done < iterations:
+            journey = journeys[(index + done) % len(journeys)]
+            if not await replay_journey(session, api_url, journey, token, stats, deadline, think):
+                break
+            done += 1
+
+
+async def run_replay(api_url, journeys, credentials, duration=60.0, think_scale=1.0, max_think=5.0,
+                     fixed_think=None, ramp_up=0.0, iterations=None):
+    """One virtual user per (email, password) pair, replaying the journeys; returns a load-test style summary"""
+    tokens = await asyncio.gather(*(login(api_url, email, password) for email, password in credentials))
+    stats = {}
+
+    def think(step):
+        return think_time(step, think_scale, max_think, fixed_think)
+
+    started = time.monotonic()
+    deadline = started + ramp_up + duration
+    tasks = []
+    for index, token in enumerate(tokens):
+        tasks.append(asyncio.create_task(replay_user(index, api_url, token, journeys, stats, deadline, think, iterations)))
+        if ramp_up:
+            await asyncio.sleep(ramp_up / len(tokens))
+    await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+
+    return {
+        'api_url': api_url,
+        'users': len(tokens),
+        'duration_s': elapsed,
+        'think_time_s': fixed_think if fixed_think is not None else f"recorded x{think_scale} (max {max_think}s)",
+        'journeys': [journey['name'] for journey in journeys],
+        'endpoints': {f"{method} {path}": endpoint.summary(elapsed)
+                      for (method, path), endpoint in sorted(stats.items(), key=lambda item: item[0][::-1])},
+    }
+
+
+def seed_users(db_path, count, rows):
+    """Premium, verified users with a little history each, so free-tier limits never reject a replayed write"""
+    from db_seed import connect, create_user, hash_password, seed_financial_history
+
+    conn = connect(db_path)
+    password_hash = hash_password(REPLAY_PASSWORD)
+    users = []
+    try:
+        for index in range(count):
+            user_id, email = create_user(conn, REPLAY_PASSWORD, name=f"Replay user {index + 1}", tier='premium',
+                                         password_hash=password_hash)
+            seed_financial_history(conn, user_id, expenses=rows, income=rows, accounts=2, seed=index)
+            users.append((user_id, email))
+    finally:
+        conn.close()
+    return users
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m load.replay", description=__doc__.strip().splitlines()[0])
+    parser.add_argument('har', nargs='+', help="HAR files, or directories of them (default capture dir: tests/har)")
+    parser.add_argument('--api-url', default=f"{BACKEND_URL}/api", help="API base URL (default: %(default)s)")
+    parser.add_argument('--users', type=int, default=10, help="Concurrent virtual users")
+    parser.add_argument('--duration', type=float, default=60.0, help="Seconds to replay")
+    parser.add_argument('--iterations', type=int, help="Stop each user after this many journeys")
+    parser.add_argument('--ramp-up', type=float, default=0.0, help="Seconds over which users are started")
+    parser.add_argument('--think-scale', type=float, default=1.0, help="Multiplier for the recorded pauses (0 = none)")
+    parser.add_argument('--max-think', type=float, default=5.0, help="Cap for one recorded pause (s)")
+    parser.add_argument('--think-time', type=float, help="Fixed pause between calls instead of the recorded ones (s)")
+    parser.add_argument('--include-auth', action='store_true', help="Also replay /api/auth calls")
+    parser.add_argument('--credentials', help="JSON file of [{\"email\", \"password\"}] to use instead of seeding users")
+    parser.add_argument('--db-path', default=SQLITE_DB_PATH, help="Database to seed the users into (default: %(default)s)")
+    parser.add_argument('--seed-rows', type=int, default=100, help="Expenses and income rows per seeded user")
+    parser.add_argument('--keep-users', action='store_true', help="Keep the seeded users afterwards")
+    parser.add_argument('--summary-file', help="Write the JSON summary to this path")
+    args = parser.parse_args(argv)
+
+    journeys = load_journeys(args.har, args.include_auth)
+    if not journeys:
+        parser.error("no API calls in the given HAR files - record some with TEST_TRAFFIC_CAPTURE=1")
+    print(f"🎬 {len(journeys)} journeys, {sum(len(j['steps']) for j in journeys)} API calls")
+
+    seeded = []
+    if args.credentials:
+        with open(args.credentials, encoding='utf-8') as f:
+            credentials = [(user['email'], user['password']) for user in json.load(f)][:args.users]
+    else:
+        seeded = seed_users(args.db_path, args.users, args.seed_rows)
+        credentials = [(email, REPLAY_PASSWORD) for user_id, email in seeded]
+        print(f"👥 Seeded {len(seeded)} users into {args.db_path}")
+
+    try:
+        summary = asyncio.run(run_replay(
+            args.api_url, journeys, credentials, duration=args.duration, think_scale=args.think_scale,
+            max_think=args.max_think, fixed_think=args.think_time, ramp_up=args.ramp_up, iterations=args.iterations,
+        ))
+    finally:
+        if seeded and not args.keep_users:
+            from db_seed import delete_users
+            delete_users(args.db_path, [user_id for user_id, email in seeded])
+
+    print(format_summary(summary))
+    if args.summary_file:
+        write_summary(summary, args.summary_file)
+        print(f"\nSummary saved to: {args.summary_file}")
+
+    failed = sum(result['failures'] for result in summary['endpoints'].values())
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
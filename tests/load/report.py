@@ -0,0 +1,25 @@
+"""
+Load test summary formatting
+"""
+import json
+
+from perf_stats import fmt_ms
+
+
+def format_summary(summary):
+    """Plain-text table of requests/s and latency percentiles per endpoint"""
+    lines = [
+        f"Load test against {summary['api_url']} - {summary['users']} virtual users, {summary['duration_s']:.1f}s",
+        f"{'Endpoint':<36}{'Requests':>10}{'Failed':>8}{'Req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}",
+    ]
+    for result in summary['endpoints'].values():
+        lines.append(
+            f"{result['endpoint']:<36}{result['requests']:>10}{result['failures']:>8}{result['rps']:>10.1f}"
+            f"{fmt_ms(result['p50_ms']):>10}{fmt_ms(result['p95_ms']):>10}{fmt_ms(result['p99_ms']):>10}"
+        )
+    return "\n".join(lines)
+
+
+def write_summary(summary, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2)
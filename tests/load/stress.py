@@ -0,0 +1,415 @@
+"""
+Write-contention stress test for the server's single SQLite connection
+Registers N distinct users (the test_user fixture's Faker data), then drives mixed read/write traffic from every one
+of them at once and checks the database afterwards: throughput, tail latency, SQLITE_BUSY errors and lost updates
+per step of concurrency, to show where the one-connection design stops scaling
+
+Run with: python -m load.stress --users 5,10,25,50 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import random
+import sqlite3
+import sys
+import time
+from collections import Counter
+
+import aiohttp
+from faker import Faker
+
+from settings import BACKEND_URL, SQLITE_DB_PATH
+from load.engine import EndpointStats, login
+from load.report import format_summary, write_summary
+from perf_stats import fmt_ms
+
+STRESS_PASSWORD = 'Test1234!@#$'
+# Deposits and balance adjustments move money in whole units, so a lost update is exactly one unit missing
+UNIT = 1.0
+BUSY_MARKERS = ('SQLITE_BUSY', 'database is locked')
+# The dev server's limiters allow 20 auth and 1000 API requests per 15 minutes, which one step exceeds in seconds
+RATE_LIMIT_HINT = "rate limited (429): start the server with DISABLE_RATE_LIMIT=true"
+
+# name: (method, path, default weight)
+OPERATIONS = {
+    'list_expenses': ('GET', '/expenses', 4),
+    'dashboard': ('GET', '/dashboard', 2),
+    'add_expense': ('POST', '/expenses', 2),
+    'adjust_balance': ('PUT', '/bank-accounts/{id}', 1),
+    'deposit': ('POST', '/savings/{id}/transactions', 2),
+}
+WRITES = ('add_expense', 'adjust_balance', 'deposit')
+
+
+def fake_user(fake):
+    """Registration data shaped like the test_user fixture's, with an email no other stress user has"""
+    return {
+        'email': fake.unique.email(),
+        'password': STRESS_PASSWORD,
+        'name': fake.name(),
+        'country': 'United States',
+        'currency': 'USD',
+    }
+
+
+def parse_mix(text):
+    """'deposit=5,list_expenses=1' -> weights, starting from the defaults"""
+    weights = {name: weight for name, (method, path, weight) in OPERATIONS.items()}
+    for part in filter(None, (part.strip() for part in text.split(','))):
+        name, _, weight = part.partition('=')
+        if name not in OPERATIONS:
+            raise ValueError(f"unknown operation {name!r} (one of: {', '.join(OPERATIONS)})")
+        weights[name] = float(weight)
+    return weights
+
+
+class RateLimited(Exception):
+    """The server answered 429: every later request of the step would only measure the limiter"""
+
+
+def is_busy(status, body):
+    return status >= 500 and any(marker in body for marker in BUSY_MARKERS)
+
+
+async def register_users(api_url, count, concurrency=8):
+    """Register `count` users through the API; returns their registration data"""
+    fake = Faker()
+    users = [fake_user(fake) for _ in range(count)]
+    limit = asyncio.Semaphore(concurrency)  # bcrypt makes every registration ~100 ms of server CPU
+
+    async def register(session, user):
+        async with limit:
+            payload = {'email': user['email'], 'password': user['password'], 'name': user['name'],
+                       'country': user['country'], 'default_currency': user['currency']}
+            async with session.post(f"{api_url}/auth/register", json=payload) as response:
+                data = await response.json(content_type=None)
+                if response.status == 429:
+                    raise RuntimeError(f"Registering {user['email']}: {RATE_LIMIT_HINT}")
+                if response.status != 201:
+                    raise RuntimeError(f"Registering {user['email']} failed ({response.status}): {data.get('error')}")
+
+    async with aiohttp.ClientSession() as session:
+        await asyncio.gather(*(register(session, user) for user in users))
+    return users
+
+
+def activate_users(db_path, emails):
+    """Verify the registered users and make them premium, so neither the email step nor a free-tier limit stops them
+
+    Returns {email: user_id}.
+    """
+    from db_seed import connect
+
+    conn = connect(db_path)
+    try:
+        with conn:
+            conn.executemany("UPDATE users SET email_verified = 1, subscription_tier = 'premium', "
+                             "subscription_status = 'active' WHERE email = ?", [(email.lower(),) for email in emails])
+        return {email: conn.execute('SELECT id FROM users WHERE email = ?', (email.lower(),)).fetchone()[0]
+                for email in emails}
+    finally:
+        conn.close()
+
+
+async def create_accounts(session, api_url, user):
+    """One bank account and one savings account per user, both starting at zero"""
+    headers = {'Authorization': f"Bearer {user['token']}"}
+    bank = {'account_name': 'Stress checking', 'bank_name': 'Stress Bank', 'account_type': 'checking',
+            'country': user['country'], 'currency': user['currency'], 'current_balance': 0}
+    async with session.post(f"{api_url}/bank-accounts", json=bank, headers=headers) as response:
+        if response.status != 200:
+            raise RuntimeError(f"Creating a bank account for {user['email']} failed ({response.status})"
+                               + (f" - {RATE_LIMIT_HINT}" if response.status == 429 else ""))
+        bank['id'] = (await response.json(content_type=None))['id']
+    async with session.post(f"{api_url}/savings", json={'name': 'Stress savings', 'current_balance': 0},
+                            headers=headers) as response:
+        if response.status != 200:
+            raise RuntimeError(f"Creating a savings account for {user['email']} failed ({response.status})"
+                               + (f" - {RATE_LIMIT_HINT}" if response.status == 429 else ""))
+        savings_id = (await response.json(content_type=None))['id']
+    return bank, savings_id
+
+
+def snapshot(db_path, users):
+    """{user_id: (bank balance, savings balance, expense rows)} straight from the database"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, timeout=30)
+    try:
+        return {user['id']: (
+            conn.execute('SELECT current_balance FROM bank_accounts WHERE id = ?', (user['bank']['id'],)).fetchone()[0] or 0,
+            conn.execute('SELECT current_balance FROM savings WHERE id = ?', (user['savings_id'],)).fetchone()[0] or 0,
+            conn.execute('SELECT COUNT(*) FROM expenses WHERE user_id = ?', (user['id'],)).fetchone()[0],
+        ) for user in users}
+    finally:
+        conn.close()
+
+
+class Ledger:
+    """What one user's acknowledged writes should have done to the database"""
+
+    def __init__(self):
+        self.bank = 0.0
+        self.savings = 0.0
+        self.expenses = 0
+        # Writes whose outcome the client never saw (timeouts): may or may not have been applied
+        self.uncertain = Counter()
+
+
+async def request(session, stats, busy, name, url, **kwargs):
+    """Timed request; returns (status, body text), or (None, None) when the client gave up"""
+    endpoint = stats[name]
+    start = time.perf_counter()
+    try:
+        async with session.request(endpoint.method, url, **kwargs) as response:
+            body = await response.text()
+            endpoint.record((time.perf_counter() - start) * 1000, response.status, len(body))
+            if is_busy(response.status, body):
+                busy[name] += 1
+            if response.status == 429:
+                raise RateLimited()
+            return response.status, body
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        endpoint.record((time.perf_counter() - start) * 1000, error=type(e).__name__)
+        return None, None
+
+
+async def stress_session(api_url, user, ledger, stats, busy, weights, deadline, seed):
+    """One browser tab's worth of traffic for a user: weighted random operations until the deadline"""
+    rng = random.Random(seed)
+    names = [name for name, weight in weights.items() if weight > 0]
+    name_weights = [weights[name] for name in names]
+    connector = aiohttp.TCPConnector(limit=1)
+    headers = {'Authorization': f"Bearer {user['token']}"}
+    timeout = aiohttp.ClientTimeout(total=30)
+    bank_url = f"{api_url}/bank-accounts/{user['bank']['id']}"
+    savings_url = f"{api_url}/savings/{user['savings_id']}/transactions"
+
+    async with aiohttp.ClientSession(connector=connector, headers=headers, timeout=timeout) as session:
+        try:
+            while time.monotonic() < deadline:
+                name = rng.choices(names, name_weights)[0]
+                if name == 'list_expenses':
+                    await request(session, stats, busy, name, f"{api_url}/expenses")
+                elif name == 'dashboard':
+                    await request(session, stats, busy, name, f"{api_url}/dashboard")
+                elif name == 'add_expense':
+                    status, _ = await request(session, stats, busy, name, f"{api_url}/expenses", json={
+                        'category': rng.choice(['Food', 'Transport', 'Utilities', 'Entertainment']),
+                        'description': 'Stress test', 'amount': round(rng.uniform(1, 200), 2), 'currency': 'USD',
+                        'payment_method': 'cash', 'date': time.strftime('%Y-%m-%d'),
+                    })
+                    if status == 200:
+                        ledger.expenses += 1
+                    elif status is None:
+                        ledger.uncertain['expenses'] += 1
+                elif name == 'adjust_balance':
+                    # The edit form's read-modify-write: load the account, PUT it back with the new balance.
+                    # Two sessions of one user can race here on any server, so its losses are client-side conflicts.
+                    status, body = await request(session, stats, busy, 'list_accounts', f"{api_url}/bank-accounts")
+                    if status != 200:
+                        continue
+                    account = next((a for a in json.loads(body) if a['id'] == user['bank']['id']), None)
+                    if account is None:
+                        continue
+                    status, _ = await request(session, stats, busy, name, bank_url,
+                                              json={**user['bank'], 'current_balance': (account['current_balance'] or 0) + UNIT})
+                    if status == 200:
+                        ledger.bank += UNIT
+                    elif status is None:
+                        ledger.uncertain['bank'] += 1
+                elif name == 'deposit':
+                    status, _ = await request(session, stats, busy, name, savings_url, json={
+                        'amount': UNIT, 'transaction_type': 'deposit', 'description': 'Stress test',
+                    })
+                    if status == 200:
+                        ledger.savings += UNIT
+                    elif status is None:
+                        ledger.uncertain['savings'] += 1
+        except RateLimited:
+            # The limiter now answers every request; run_step counts the 429s and run_stress stops
+            return
+
+
+def hold_write_lock(db_path, hold_s, every_s, deadline):
+    """Take the database's write lock from a second connection now and then, as a backup or migration would"""
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    held = 0
+    try:
+        while time.monotonic() + every_s < deadline:
+            time.sleep(every_s)
+            conn.execute('BEGIN IMMEDIATE')
+            time.sleep(hold_s)
+            conn.execute('COMMIT')
+            held += 1
+    finally:
+        conn.close()
+    return held
+
+
+def lost_updates(users, ledgers, before, after):
+    """Acknowledged writes missing from the database, summed over users
+
+    'savings' and 'expenses' are lost by the server. 'client_conflicts' are bank adjustments overwritten by another
+    session's GET-then-PUT, which happens whatever the database does. 'uncertain' counts writes that timed out.
+    """
+    lost = Counter()
+    for user in users:
+        ledger = ledgers[user['id']]
+        (bank_0, savings_0, expenses_0), (bank_1, savings_1, expenses_1) = before[user['id']], after[user['id']]
+        lost['client_conflicts'] += max(0, round((ledger.bank - (bank_1 - bank_0)) / UNIT))
+        lost['savings'] += max(0, round((ledger.savings - (savings_1 - savings_0)) / UNIT))
+        lost['expenses'] += max(0, ledger.expenses - (expenses_1 - expenses_0))
+        lost['uncertain'] += sum(ledger.uncertain.values())
+    return dict(lost)
+
+
+async def run_step(api_url, db_path, users, weights, duration, sessions, lock=None):
+    """All `users` at once, `sessions` concurrent tabs each, for `duration` seconds; returns a load-test style summary"""
+    stats = {name: EndpointStats(name, method, path) for name, (method, path, weight) in OPERATIONS.items()
+             if weights.get(name)}
+    if 'adjust_balance' in stats:
+        stats['list_accounts'] = EndpointStats('list_accounts', 'GET', '/bank-accounts')
+    busy = Counter()
+    ledgers = {user['id']: Ledger() for user in users}
+    before = snapshot(db_path, users)
+
+    started = time.monotonic()
+    deadline = started + duration
+    tasks = [asyncio.create_task(stress_session(api_url, user, ledgers[user['id']], stats, busy, weights, deadline,
+                                                seed=user['id'] * 100 + tab))
+             for user in users for tab in range(sessions)]
+    if lock:
+        tasks.append(asyncio.create_task(asyncio.to_thread(hold_write_lock, db_path, *lock, deadline)))
+    results = await asyncio.gather(*tasks)
+    elapsed = time.monotonic() - started
+    after = snapshot(db_path, users)
+
+    endpoints = {name: endpoint.summary(elapsed) for name, endpoint in stats.items()}
+    for name, result in endpoints.items():
+        result['sqlite_busy'] = busy[name]
+    writes = [endpoints[name] for name in WRITES if name in endpoints]
+    return {
+        'api_url': api_url,
+        'users': len(users),
+        'sessions_per_user': sessions,
+        'duration_s': elapsed,
+        'think_time_s': 0.0,
+        'requests_per_s': sum(result['requests'] for result in endpoints.values()) / elapsed,
+        'writes_per_s': sum(result['requests'] - result['failures'] for result in writes) / elapsed,
+        'write_p99_ms': max((result['p99_ms'] for result in writes if result['requests']), default=None),
+        'sqlite_busy': sum(busy.values()),
+        'rate_limited': sum(endpoint.statuses[429] for endpoint in stats.values()),
+        'lock_holds': results[-1] if lock else 0,
+        'lost_updates': lost_updates(users, ledgers, before, after),
+        'endpoints': endpoints,
+    }
+
+
+def scaling_limit(steps, min_gain=0.1):
+    """User count from which adding users stopped adding write throughput (under `min_gain` more per step)"""
+    for previous, step in zip(steps, steps[1:]):
+        if step['writes_per_s'] < previous['writes_per_s'] * (1 + min_gain):
+            return previous['users']
+    return None
+
+
+def format_steps(steps):
+    lines = [f"{'Users':>6}{'Req/s':>10}{'Writes/s':>10}{'Write p99 ms':>14}{'BUSY':>7}"
+             f"{'Lost (savings/expenses)':>25}{'Client conflicts':>18}{'Unknown':>9}"]
+    for step in steps:
+        lost = step['lost_updates']
+        lost_text = f"{lost.get('savings', 0)}/{lost.get('expenses', 0)}"
+        lines.append(
+            f"{step['users']:>6}{step['requests_per_s']:>10.1f}{step['writes_per_s']:>10.1f}"
+            f"{fmt_ms(step['write_p99_ms']):>14}{step['sqlite_busy']:>7}"
+            f"{lost_text:>25}{lost.get('client_conflicts', 0):>18}"
+            f"{lost.get('uncertain', 0):>9}"
+        )
+    return "\n".join(lines)
+
+
+async def run_stress(api_url, db_path, user_counts, duration=30.0, sessions=2, weights=None, lock=None,
+                     keep_users=False):
+    """Register max(user_counts) users, then run one step per user count; returns {'steps', 'scaling_limit'}"""
+    weights = weights or parse_mix('')
+    registered = await register_users(api_url, max(user_counts))
+    ids = activate_users(db_path, [user['email'] for user in registered])
+    print(f"👥 Registered {len(registered)} users")
+    try:
+        async with aiohttp.ClientSession() as session:
+            for user in registered:
+                user['id'] = ids[user['email']]
+                try:
+                    user['token'] = await login(api_url, user['email'], user['password'])
+                except RuntimeError as e:
+                    raise RuntimeError(f"{e} - {RATE_LIMIT_HINT}" if '(429)' in str(e) else str(e)) from e
+                user['bank'], user['savings_id'] = await create_accounts(session, api_url, user)
+
+        steps = []
+        for count in user_counts:
+            print(f"⏳ {count} users x {sessions} sessions for {duration:.0f}s...")
+            step = await run_step(api_url, db_path, registered[:count], weights, duration, sessions, lock)
+            print(format_summary(step))
+            steps.append(step)
+            if step['rate_limited']:
+                print(f"❌ {step['rate_limited']} request(s) {RATE_LIMIT_HINT}; stopping before the next step")
+                break
+    finally:
+        if not keep_users:
+            from db_seed import delete_users
+            delete_users(db_path, list(ids.values()))
+    return {'api_url': api_url, 'steps': steps, 'scaling_limit': scaling_limit(steps)}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m load.stress", description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--api-url', default=f"{BACKEND_URL}/api", help="API base URL (default: %(default)s)")
+    parser.add_argument('--db-path', default=SQLITE_DB_PATH,
+                        help="The server's database, to activate the users and check balances (default: %(default)s)")
+    parser.add_argument('--users', default='5,10,25,50', help="Comma-separated user counts, one step each")
+    parser.add_argument('--sessions', type=int, default=2, help="Concurrent sessions (tabs) per user")
+    parser.add_argument('--duration', type=float, default=30.0, help="Seconds per step")
+    parser.add_argument('--mix', default='', help="Operation weights, e.g. deposit=5,list_expenses=1 (operations: "
+                                                  + ", ".join(OPERATIONS) + ")")
+    parser.add_argument('--hold-lock', type=float, metavar='SECONDS',
+                        help="Also hold the write lock from a second connection for this long...")
+    parser.add_argument('--hold-every', type=float, default=2.0, metavar='SECONDS', help="...every this many seconds")
+    parser.add_argument('--keep-users', action='store_true', help="Keep the registered users afterwards")
+    parser.add_argument('--summary-file', help="Write the JSON summary to this path")
+    args = parser.parse_args(argv)
+
+    try:
+        user_counts = sorted({int(count) for count in args.users.split(',') if count.strip()})
+        weights = parse_mix(args.mix)
+    except ValueError as e:
+        parser.error(str(e))
+
+    try:
+        summary = asyncio.run(run_stress(
+            args.api_url, args.db_path, user_counts, duration=args.duration, sessions=args.sessions, weights=weights,
+            lock=(args.hold_lock, args.hold_every) if args.hold_lock else None, keep_users=args.keep_users,
+        ))
+    except RuntimeError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print()
+    print(format_steps(summary['steps']))
+    if summary['scaling_limit']:
+        print(f"\n📉 Write throughput stopped growing beyond {summary['scaling_limit']} concurrent users")
+    if args.summary_file:
+        write_summary(summary, args.summary_file)
+        print(f"\nSummary saved to: {args.summary_file}")
+
+    lost = sum(step['lost_updates'].get(kind, 0) for step in summary['steps'] for kind in ('savings', 'expenses'))
+    busy = sum(step['sqlite_busy'] for step in summary['steps'])
+    conflicts = sum(step['lost_updates'].get('client_conflicts', 0) for step in summary['steps'])
+    if conflicts:
+        print(f"ℹ️  {conflicts} bank adjustment(s) lost to the client's own GET-then-PUT race (not counted as failures)")
+    if lost or busy:
+        print(f"❌ {lost} lost update(s), {busy} SQLITE_BUSY error(s)")
+        return 1
+    return 1 if any(step['rate_limited'] for step in summary['steps']) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
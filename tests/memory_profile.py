@@ -0,0 +1,155 @@
+"""
+JS heap measurement over the DevTools protocol
+Forced-GC heap/DOM samples through Selenium, plus heap snapshots over a direct DevTools websocket
+"""
+import json
+
+import requests
+import websocket
+
+# Counters compared between the start and end of an endurance run
+MEMORY_METRICS = ['heap_used_bytes', 'dom_nodes', 'js_event_listeners', 'documents']
+
+
+def collect_garbage(driver, passes=2):
+    """Full GC; a second pass frees what the first one only finalized"""
+    for _ in range(passes):
+        driver.execute_cdp_cmd('HeapProfiler.collectGarbage', {})
+
+
+def memory_sample(driver):
+    """Heap and DOM counters after a forced GC"""
+    collect_garbage(driver)
+    heap = driver.execute_cdp_cmd('Runtime.getHeapUsage', {})
+    counters = driver.execute_cdp_cmd('Memory.getDOMCounters', {})
+    return {
+        'heap_used_bytes': heap['usedSize'],
+        'heap_total_bytes': heap['totalSize'],
+        'dom_nodes': counters['nodes'],
+        'js_event_listeners': counters['jsEventListeners'],
+        'documents': counters['documents'],
+    }
+
+
+def growth(first, last):
+    """Per-metric difference between two samples"""
+    return {metric: last[metric] - first[metric] for metric in MEMORY_METRICS}
+
+
+def slope(points):
+    """Least-squares slope of [(x, y)]; a steady leak shows up even when the total growth is small"""
+    if len(points) < 2:
+        return 0.0
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    denominator = sum((x - mean_x) ** 2 for x, _ in points)
+    if not denominator:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / denominator
+
+
+class DevToolsSession:
+    """Minimal CDP client for commands that stream events back (execute_cdp_cmd cannot receive events)"""
+
+    def __init__(self, ws_url, timeout=120):
+        # Chrome rejects DevTools websockets that send an Origin header unless --remote-allow-origins is set
+        self.ws = websocket.create_connection(ws_url, timeout=timeout, suppress_origin=True)
+        self.last_id = 0
+
+    def call(self, method, params=None, on_event=None):
+        self.last_id += 1
+        self.ws.send(json.dumps({'id': self.last_id, 'method': method, 'params': params or {}}))
+        while True:
+            message = json.loads(self.ws.recv())
+            if message.get('id') == self.last_id:
+                if 'error' in message:
+                    raise RuntimeError(f"{method} failed: {message['error']}")
+                return message.get('result', {})
+            if on_event and 'method' in message:
+                on_event(message['method'], message.get('params', {}))
+
+    def close(self):
+        self.ws.close()
+
+
+def devtools_url(driver):
+    """Websocket URL of the page the driver is showing (Chrome and Edge)"""
+    capabilities = driver.capabilities
+    options = capabilities.get('goog:chromeOptions') or capabilities.get('ms:edgeOptions') or {}
+    address = options.get('debuggerAddress')
+    if not address:
+        raise RuntimeError("Browser does not expose a DevTools debugger address")
+    targets = [t for t in requests.get(f"http://{address}/json", timeout=5).json() if t.get('type') == 'page']
+    current = driver.current_url
+    for target in targets:
+        if target.get('url') == current:
+            return target['webSocketDebuggerUrl']
+    return targets[0]['webSocketDebuggerUrl']
+
+
+def take_heap_snapshot(driver):
+    """Full V8 heap snapshot of the current page, as the parsed .heapsnapshot document"""
+    chunks = []
+
+    def on_event(method, params):
+        if method == 'HeapProfiler.addHeapSnapshotChunk':
+            chunks.append(params['chunk'])
+
+    session = DevToolsSession(devtools_url(driver))
+    try:
+        session.call('HeapProfiler.enable')
+        session.call('HeapProfiler.collectGarbage')
+        session.call('HeapProfiler.takeHeapSnapshot', {'reportProgress': False}, on_event=on_event)
+        session.call('HeapProfiler.disable')
+    finally:
+        session.close()
+    return json.loads(''.join(chunks))
+
+
+def summarize_snapshot(snapshot):
+    """{constructor: {'count', 'self_size'}}, grouped like the Summary view of the DevTools Memory panel
+
+    Objects and native (DOM) nodes are grouped by constructor name, so React components and
+    detached DOM elements appear by name; everything else by node type, e.g. "(closure)".
+    """
+    meta = snapshot['snapshot']['meta']
+    fields = meta['node_fields']
+    width = len(fields)
+    type_names = meta['node_types'][fields.index('type')]
+    type_at, name_at, size_at = fields.index('type'), fields.index('name'), fields.index('self_size')
+    nodes, strings = snapshot['nodes'], snapshot['strings']
+
+    summary = {}
+    for offset in range(0, len(nodes), width):
+        kind = type_names[nodes[offset + type_at]]
+        if kind in ('object', 'native'):
+            name = strings[nodes[offset + name_at]]
+        elif kind == 'closure':
+            name = f"(closure) {strings[nodes[offset + name_at]] or 'anonymous'}"
+        else:
+            name = f"({kind})"
+        entry = summary.setdefault(name, {'count': 0, 'self_size': 0})
+        entry['count'] += 1
+        entry['self_size'] += nodes[offset + size_at]
+    return summary
+
+
+def diff_snapshots(before, after, top=25):
+    """Constructors whose retained instances grew most between two snapshot summaries, largest first"""
+    rows = []
+    for name in set(before) | set(after):
+        old = before.get(name, {'count': 0, 'self_size': 0})
+        new = after.get(name, {'count': 0, 'self_size': 0})
+        count_delta, size_delta = new['count'] - old['count'], new['self_size'] - old['self_size']
+        if count_delta > 0 or size_delta > 0:
+            rows.append({'name': name, 'count_delta': count_delta, 'size_delta': size_delta,
+                         'count': new['count'], 'self_size': new['self_size']})
+    rows.sort(key=lambda row: (row['size_delta'], row['count_delta']), reverse=True)
+    return rows[:top]
+
+
+def format_diff(rows):
+    lines = [f"{'Constructor':<48} {'+count':>8} {'+bytes':>12} {'count':>8}"]
+    for row in rows:
+        lines.append(f"{row['name'][:48]:<48} {row['count_delta']:>+8,} {row['size_delta']:>+12,} {row['count']:>8,}")
+    return "\n".join(lines)
@@ -0,0 +1,214 @@
+"""
+Pytest plugin: opt-in audit of the XHR/fetch calls each page makes (TEST_NETWORK_AUDIT=1)
+Reads Chrome's performance log (CDP Network events) after every page and reports per route:
+request count, bytes, duplicate requests and responses sent without compression
+"""
+import json
+from urllib.parse import urlparse
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from perf_timing import add_report_extra, is_xdist_worker, page_recorder
+from settings import NETWORK_AUDIT
+
+DEFAULT_OUTPUT = 'network_audit.json'
+AUDITED_TYPES = ('XHR', 'Fetch')
+COMPRESSED_ENCODINGS = ('gzip', 'br', 'deflate', 'zstd')
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESSIBLE_BYTES = 1024
+
+audit_key = pytest.StashKey()
+log_key = pytest.StashKey()
+
+
+def enable_performance_log(options):
+    """Ask ChromeDriver to record CDP Network events in the 'performance' log"""
+    options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+
+class PerformanceLog:
+    """Drains Chrome's performance log once per page and hands the entries to every subscriber"""
+
+    def __init__(self):
+        # Called as subscriber(driver, entries, route, url)
+        self.subscribers = []
+        self.available = True
+
+    def __call__(self, driver, route, url):
+        if not self.available or not self.subscribers:
+            return
+        try:
+            entries = driver.get_log('performance')
+        except WebDriverException as e:
+            # Not Chrome, or the driver was created without goog:loggingPrefs
+            print(f"⚠️  Performance log unavailable, network audit and traffic capture disabled ({e.msg})")
+            self.available = False
+            return
+        for subscriber in self.subscribers:
+            subscriber(driver, entries, route, url)
+
+
+def performance_log(config):
+    """The session's shared PerformanceLog page hook, or None when page timing is off (TEST_PERF_TIMING=0)"""
+    recorder = page_recorder(config)
+    if recorder is None:
+        return None
+    log = config.stash.get(log_key, None)
+    if log is None:
+        log = config.stash[log_key] = PerformanceLog()
+        recorder.page_hooks.append(log)
+    return log
+
+
+def parse_performance_log(entries):
+    """XHR/fetch requests from raw performance-log entries, in the order they were sent"""
+    requests = {}
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        method, params = message.get('method'), message.get('params', {})
+        request_id = params.get('requestId')
+
+        if method == 'Network.requestWillBeSent' and params.get('type') in AUDITED_TYPES:
+            request = params['request']
+            requests[request_id] = {
+                'method': request['method'], 'url': request['url'], 'type': params['type'],
+                'status': None, 'encoding': None, 'transfer_bytes': 0, 'body_bytes': 0,
+            }
+        elif request_id not in requests:
+            continue
+        elif method == 'Network.responseReceived':
+            response = params['response']
+            headers = {name.lower(): value for name, value in response.get('headers', {}).items()}
+            requests[request_id].update(status=response.get('status'), encoding=headers.get('content-encoding'))
+        elif method == 'Network.dataReceived':
+            requests[request_id]['body_bytes'] += params.get('dataLength', 0)
+        elif method == 'Network.loadingFinished':
+            requests[request_id]['transfer_bytes'] = params.get('encodedDataLength', 0)
+    return list(requests.values())
+
+
+def request_key(request):
+    """'GET /api/expenses?month=3' - identifies repeated calls to the same resource"""
+    parsed = urlparse(request['url'])
+    return f"{request['method']} {parsed.path}" + (f"?{parsed.query}" if parsed.query else "")
+
+
+def is_uncompressed(request):
+    encoding = (request['encoding'] or '').lower()
+    return request['body_bytes'] >= MIN_COMPRESSIBLE_BYTES and not any(e in encoding for e in COMPRESSED_ENCODINGS)
+
+
+def summarize_page(requests):
+    """Count, bytes, duplicates and uncompressed responses of one page visit"""
+    counts = {}
+    for request in requests:
+        key = request_key(request)
+        counts[key] = counts.get(key, 0) + 1
+    return {
+        'requests': len(requests),
+        'transfer_bytes': sum(r['transfer_bytes'] for r in requests),
+        'body_bytes': sum(r['body_bytes'] for r in requests),
+        'calls': counts,
+        'duplicates': {key: count for key, count in counts.items() if count > 1},
+        'uncompressed': {request_key(r): r['body_bytes'] for r in requests if is_uncompressed(r)},
+    }
+
+
+def aggregate_routes(pages):
+    """Per-route totals across all visits: averages per visit, worst duplicates, uncompressed endpoints"""
+    routes = {}
+    for page in pages:
+        route = routes.setdefault(page['route'], {
+            'visits': 0, 'requests': 0, 'transfer_bytes': 0, 'body_bytes': 0,
+            'calls': {}, 'duplicates': {}, 'uncompressed': {},
+        })
+        route['visits'] += 1
+        for field in ('requests', 'transfer_bytes', 'body_bytes'):
+            route[field] += page[field]
+        for key, count in page['calls'].items():
+            route['calls'][key] = route['calls'].get(key, 0) + count
+        for key, count in page['duplicates'].items():
+            route['duplicates'][key] = max(route['duplicates'].get(key, 0), count)
+        for key, size in page['uncompressed'].items():
+            route['uncompressed'][key] = max(route['uncompressed'].get(key, 0), size)
+
+    for route in routes.values():
+        for field in ('requests', 'transfer_bytes', 'body_bytes'):
+            route[f'{field}_per_visit'] = route[field] / route['visits']
+    return dict(sorted(routes.items()))
+
+
+def format_route_table(routes):
+    """Plain-text summary: one line per route, then its duplicate and uncompressed calls"""
+    lines = [f"{'Route':<20}{'Visits':>7}{'Req/visit':>11}{'KB/visit':>10}{'Dupes':>7}{'Uncompr.':>10}"]
+    for name, route in routes.items():
+        lines.append(
+            f"{name:<20}{route['visits']:>7}{route['requests_per_visit']:>11.1f}"
+            f"{route['transfer_bytes_per_visit'] / 1024:>10.1f}{len(route['duplicates']):>7}{len(route['uncompressed']):>10}"
+        )
+        for key, count in route['duplicates'].items():
+            lines.append(f"    duplicate  {count}x {key}")
+        for key, size in route['uncompressed'].items():
+            lines.append(f"    uncompressed {size / 1024:.1f} KB {key}")
+    return "\n".join(lines)
+
+
+class NetworkAuditPlugin:
+    """Audits each page's performance-log entries and aggregates the audit per route"""
+
+    def __init__(self, config):
+        self.config = config
+        self.pending = []
+        self.pages = []
+
+    def audit_page(self, driver, entries, route, url):
+        self.pending.append(dict(summarize_page(parse_performance_log(entries)), route=route, url=url))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when != 'call':
+            return
+        recorder = page_recorder(self.config)
+        recorder.flush()
+        pages, self.pending = self.pending, []
+        if pages:
+            report = outcome.get_result()
+            report.network_audit = pages
+            add_report_extra(report, pages, 'Network audit')
+
+    def pytest_runtest_logreport(self, report):
+        self.pages.extend(getattr(report, 'network_audit', None) or [])
+
+    def pytest_sessionfinish(self, session):
+        if not self.pages or is_xdist_worker(self.config):
+            return
+        with open(self.config.getoption('--network-audit'), 'w', encoding='utf-8') as f:
+            json.dump({'routes': aggregate_routes(self.pages), 'pages': self.pages}, f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not self.pages or is_xdist_worker(self.config):
+            return
+        terminalreporter.write_sep('-', 'network audit per route (XHR/fetch)')
+        terminalreporter.write_line(format_route_table(aggregate_routes(self.pages)))
+        terminalreporter.write_line(f"Full audit: {self.config.getoption('--network-audit')}")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('network-audit', 'XHR/fetch network audit (TEST_NETWORK_AUDIT=1)')
+    group.addoption('--network-audit', default=DEFAULT_OUTPUT, help="Where to write the per-route network audit (JSON)")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    if not NETWORK_AUDIT:
+        return
+    log = performance_log(config)
+    if log is None:
+        print("⚠️  Network audit needs page timing (TEST_PERF_TIMING=0 is set), skipping")
+        return
+    plugin = NetworkAuditPlugin(config)
+    log.subscribers.append(plugin.audit_page)
+    config.stash[audit_key] = plugin
+    config.pluginmanager.register(plugin, 'network-audit')
@@ -0,0 +1,265 @@
+"""
+Performance history across QA runs
+run_full_qa.py appends every run's test durations, page timings and API latencies to a SQLite database, then
+compares each series' recent runs with earlier runs of the same configuration (Mann-Whitney U) and names the commit
+a slowdown started at
+
+Standalone: python perf_history.py [--run ID] | --list
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+
+from budgets import load_budgets
+from perf_stats import fmt_ms, mann_whitney_u
+from perf_timing import ROUTE_METRICS, route_key
+from scheduler import parse_junit
+from settings import DB_TEMPLATE, MANAGED_APP
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.getenv('TEST_PERF_HISTORY', os.path.join(TESTS_DIR, 'perf_history.db'))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    commit_sha TEXT,
+    branch TEXT,
+    dirty INTEGER,
+    exit_code INTEGER,
+    config TEXT
+);
+CREATE TABLE IF NOT EXISTS samples (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    metric TEXT NOT NULL,
+    value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_series ON samples(kind, name, metric, run_id);
+"""
+
+# How a series reads in the summary: "/expenses render", "GET /dashboard p95 under load"
+METRIC_LABELS = {
+    'ttfb_ms': 'TTFB',
+    'dom_content_loaded_ms': 'render',
+    'load_ms': 'load',
+    'lcp_ms': 'LCP',
+    'long_task_ms': 'long tasks',
+    'resource_bytes': 'resource bytes',
+    'payload_bytes': 'payload',
+    'duration_s': 'duration',
+    'p50_ms': 'p50 under load',
+    'p95_ms': 'p95 under load',
+}
+
+
+def connect(path=HISTORY_PATH):
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    if 'config' not in {row[1] for row in conn.execute("PRAGMA table_info(runs)")}:
+        # Histories written before runs recorded their configuration; those runs only compare with each other
+        conn.execute("ALTER TABLE runs ADD COLUMN config TEXT")
+    return conn
+
+
+def run_config(workers=1, shard=None, changed_since=None):
+    """Settings that change what a run measures; only runs with equal settings are compared"""
+    return {
+        'app': 'managed' if MANAGED_APP else 'snapshot' if DB_TEMPLATE else 'dev-server',
+        'workers': workers,
+        'shard': f"{shard[0] + 1}/{shard[1]}" if shard else None,
+        'changed_since': changed_since,
+    }
+
+
+def git_revision(cwd=TESTS_DIR):
+    """(short commit, branch, uncommitted changes?) of the tree under test, or Nones outside git"""
+    def git(*args):
+        return subprocess.run(['git', *args], cwd=cwd, capture_output=True, text=True, check=True).stdout.strip()
+    try:
+        return git('rev-parse', '--short', 'HEAD'), git('rev-parse', '--abbrev-ref', 'HEAD'), bool(git('status', '--porcelain'))
+    except (OSError, subprocess.CalledProcessError):
+        return None, None, None
+
+
+def collect_samples(timings_path=None, junit_path=None, load_summary=None):
+    """(kind, name, metric, value) rows for one run from the files run_full_qa.py produces"""
+    rows = []
+    if junit_path and os.path.exists(junit_path):
+        rows += [('test', nodeid, 'duration_s', seconds) for nodeid, seconds in parse_junit(junit_path).items()]
+    if timings_path and os.path.exists(timings_path):
+        with open(timings_path, encoding='utf-8') as f:
+            timings = json.load(f)
+        # Every page visit is a sample, so one run already gives the test several values per route
+        for samples in timings.get('tests', {}).values():
+            for sample in samples:
+                rows += [('page', route_key(sample), metric, sample[metric])
+                         for metric in ROUTE_METRICS if sample.get(metric) is not None]
+        for endpoint, measured in timings.get('api', {}).items():
+            rows += [('api', endpoint, metric, summary['p50'])
+                     for metric, summary in measured.items() if summary.get('p50') is not None]
+    if load_summary:
+        for result in load_summary['endpoints'].values():
+            rows += [('load', result['endpoint'], metric, result[metric])
+                     for metric in ('p50_ms', 'p95_ms') if result.get(metric) is not None]
+    return rows
+
+
+def record_run(rows, exit_code, config=None, path=HISTORY_PATH):
+    """Store one run, its run_config() and its samples; returns the run id"""
+    commit, branch, dirty = git_revision()
+    conn = connect(path)
+    try:
+        with conn:
+            run_id = conn.execute(
+                "INSERT INTO runs (started_at, commit_sha, branch, dirty, exit_code, config) VALUES (?, ?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec='seconds'), commit, branch, dirty, exit_code,
+                 json.dumps(config or run_config(), sort_keys=True))
+            ).lastrowid
+            conn.executemany("INSERT INTO samples (run_id, kind, name, metric, value) VALUES (?, ?, ?, ?, ?)",
+                             [(run_id, *row) for row in rows])
+        return run_id
+    finally:
+        conn.close()
+
+
+def series_history(conn, run_id, runs):
+    """{(kind, name, metric): {run_id: [values]}} for the series measured in `run_id`, over its last `runs` runs
+
+    Only runs with the same configuration count: a production build and the dev server time pages differently.
+    Each series looks back over the runs that measured it.
+    """
+    rows = conn.execute("""
+        SELECT s.kind, s.name, s.metric, s.run_id, s.value FROM samples s
+        JOIN (SELECT DISTINCT kind, name, metric FROM samples WHERE run_id = ?) current
+          ON s.kind = current.kind AND s.name = current.name AND s.metric = current.metric
+        JOIN runs r ON r.id = s.run_id
+        WHERE s.run_id <= ? AND r.config IS (SELECT config FROM runs WHERE id = ?)
+        ORDER BY s.run_id
+    """, (run_id, run_id, run_id))
+    history = {}
+    for kind, name, metric, sample_run, value in rows:
+        history.setdefault((kind, name, metric), {}).setdefault(sample_run, []).append(value)
+    return {key: dict(list(by_run.items())[-runs:]) for key, by_run in history.items()}
+
+
+def min_delta(metric, settings):
+    """Smallest absolute slowdown worth reporting, from the budgets file's 'baseline' section"""
+    if metric.endswith('bytes'):
+        return settings.get('min_delta_bytes', 0)
+    if metric.endswith('_s'):
+        return settings.get('min_delta_ms', 0) / 1000
+    return settings.get('min_delta_ms', 0)
+
+
+def change_point(by_run, baseline_median, threshold):
+    """First run of the trailing streak whose median is above the threshold"""
+    start = None
+    for run_id, values in by_run.items():
+        if statistics.median(values) > baseline_median * (1 + threshold):
+            start = run_id if start is None else start
+        else:
+            start = None
+    return start
+
+
+def detect_regressions(run_id, path=HISTORY_PATH, budgets=None):
+    """Series whose recent runs are significantly slower than the runs before them, largest change first"""
+    budgets = budgets or load_budgets()
+    settings = budgets.get('history', {})
+    recent_runs, baseline_runs = settings.get('recent_runs', 3), settings.get('baseline_runs', 10)
+    alpha, min_change = settings.get('alpha', 0.01), settings.get('min_change', 0.1)
+
+    conn = connect(path)
+    try:
+        runs = {row[0]: row[1:] for row in conn.execute("SELECT id, commit_sha, started_at FROM runs")}
+        regressions = []
+        for (kind, name, metric), by_run in series_history(conn, run_id, recent_runs + baseline_runs).items():
+            run_ids = list(by_run)
+            recent_ids, baseline_ids = run_ids[-recent_runs:], run_ids[:-recent_runs]
+            recent = [value for rid in recent_ids for value in by_run[rid]]
+            baseline = [value for rid in baseline_ids for value in by_run[rid]]
+            if len(recent) < 3 or len(baseline) < 3:
+                continue
+            before, after = statistics.median(baseline), statistics.median(recent)
+            if before <= 0 or after / before - 1 < min_change or after - before < min_delta(metric, budgets.get('baseline', {})):
+                continue
+            u, p = mann_whitney_u(recent, baseline)
+            if p >= alpha:
+                continue
+            since = change_point({rid: by_run[rid] for rid in recent_ids}, before, min_change) or recent_ids[0]
+            regressions.append({
+                'kind': kind, 'name': name, 'metric': metric, 'before': before, 'after': after,
+                'change': after / before - 1, 'p': p, 'since_run': since,
+                'since_commit': runs[since][0], 'since_date': runs[since][1],
+            })
+    finally:
+        conn.close()
+    regressions.sort(key=lambda regression: regression['change'], reverse=True)
+    return regressions
+
+
+def _value(metric, value):
+    if metric.endswith('bytes'):
+        return f"{value:,.0f} B"
+    if metric.endswith('_s'):
+        return f"{value:,.2f} s"
+    return f"{fmt_ms(value)} ms"
+
+
+def describe(regression):
+    """'`/expenses` render got 38% slower since commit abc1234 (820.0 ms -> 1,131.6 ms, p=0.002)'"""
+    r = regression
+    what = "larger" if r['metric'].endswith('bytes') else "slower"
+    since = f"commit {r['since_commit']}" if r['since_commit'] else f"run #{r['since_run']} ({r['since_date']})"
+    p = "p<0.001" if r['p'] < 0.001 else f"p={r['p']:.3f}"
+    return (f"`{r['name']}` {METRIC_LABELS.get(r['metric'], r['metric'])} got {r['change'] * 100:.0f}% {what} since {since} "
+            f"({_value(r['metric'], r['before'])} -> {_value(r['metric'], r['after'])}, {p})")
+
+
+def latest_run(path=HISTORY_PATH):
+    conn = connect(path)
+    try:
+        row = conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+    finally:
+        conn.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--db', default=HISTORY_PATH, help="History database (default: %(default)s)")
+    parser.add_argument('--run', type=int, help="Check this run instead of the latest one")
+    parser.add_argument('--list', action='store_true', help="List the recorded runs")
+    args = parser.parse_args(argv)
+
+    if args.list:
+        conn = connect(args.db)
+        for run_id, started_at, commit, branch, dirty, exit_code, config, samples in conn.execute("""
+            SELECT r.id, r.started_at, r.commit_sha, r.branch, r.dirty, r.exit_code, r.config, COUNT(s.run_id)
+            FROM runs r LEFT JOIN samples s ON s.run_id = r.id GROUP BY r.id ORDER BY r.id
+        """):
+            print(f"#{run_id:<5}{started_at}  {commit or '-'}{'+' if dirty else ''} ({branch or '-'})  "
+                  f"exit {exit_code}  {samples:,} samples  {config or '(no config recorded)'}")
+        conn.close()
+        return 0
+
+    run_id = args.run or latest_run(args.db)
+    if not run_id:
+        print(f"No runs recorded in {args.db}")
+        return 0
+    regressions = detect_regressions(run_id, args.db)
+    print(f"Run #{run_id}: {len(regressions)} significant slowdown(s)")
+    for regression in regressions:
+        print(f"  - {describe(regression)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
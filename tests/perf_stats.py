@@ -0,0 +1,65 @@
+"""
+Small statistics helpers for timing data (no numpy dependency)
+"""
+import math
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile (pct in 0..100) of an unsorted sequence"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return ordered[0]
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(values):
+    """count/mean/min/max and p50/p95/p99 of a list of numbers"""
+    if not values:
+        return {'count': 0, 'mean': None, 'min': None, 'max': None, 'p50': None, 'p95': None, 'p99': None}
+    return {
+        'count': len(values),
+        'mean': sum(values) / len(values),
+        'min': min(values),
+        'max': max(values),
+        'p50': percentile(values, 50),
+        'p95': percentile(values, 95),
+        'p99': percentile(values, 99),
+    }
+
+
+def fmt_ms(value):
+    """Format a millisecond value for report tables"""
+    return "-" if value is None else f"{value:,.1f}"
+
+
+def mann_whitney_u(sample, reference):
+    """One-sided Mann-Whitney U test that `sample` tends to be larger than `reference`
+
+    Returns (U, p). Normal approximation with tie and continuity correction: fine from about
+    three values per side, which is all a handful of recent runs provide.
+    """
+    n1, n2 = len(sample), len(reference)
+    if not n1 or not n2:
+        return None, None
+    pooled = sorted([(value, 0) for value in sample] + [(value, 1) for value in reference])
+    ranks, ties, i = [0.0] * len(pooled), 0, 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[k] = (i + j) / 2 + 1
+        ties += (j - i + 1) ** 3 - (j - i + 1)
+        i = j + 1
+    u = sum(rank for rank, (value, group) in zip(ranks, pooled) if group == 0) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
@@ -0,0 +1,277 @@
+"""
+Pytest plugin: browser performance timing for every page the suite visits
+Records Navigation Timing, LCP, long tasks and resource timing after each driver.get,
+aggregates them per route and writes them to perf_timings.json and the HTML report
+API endpoint timings recorded through the api_timing fixture are written alongside
+"""
+import json
+import os
+from urllib.parse import urlparse
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.support.events import AbstractEventListener, EventFiringWebDriver
+
+from perf_stats import summarize, fmt_ms
+
+ENABLED = os.getenv('TEST_PERF_TIMING', '1') != '0'
+DEFAULT_OUTPUT = 'perf_timings.json'
+
+# Registered on every new document so LCP and long tasks are observed from the start
+PERF_OBSERVER_JS = """
+(function () {
+    if (window.__qaPerf) { return; }
+    var perf = window.__qaPerf = { lcp: null, longTasks: [] };
+    try { performance.setResourceTimingBufferSize(1000); } catch (e) {}
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (entry) { perf.lcp = entry.renderTime || entry.loadTime || entry.startTime; });
+        }).observe({ type: 'largest-contentful-paint', buffered: true });
+    } catch (e) {}
+    try {
+        new PerformanceObserver(function (list) {
+            list.getEntries().forEach(function (entry) { perf.longTasks.push([entry.startTime, entry.duration]); });
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) {}
+})();
+"""
+
+COLLECT_JS = """
+var nav = performance.getEntriesByType('navigation')[0];
+if (!nav) { return null; }
+var perf = window.__qaPerf || { lcp: null, longTasks: [] };
+var resources = performance.getEntriesByType('resource');
+var byType = {};
+var bytes = 0;
+resources.forEach(function (r) {
+    byType[r.initiatorType] = (byType[r.initiatorType] || 0) + 1;
+    bytes += r.transferSize || 0;
+});
+var slowest = resources.slice().sort(function (a, b) { return b.duration - a.duration; }).slice(0, 5)
+    .map(function (r) { return { name: r.name, type: r.initiatorType, duration_ms: r.duration, bytes: r.transferSize || 0 }; });
+return {
+    ttfb_ms: nav.responseStart,
+    dom_content_loaded_ms: nav.domContentLoadedEventEnd,
+    load_ms: nav.loadEventEnd,
+    document_bytes: nav.transferSize || 0,
+    lcp_ms: perf.lcp,
+    long_tasks: perf.longTasks.length,
+    long_task_ms: perf.longTasks.reduce(function (sum, t) { return sum + t[1]; }, 0),
+    resource_count: resources.length,
+    resource_bytes: bytes,
+    resources_by_type: byType,
+    slowest_resources: slowest
+};
+"""
+
+# Metrics summarized per route (p50/p95)
+ROUTE_METRICS = ['ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'lcp_ms', 'long_task_ms', 'resource_bytes']
+
+plugin_key = pytest.StashKey()
+api_timings_key = pytest.StashKey()
+
+
+def install_perf_observers(driver):
+    """Register the LCP/long-task observers for every future page load (Chrome/Edge)"""
+    if hasattr(driver, 'execute_cdp_cmd'):
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': PERF_OBSERVER_JS})
+
+
+def route_of(url):
+    """Route key for a URL: its path without query string"""
+    return urlparse(url).path or '/'
+
+
+class PageTimingRecorder(AbstractEventListener):
+    """Collects one timing sample per driver.get, taken just before the next navigation"""
+
+    def __init__(self):
+        self.driver = None
+        self.current_url = None
+        self.samples = []
+        # Other per-page collectors (e.g. network_audit), called as hook(driver, route, url)
+        self.page_hooks = []
+        # Added to every sample, e.g. {'profile': 'low-end-3g'} while a device profile is applied
+        self.tags = {}
+
+    def after_navigate_to(self, url, driver):
+        self.driver = driver
+        self.current_url = url
+
+    def before_navigate_to(self, url, driver):
+        # Measure the previous page only now, once its API calls and rendering have finished
+        self.flush()
+
+    def flush(self):
+        """Record the page currently loaded, if it has not been recorded yet"""
+        if self.current_url is None:
+            return
+        url, self.current_url = self.current_url, None
+        route = route_of(url)
+        for hook in self.page_hooks:
+            hook(self.driver, route, url)
+        try:
+            metrics = self.driver.execute_script(COLLECT_JS)
+        except WebDriverException:
+            return
+        if metrics:
+            self.samples.append(dict(metrics, route=route, url=url, **self.tags))
+
+    def take(self):
+        """Return and clear everything recorded since the last call"""
+        self.flush()
+        samples, self.samples = self.samples, []
+        return samples
+
+
+def page_recorder(config):
+    """The session's PageTimingRecorder, or None when TEST_PERF_TIMING=0"""
+    plugin = config.stash.get(plugin_key, None)
+    return plugin.recorder if plugin else None
+
+
+def wrap_driver(config, driver):
+    """Wrap a WebDriver so every driver.get is timed (no-op when disabled)"""
+    plugin = config.stash.get(plugin_key, None)
+    if plugin is None:
+        return driver
+    return EventFiringWebDriver(driver, plugin.recorder)
+
+
+def add_report_extra(report, data, name):
+    """Attach JSON data to a test's row in the pytest-html report"""
+    try:
+        import pytest_html
+    except ImportError:
+        return
+    report.extras = getattr(report, 'extras', []) + [pytest_html.extras.json(data, name=name)]
+
+
+def route_key(sample):
+    """Aggregation key: the route, plus the device profile it was loaded under ("/expenses @low-end-3g")"""
+    return f"{sample['route']} @{sample['profile']}" if sample.get('profile') else sample['route']
+
+
+def aggregate_routes(samples_by_test):
+    """Per-route summary of all samples: {route: {samples, tests, <metric>: {p50, p95, ...}}}"""
+    by_route = {}
+    for nodeid, samples in samples_by_test.items():
+        for sample in samples:
+            entry = by_route.setdefault(route_key(sample), {'samples': [], 'tests': set()})
+            entry['samples'].append(sample)
+            entry['tests'].add(nodeid)
+
+    routes = {}
+    for route, entry in sorted(by_route.items()):
+        summary = {'samples': len(entry['samples']), 'tests': sorted(entry['tests'])}
+        for metric in ROUTE_METRICS:
+            values = [s[metric] for s in entry['samples'] if s.get(metric) is not None]
+            summary[metric] = summarize(values)
+        routes[route] = summary
+    return routes
+
+
+def format_route_table(routes):
+    """Plain-text per-route table (p50 values)"""
+    lines = [f"{'Route':<32}{'Samples':>8}{'TTFB':>9}{'DCL':>9}{'Load':>9}{'LCP':>9}{'LongTask':>10}{'KB':>9}"]
+    for route, summary in routes.items():
+        lines.append(
+            f"{route:<32}{summary['samples']:>8}"
+            + "".join(f"{fmt_ms(summary[m]['p50']):>9}" for m in ['ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'lcp_ms'])
+            + f"{fmt_ms(summary['long_task_ms']['p50']):>10}"
+            + f"{fmt_ms((summary['resource_bytes']['p50'] or 0) / 1024):>9}"
+        )
+    return "\n".join(lines)
+
+
+def is_xdist_worker(config):
+    return hasattr(config, 'workerinput')
+
+
+class PerfTimingPlugin:
+    """Attaches samples to test reports and aggregates them per route on the controller"""
+
+    def __init__(self, config):
+        self.config = config
+        self.recorder = PageTimingRecorder()
+        self.samples_by_test = {}
+        self.api_timings = {}
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when != 'call':
+            return
+        samples = self.recorder.take()
+        api_timings = item.stash.get(api_timings_key, None)
+        if not samples and not api_timings:
+            return
+        report = outcome.get_result()
+        # Plain attributes travel with the report, so xdist workers hand their samples to the controller
+        if samples:
+            report.page_timings = samples
+            add_report_extra(report, samples, 'Page timings')
+        if api_timings:
+            report.api_timings = api_timings
+            add_report_extra(report, api_timings, 'API timings')
+
+    def pytest_runtest_logreport(self, report):
+        samples = getattr(report, 'page_timings', None)
+        if samples:
+            self.samples_by_test.setdefault(report.nodeid, []).extend(samples)
+        self.api_timings.update(getattr(report, 'api_timings', None) or {})
+
+    def pytest_sessionfinish(self, session):
+        if not (self.samples_by_test or self.api_timings) or is_xdist_worker(self.config):
+            return
+        routes = aggregate_routes(self.samples_by_test)
+        with open(self.config.getoption('--perf-timings'), 'w', encoding='utf-8') as f:
+            json.dump({'routes': routes, 'api': self.api_timings, 'tests': self.samples_by_test}, f, indent=2)
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if not (self.samples_by_test or self.api_timings) or is_xdist_worker(self.config):
+            return
+        if self.samples_by_test:
+            terminalreporter.write_sep('-', 'page timings per route (p50 ms)')
+            terminalreporter.write_line(format_route_table(aggregate_routes(self.samples_by_test)))
+        terminalreporter.write_line(f"Full timings: {self.config.getoption('--perf-timings')}")
+
+    @pytest.hookimpl(optionalhook=True)
+    def pytest_html_results_summary(self, prefix, summary, postfix):
+        if not self.samples_by_test:
+            return
+        rows = []
+        for route, data in aggregate_routes(self.samples_by_test).items():
+            cells = "".join(
+                f"<td>{fmt_ms(data[m]['p50'])} / {fmt_ms(data[m]['p95'])}</td>"
+                for m in ['ttfb_ms', 'dom_content_loaded_ms', 'load_ms', 'lcp_ms', 'long_task_ms']
+            )
+            rows.append(f"<tr><td>{route}</td><td>{data['samples']}</td>{cells}</tr>")
+        postfix.append(
+            "<h2>Page timings per route</h2>"
+            "<p>p50 / p95 in milliseconds across all visits in this run.</p>"
+            "<table><tr><th>Route</th><th>Samples</th><th>TTFB</th><th>DOMContentLoaded</th>"
+            "<th>Load</th><th>LCP</th><th>Long tasks</th></tr>" + "".join(rows) + "</table>"
+        )
+
+
+@pytest.fixture
+def api_timing(request):
+    """Record an API endpoint's timing summary, e.g. api_timing('dashboard', measure_endpoint(...))"""
+    timings = request.node.stash.setdefault(api_timings_key, {})
+
+    def record(endpoint, summary):
+        timings[endpoint] = summary
+
+    return record
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('perf-timing', 'browser performance timing')
+    group.addoption('--perf-timings', default=DEFAULT_OUTPUT, help="Where to write per-route page timings (JSON)")
+
+
+def pytest_configure(config):
+    if ENABLED:
+        config.stash[plugin_key] = plugin = PerfTimingPlugin(config)
+        config.pluginmanager.register(plugin, 'perf-timing')
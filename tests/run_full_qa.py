@@ -7,7 +7,9 @@ Run this script to perform complete QA testing of the Financial Planner applicat
 import subprocess
 import sys
 import os
+import argparse
 from datetime import datetime
+from runner_options import add_runner_arguments, worker_args, shard_args, record_durations, test_targets
 
 # Fix Windows console encoding
 if sys.platform == 'win32':
@@ -21,7 +23,87 @@ def print_header(text):
     print(f"  {text}")
     print("=" * 80 + "\n")
 
-def run_full_qa():
+def run_load_stage(users, duration, summary_path):
+    """Run the API load test in-process and return its summary (None if it could not run)"""
+    print_header("📈 API LOAD TEST")
+    try:
+        import asyncio
+        from settings import BACKEND_URL, TEST_EMAIL, TEST_PASSWORD
+        from load.engine import run_load_test
+        from load.report import format_summary, write_summary
+        
+        summary = asyncio.run(run_load_test(
+            f"{BACKEND_URL}/api", TEST_EMAIL, TEST_PASSWORD, users=users, duration=duration
+        ))
+    except Exception as e:
+        print(f"⚠️  Load test could not run: {e}")
+        return None
+    
+    print(format_summary(summary))
+    write_summary(summary, summary_path)
+    print(f"\n📈 Load summary saved to: {summary_path}")
+    return summary
+
+def run_smoke_stage(test_dir):
+    """Run the browserless API smoke tier; return its pytest exit code"""
+    print_header("💨 API SMOKE TESTS")
+    result = subprocess.run(
+        [sys.executable, "-m", "pytest", "-m", "smoke", "-q", "--tb=short", "--color=yes", "-p", "no:cacheprovider", test_dir],
+        cwd=test_dir
+    )
+    if result.returncode == 0:
+        print("\n✅ Backend smoke tests passed - starting the UI suite")
+    else:
+        print(f"\n❌ Backend smoke tests failed (exit code {result.returncode}) - skipping the UI suite")
+        print("Fix the API (or check that the server is running) before running browser tests.")
+    return result.returncode
+
+def run_budget_stage(timings_path, tests_passed):
+    """Check the run's timings against perf_budgets.json and the last green baseline; return the failures"""
+    print_header("⏱️  PERFORMANCE BUDGETS")
+    from budgets import BASELINE_PATH, evaluate, write_baseline
+    
+    if not os.path.exists(timings_path):
+        print(f"⚠️  No timings recorded ({timings_path} missing), skipping budget check")
+        return []
+    
+    violations, regressions = evaluate(timings_path)
+    failures = violations + regressions
+    for title, items in (("Budget exceeded", violations), ("Slower than baseline", regressions)):
+        if items:
+            print(f"❌ {title}:")
+            for item in items:
+                print(f"  - {item}")
+    
+    if not failures and tests_passed:
+        write_baseline(timings_path)
+        print(f"✅ All performance budgets met - baseline updated: {BASELINE_PATH}")
+    elif not failures:
+        print("✅ All performance budgets met (baseline kept: test failures in this run)")
+    return failures
+
+def run_history_stage(timings_path, junit_path, load_summary, exit_code, config):
+    """Append this run to the performance history and return its significant slowdowns as sentences"""
+    print_header("📚 PERFORMANCE HISTORY")
+    try:
+        from perf_history import HISTORY_PATH, collect_samples, describe, detect_regressions, record_run, run_config
+        
+        run_id = record_run(collect_samples(timings_path, junit_path, load_summary), exit_code, run_config(**config))
+        regressions = [describe(regression) for regression in detect_regressions(run_id)]
+    except Exception as e:
+        print(f"⚠️  Could not update the performance history: {e}")
+        return []
+    
+    print(f"📚 Run #{run_id} recorded in {HISTORY_PATH}")
+    if regressions:
+        print("📉 Slower than recent runs:")
+        for regression in regressions:
+            print(f"  - {regression}")
+    else:
+        print("✅ No significant slowdown against recent runs")
+    return regressions
+
+def run_full_qa(workers=1, shard=None, changed_since=None, load=False, load_users=10, load_duration=30.0):
     """Run comprehensive QA tests for all features"""
     print_header("🚀 FINANCIAL PLANNER - COMPREHENSIVE QA TEST SUITE")
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
@@ -49,10 +131,15 @@ def run_full_qa():
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     html_report = os.path.join(test_dir, f"QA_REPORT_{timestamp}.html")
     summary_file = os.path.join(test_dir, f"QA_SUMMARY_{timestamp}.txt")
+    timings_file = os.path.join(test_dir, 'perf_timings.json')
+    junit_file = os.path.join(test_dir, 'junit.xml')
     
     print(f"\n📁 Test Directory: {test_dir}")
     print(f"📊 HTML Report: {html_report}")
     print(f"📝 Summary File: {summary_file}")
+    print(f"🧵 Workers: {workers}")
+    if shard:
+        print(f"🧩 Shard: {shard[0] + 1}/{shard[1]}")
     print("\n" + "-" * 80)
     print("⏳ Starting tests... This may take several minutes.\n")
     
@@ -64,15 +151,34 @@ def run_full_qa():
         "--tb=short",  # Short traceback format
         f"--html={html_report}",  # HTML report
         "--self-contained-html",  # Self-contained HTML
-        f"--junitxml={os.path.join(test_dir, 'junit.xml')}",  # JUnit XML for CI/CD
+        f"--junitxml={junit_file}",  # JUnit XML for CI/CD
+        f"--perf-timings={timings_file}",  # Page timings per route
         "--timeout=300",  # 5 minute timeout per test
         "--durations=10",  # Show 10 slowest tests
         "-ra",  # Show extra test summary info for all tests
         "--color=yes",  # Colored output
-        test_dir
+        *worker_args(workers),  # Parallel browsers via pytest-xdist
+        *shard_args(shard),  # One duration-balanced slice of the suite
+        "-m", "not smoke",  # Already run by the smoke stage
+        *test_targets(test_dir, changed_since)  # Whole suite, or only what a diff affects
     ]
     
     try:
+        # A broken backend fails here in seconds instead of after every browser test has timed out
+        smoke_code = run_smoke_stage(test_dir)
+        if smoke_code != 0:
+            with open(summary_file, 'w', encoding='utf-8') as f:
+                f.write("FINANCIAL PLANNER - QA TEST SUMMARY\n")
+                f.write(f"Test Run: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+                f.write(f"Exit Code: {smoke_code}\n")
+                f.write("Status: API SMOKE TESTS FAILED - UI suite not run\n")
+            print(f"\n📝 Summary saved to: {summary_file}")
+            return smoke_code
+        
+        # Stale timings from an earlier run must not be checked against the budgets
+        if os.path.exists(timings_file):
+            os.remove(timings_file)
+        
         # Run the tests
         result = subprocess.run(
             pytest_args, 
@@ -80,6 +186,7 @@ def run_full_qa():
             capture_output=False,  # Show output in real-time
             text=True
         )
+        record_durations(junit_file)
         
         # Print summary
         print_header("📊 QA TEST RESULTS SUMMARY")
@@ -96,22 +203,61 @@ def run_full_qa():
         print(f"📝 Open the HTML report in your browser to see full test results.")
         print(f"\nCompleted at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         
+        budget_failures = run_budget_stage(timings_file, result.returncode == 0)
+        exit_code = result.returncode or (1 if budget_failures else 0)
+        
+        load_summary = None
+        if load:
+            load_summary = run_load_stage(
+                load_users, load_duration, os.path.join(test_dir, f"LOAD_SUMMARY_{timestamp}.json")
+            )
+        
+        history_regressions = run_history_stage(
+            timings_file, junit_file, load_summary, exit_code,
+            {'workers': workers, 'shard': shard, 'changed_since': changed_since}
+        )
+        
         # Create summary file (with UTF-8 encoding for Windows compatibility)
         with open(summary_file, 'w', encoding='utf-8') as f:
             f.write("=" * 80 + "\n")
             f.write("FINANCIAL PLANNER - QA TEST SUMMARY\n")
             f.write("=" * 80 + "\n\n")
             f.write(f"Test Run: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-            f.write(f"Exit Code: {result.returncode}\n")
-            status_text = "ALL TESTS PASSED" if result.returncode == 0 else "SOME TESTS FAILED"
+            f.write(f"Exit Code: {exit_code}\n")
+            if result.returncode != 0:
+                status_text = "SOME TESTS FAILED"
+            elif budget_failures:
+                status_text = "PERFORMANCE BUDGETS EXCEEDED"
+            else:
+                status_text = "ALL TESTS PASSED"
             f.write(f"Status: {status_text}\n")
+            f.write(f"Workers: {workers}\n")
+            if shard:
+                f.write(f"Shard: {shard[0] + 1}/{shard[1]}\n")
             f.write(f"\nHTML Report: {html_report}\n")
-            f.write(f"JUnit XML: {os.path.join(test_dir, 'junit.xml')}\n")
+            f.write(f"JUnit XML: {junit_file}\n")
+            f.write(f"Page Timings: {timings_file}\n")
+            if budget_failures:
+                f.write("\n" + "-" * 80 + "\n")
+                f.write("PERFORMANCE BUDGETS\n")
+                f.write("-" * 80 + "\n")
+                f.write("\n".join(budget_failures) + "\n")
+            if history_regressions:
+                f.write("\n" + "-" * 80 + "\n")
+                f.write("PERFORMANCE HISTORY (slower than recent runs)\n")
+                f.write("-" * 80 + "\n")
+                f.write("\n".join(history_regressions) + "\n")
+            if load_summary:
+                from load.report import format_summary
+                f.write("\n" + "-" * 80 + "\n")
+                f.write("API LOAD TEST\n")
+                f.write("-" * 80 + "\n")
+                f.write(format_summary(load_summary) + "\n")
         
         print(f"\n📝 Summary saved to: {summary_file}")
         print("\n" + "=" * 80)
         
-        return result.returncode
+        return exit_code
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Tests interrupted by user")
@@ -123,5 +269,12 @@ def run_full_qa():
         return 1
 
 if __name__ == "__main__":
-    exit_code = run_full_qa()
+    parser = add_runner_arguments(argparse.ArgumentParser(description="Run the complete Financial Planner QA suite"))
+    parser.add_argument('--load', action='store_true', help="Run the API load test after the UI suite and add it to the summary")
+    parser.add_argument('--load-users', type=int, default=10, help="Virtual users for --load")
+    parser.add_argument('--load-duration', type=float, default=30.0, help="Seconds to run --load")
+    args = parser.parse_args()
+    exit_code = run_full_qa(
+        workers=args.workers, shard=args.shard, changed_since=args.changed_since, load=args.load, load_users=args.load_users, load_duration=args.load_duration
+    )
     sys.exit(exit_code)
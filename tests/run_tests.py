@@ -5,9 +5,11 @@ Main test runner script with comprehensive reporting
 import subprocess
 import sys
 import os
+import argparse
 from datetime import datetime
+from runner_options import add_runner_arguments, worker_args, shard_args, record_durations, test_targets
 
-def run_tests():
+def run_tests(workers=1, shard=None, changed_since=None):
     """Run all tests with comprehensive reporting"""
     print("=" * 80)
     print("🚀 Financial Planner - Comprehensive Test Suite")
@@ -27,20 +29,27 @@ def run_tests():
         f"--html={html_report}",  # HTML report
         "--self-contained-html",  # Self-contained HTML
         f"--junitxml={os.path.join(test_dir, 'junit.xml')}",  # JUnit XML for CI/CD
+        f"--perf-timings={os.path.join(test_dir, 'perf_timings.json')}",  # Page timings per route
         # Removed -x flag to run ALL tests regardless of failures
         "--timeout=300",  # 5 minute timeout per test
         "--durations=10",  # Show 10 slowest tests
         "-ra",  # Show extra test summary info for all tests
-        test_dir
+        *worker_args(workers),  # Parallel browsers via pytest-xdist
+        *shard_args(shard),  # One duration-balanced slice of the suite
+        *test_targets(test_dir, changed_since)  # Whole suite, or only what a diff affects
     ]
     
     print("Running tests...")
     print(f"Test directory: {test_dir}")
+    print(f"Workers: {workers}")
+    if shard:
+        print(f"Shard: {shard[0] + 1}/{shard[1]}")
     print(f"HTML report will be saved to: {html_report}")
     print()
     
     try:
         result = subprocess.run(pytest_args, cwd=test_dir)
+        record_durations(os.path.join(test_dir, 'junit.xml'))
         
         print()
         print("=" * 80)
@@ -62,6 +71,8 @@ def run_tests():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(run_tests())
+    parser = add_runner_arguments(argparse.ArgumentParser(description="Run the Financial Planner test suite"))
+    args = parser.parse_args()
+    sys.exit(run_tests(workers=args.workers, shard=args.shard, changed_since=args.changed_since))
 
 
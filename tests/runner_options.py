@@ -0,0 +1,87 @@
+"""
+Command line options shared by run_tests.py and run_full_qa.py
+"""
+import argparse
+import os
+
+from change_map import select_tests
+from scheduler import parse_shard, record_junit
+
+
+def workers_type(value):
+    """Accept a positive worker count or 'auto' (one worker per CPU core)"""
+    if value == 'auto':
+        return value
+    try:
+        count = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid worker count: {value!r} (use a number or 'auto')")
+    if count < 1:
+        raise argparse.ArgumentTypeError("worker count must be at least 1")
+    return count
+
+
+def add_runner_arguments(parser):
+    """Register the options both runners understand"""
+    parser.add_argument(
+        '--workers',
+        type=workers_type,
+        default=1,
+        help="Number of parallel pytest-xdist workers, each with its own browser ('auto' = one per CPU core)"
+    )
+    parser.add_argument(
+        '--shard',
+        type=parse_shard,
+        default=None,
+        help="Run only shard i of N (e.g. 2/4, one per CI machine), balanced by past test durations"
+    )
+    parser.add_argument(
+        '--changed-since',
+        metavar='GIT_REF',
+        default=None,
+        help="Only run tests affected by changes since this git ref (plus a smoke core)"
+    )
+    return parser
+
+
+def worker_args(workers):
+    """pytest arguments that distribute the suite across xdist workers"""
+    if workers == 1:
+        return []
+    # loadfile keeps each module on one worker so tests that build on each other stay together
+    return ["-n", str(workers), "--dist", "loadfile"]
+
+
+def shard_args(shard):
+    """pytest arguments selecting one duration-balanced shard"""
+    if shard is None:
+        return []
+    index, count = shard
+    # One token: before conftest.py registers --shard, pytest would take a separate "i/N" for a path
+    return [f"--shard={index + 1}/{count}"]
+
+
+def record_durations(junit_path):
+    """Feed this run's JUnit durations back into the scheduler's history"""
+    if not os.path.exists(junit_path):
+        return
+    try:
+        count = record_junit(junit_path)
+        print(f"⏱️  Recorded {count} test durations for scheduling")
+    except Exception as e:
+        print(f"⚠️  Could not record test durations: {e}")
+
+
+def test_targets(test_dir, changed_since=None):
+    """pytest path arguments: the whole test directory, or the tests affected by a diff"""
+    if not changed_since:
+        return [test_dir]
+    targets, reasons = select_tests(changed_since)
+    print(f"🔎 Changes since {changed_since}:")
+    for path, reason in reasons.items():
+        print(f"  {path}: {reason}")
+    if targets is None:
+        print("➡️  Running the full suite")
+        return [test_dir]
+    print(f"➡️  Running {len(targets)} affected target(s): {' '.join(targets)}")
+    return targets
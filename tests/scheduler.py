@@ -0,0 +1,168 @@
+"""
+Duration-aware test scheduling
+Keeps a per-test duration history from past JUnit files, runs the slowest modules first
+and splits the suite into balanced shards (longest processing time first)
+
+Pytest plugin options: --shard i/N, --durations-history PATH
+Standalone: python scheduler.py --record junit.xml | --plan N
+"""
+import argparse
+import heapq
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+
+import pytest
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.getenv('TEST_DURATIONS_HISTORY', os.path.join(TESTS_DIR, 'test_durations.json'))
+# Weight of the newest run in the moving average
+SMOOTHING = 0.3
+# Estimate for tests without history when nothing else is known
+DEFAULT_DURATION = 5.0
+
+
+def load_history(path=HISTORY_PATH):
+    """{nodeid: {'mean': seconds, 'runs': n}} (empty when no run has been recorded yet)"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def junit_nodeid(classname, name, rootdir=TESTS_DIR):
+    """Rebuild a pytest node id from a JUnit testcase's classname ('pkg.test_mod.TestCls') and name"""
+    parts = classname.split('.')
+    for i in range(len(parts), 0, -1):
+        module = os.path.join(*parts[:i]) + '.py'
+        if os.path.exists(os.path.join(rootdir, module)):
+            return '::'.join([module.replace(os.sep, '/')] + parts[i:] + [name])
+    return '::'.join([f"{classname.replace('.', '/')}.py", name])
+
+
+def parse_junit(junit_path, rootdir=TESTS_DIR):
+    """{nodeid: seconds} for every test that ran (skipped tests are left out)"""
+    durations = {}
+    for case in ET.parse(junit_path).getroot().iter('testcase'):
+        if case.find('skipped') is not None:
+            continue
+        nodeid = junit_nodeid(case.get('classname', ''), case.get('name', ''), rootdir)
+        durations[nodeid] = float(case.get('time', 0))
+    return durations
+
+
+def record_junit(junit_path, history_path=HISTORY_PATH, rootdir=TESTS_DIR):
+    """Fold a JUnit file into the duration history; returns the number of tests recorded"""
+    history = load_history(history_path)
+    durations = parse_junit(junit_path, rootdir)
+    for nodeid, seconds in durations.items():
+        entry = history.get(nodeid)
+        if entry:
+            entry['mean'] = SMOOTHING * seconds + (1 - SMOOTHING) * entry['mean']
+            entry['runs'] += 1
+        else:
+            history[nodeid] = {'mean': seconds, 'runs': 1}
+    with open(history_path, 'w', encoding='utf-8') as f:
+        json.dump(dict(sorted(history.items())), f, indent=2)
+    return len(durations)
+
+
+def estimator(history):
+    """Function nodeid -> expected seconds; unknown tests get the median of the known ones"""
+    known = sorted(entry['mean'] for entry in history.values())
+    fallback = known[len(known) // 2] if known else DEFAULT_DURATION
+    return lambda nodeid: history[nodeid]['mean'] if nodeid in history else fallback
+
+
+def module_of(nodeid):
+    return nodeid.split('::', 1)[0]
+
+
+def module_durations(nodeids, history):
+    """Expected seconds per module; modules are the scheduling unit (xdist --dist loadfile)"""
+    estimate = estimator(history)
+    totals = {}
+    for nodeid in nodeids:
+        module = module_of(nodeid)
+        totals[module] = totals.get(module, 0.0) + estimate(nodeid)
+    return totals
+
+
+def lpt_shards(durations, count):
+    """Split {unit: seconds} into `count` shards, assigning the longest unit to the least loaded shard"""
+    heap = [(0.0, index) for index in range(count)]
+    shards = [{'units': [], 'seconds': 0.0} for _ in range(count)]
+    for unit, seconds in sorted(durations.items(), key=lambda item: (-item[1], item[0])):
+        load, index = heapq.heappop(heap)
+        shards[index]['units'].append(unit)
+        shards[index]['seconds'] = load + seconds
+        heapq.heappush(heap, (load + seconds, index))
+    return shards
+
+
+def parse_shard(value):
+    """'2/4' -> (1, 4): zero-based index and shard count"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid shard: {value!r} (use i/N, e.g. 1/4)")
+    if not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard index must be between 1 and {count}")
+    return index - 1, count
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('scheduler', 'duration-aware scheduling')
+    group.addoption('--shard', type=parse_shard, default=None, help="Run only shard i of N (e.g. 1/4), balanced by past durations")
+    group.addoption('--durations-history', default=HISTORY_PATH, help="Duration history file (default: %(default)s)")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_collection_modifyitems(config, items):
+    history = load_history(config.getoption('--durations-history'))
+    totals = module_durations([item.nodeid for item in items], history)
+
+    shard = config.getoption('--shard')
+    if shard:
+        index, count = shard
+        selected = set(lpt_shards(totals, count)[index]['units'])
+        deselected = [item for item in items if module_of(item.nodeid) not in selected]
+        if deselected:
+            config.hook.pytest_deselected(items=deselected)
+            items[:] = [item for item in items if module_of(item.nodeid) in selected]
+
+    if history:
+        # Slowest modules first so no worker picks up a long module at the end; order within a module is kept
+        rank = {module: (-seconds, module) for module, seconds in totals.items()}
+        items.sort(key=lambda item: rank[module_of(item.nodeid)])
+
+
+def format_plan(shards):
+    total = sum(shard['seconds'] for shard in shards)
+    lines = [f"Ideal wall-clock: {total / len(shards):.1f}s, planned: {max(s['seconds'] for s in shards):.1f}s"]
+    for number, shard in enumerate(shards, 1):
+        lines.append(f"  shard {number}/{len(shards)}: {shard['seconds']:.1f}s  {' '.join(shard['units'])}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Duration history and shard planning for the test suite")
+    parser.add_argument('--history', default=HISTORY_PATH, help="Duration history file (default: %(default)s)")
+    parser.add_argument('--record', metavar='JUNIT_XML', help="Add a JUnit file's durations to the history")
+    parser.add_argument('--plan', type=int, metavar='N', help="Print how the known modules split into N shards")
+    args = parser.parse_args(argv)
+
+    if args.record:
+        print(f"⏱️  Recorded {record_junit(args.record, args.history)} test durations in {args.history}")
+    if args.plan:
+        history = load_history(args.history)
+        if not history:
+            print("No duration history yet - run the suite once with --junitxml and --record it")
+            return 1
+        print(format_plan(lpt_shards(module_durations(history, history), args.plan)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
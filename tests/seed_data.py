@@ -0,0 +1,104 @@
+"""
+Deterministic test dataset seeded through the REST API
+Creates everything in one concurrent batch and removes it again at teardown
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from api_client import ApiError
+
+SEED_PREFIX = "QA Seed"
+
+
+def _this_month(day):
+    """ISO date in the current month, so the dashboard's monthly totals include it"""
+    first = date.today().replace(day=1)
+    return (first + timedelta(days=min(day, date.today().day) - 1)).isoformat()
+
+
+def build_dataset():
+    """Records to create, keyed by the API resource path"""
+    return {
+        'bank-accounts': [
+            {'account_name': f'{SEED_PREFIX} Checking', 'bank_name': f'{SEED_PREFIX} Bank', 'account_type': 'Checking',
+             'country': 'United States', 'currency': 'USD', 'current_balance': 2500.00},
+        ],
+        'expenses': [
+            {'category': 'Food', 'description': f'{SEED_PREFIX} Groceries', 'amount': 82.40, 'currency': 'USD',
+             'payment_method': 'Cash', 'date': _this_month(1)},
+            {'category': 'Transportation', 'description': f'{SEED_PREFIX} Train pass', 'amount': 120.00, 'currency': 'USD',
+             'payment_method': 'Cash', 'date': _this_month(2)},
+            {'category': 'Utilities', 'description': f'{SEED_PREFIX} Electricity', 'amount': 64.15, 'currency': 'SGD',
+             'payment_method': 'Cash', 'date': _this_month(3)},
+        ],
+        'income': [
+            {'amount': 5200.00, 'currency': 'USD', 'income_type': 'Salary', 'frequency': 'Monthly',
+             'source': f'{SEED_PREFIX} Employer', 'description': f'{SEED_PREFIX} Salary', 'date': _this_month(1)},
+            {'amount': 350.00, 'currency': 'USD', 'income_type': 'Freelance', 'frequency': 'One-time',
+             'source': f'{SEED_PREFIX} Client', 'description': f'{SEED_PREFIX} Side project', 'date': _this_month(2)},
+        ],
+        'loans': [
+            {'loan_name': f'{SEED_PREFIX} Car Loan', 'loan_type': 'Auto', 'lender_name': f'{SEED_PREFIX} Bank',
+             'principal_amount': 18000, 'remaining_balance': 12500, 'monthly_payment': 410, 'interest_rate': 4.5,
+             'currency': 'USD', 'payment_day': 15},
+        ],
+        'financial-goals': [
+            {'name': f'{SEED_PREFIX} Emergency Fund', 'goal_type': 'Emergency Fund', 'target_amount': 10000,
+             'current_amount': 2500, 'priority': 'high'},
+        ],
+    }
+
+
+def _create(client, resource, payload):
+    try:
+        response = client.post(resource, json=payload)
+        return resource, dict(payload, id=response.json()['id']), None
+    except ApiError as e:
+        # Free tier limits (403) leave that record out instead of failing the whole session
+        if e.status_code != 403:
+            raise
+        return resource, None, e
+
+
+def seed_dataset(client, dataset=None, max_workers=8):
+    """Create the dataset concurrently; returns {resource: [created records with ids]}"""
+    dataset = dataset or build_dataset()
+    seeded = {resource: [] for resource in dataset}
+    jobs = [(resource, payload) for resource, payloads in dataset.items() for payload in payloads]
+
+    failures = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for future in [executor.submit(_create, client, *job) for job in jobs]:
+            try:
+                resource, record, error = future.result()
+            except ApiError as e:
+                failures.append(e)
+                continue
+            if error:
+                print(f"⚠️  Could not seed {resource} (free tier limit): {error}")
+            else:
+                seeded[resource].append(record)
+    if failures:
+        # Anything but a tier limit is a broken backend: remove what was created and fail the session
+        teardown_dataset(client, seeded, max_workers)
+        raise failures[0]
+
+    created = sum(len(records) for records in seeded.values())
+    print(f"🌱 Seeded {created}/{len(jobs)} records via {client.api_url}")
+    return seeded
+
+
+def teardown_dataset(client, seeded, max_workers=8):
+    """Delete every record seed_dataset created"""
+    jobs = [(resource, record['id']) for resource, records in seeded.items() for record in records]
+
+    def delete(job):
+        resource, record_id = job
+        try:
+            client.delete(f"{resource}/{record_id}", expected=(200, 404))
+        except ApiError as e:
+            print(f"⚠️  Could not remove seeded {resource}/{record_id}: {e}")
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(delete, jobs))
+    print(f"🧹 Removed {len(jobs)} seeded records")
@@ -0,0 +1,192 @@
+"""
+Pytest plugin: per-test CPU profiles of the Express server (TEST_SERVER_PROFILE=1)
+The harness starts node with --inspect; each test's call phase is wrapped in a V8 CPU profile whose
+.cpuprofile file and hottest functions are attached to the test's row in the HTML report
+"""
+import json
+import os
+import re
+
+import pytest
+import requests
+
+from memory_profile import DevToolsSession
+from perf_timing import is_xdist_worker
+from settings import SERVER_PROFILE
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'server_profiles')
+SAMPLING_INTERVAL_US = 250
+TOP_FUNCTIONS = 15
+# V8 bookkeeping nodes that are not code
+IGNORED_FRAMES = ('(idle)', '(program)', '(root)')
+
+profiler_key = pytest.StashKey()
+profile_key = pytest.StashKey()
+
+
+class NodeProfiler:
+    """CPU profiler of a node process started with --inspect"""
+
+    def __init__(self, inspect_port):
+        self.inspect_port = inspect_port
+        self.session = None
+
+    def connect(self):
+        if self.session is None:
+            targets = requests.get(f"http://127.0.0.1:{self.inspect_port}/json/list", timeout=5).json()
+            self.session = DevToolsSession(targets[0]['webSocketDebuggerUrl'])
+            self.session.call('Profiler.enable')
+            self.session.call('Profiler.setSamplingInterval', {'interval': SAMPLING_INTERVAL_US})
+        return self.session
+
+    def start(self):
+        self.connect().call('Profiler.start')
+
+    def stop(self):
+        """The .cpuprofile document recorded since start()"""
+        return self.connect().call('Profiler.stop')['profile']
+
+    def close(self):
+        if self.session:
+            self.session.close()
+            self.session = None
+
+
+def frame_label(call_frame, server_dir=None):
+    """'functionName file:line' with server paths shortened to server/..."""
+    url = call_frame.get('url', '')
+    if url.startswith('file://'):
+        url = url[len('file://'):]
+    if server_dir and url.startswith(server_dir):
+        url = 'server' + url[len(server_dir):]
+    name = call_frame.get('functionName') or '(anonymous)'
+    return f"{name} {url}:{call_frame.get('lineNumber', -1) + 1}" if url else name
+
+
+def hot_functions(profile, top=TOP_FUNCTIONS, server_dir=None):
+    """Functions with the most self time: [{'function', 'self_ms', 'total_ms', 'self_pct'}]
+
+    Sample i lasts until sample i+1 (as DevTools counts it). Total time counts each frame once per
+    sample even when it recurses.
+    """
+    nodes = {node['id']: node for node in profile['nodes']}
+    parents = {child: node['id'] for node in profile['nodes'] for child in node.get('children', [])}
+    samples, deltas = profile.get('samples', []), profile.get('timeDeltas', [])
+    self_us, total_us = {}, {}
+    for index, node_id in enumerate(samples):
+        duration = deltas[index + 1] if index + 1 < len(deltas) else 0
+        label = frame_label(nodes[node_id]['callFrame'], server_dir)
+        if nodes[node_id]['callFrame'].get('functionName') in IGNORED_FRAMES:
+            continue
+        self_us[label] = self_us.get(label, 0) + duration
+        seen = set()
+        while node_id is not None:
+            frame = frame_label(nodes[node_id]['callFrame'], server_dir)
+            if frame not in seen:
+                seen.add(frame)
+                total_us[frame] = total_us.get(frame, 0) + duration
+            node_id = parents.get(node_id)
+
+    busy_us = sum(self_us.values()) or 1
+    rows = [{'function': label, 'self_ms': us / 1000, 'total_ms': total_us.get(label, 0) / 1000,
+             'self_pct': 100 * us / busy_us} for label, us in self_us.items()]
+    rows.sort(key=lambda row: row['self_ms'], reverse=True)
+    return rows[:top], busy_us / 1000
+
+
+def format_hot_functions(rows, busy_ms):
+    lines = [f"Server CPU busy for {busy_ms:,.1f} ms during the test",
+             f"{'self ms':>9}{'self %':>8}{'total ms':>10}  function"]
+    for row in rows:
+        lines.append(f"{row['self_ms']:>9,.1f}{row['self_pct']:>7.1f}%{row['total_ms']:>10,.1f}  {row['function']}")
+    return "\n".join(lines)
+
+
+def profile_filename(nodeid):
+    return re.sub(r'[^\w.-]+', '_', nodeid).strip('_') + '.cpuprofile'
+
+
+class ServerProfilerPlugin:
+    """Starts a CPU profile before each test body and stops it right after"""
+
+    def __init__(self, config):
+        self.config = config
+        self.output_dir = config.getoption('--server-profiles')
+        self.profiler = None
+        self.server_dir = None
+
+    def attach(self, server):
+        """Called by the app_server fixture once node is listening with --inspect"""
+        self.profiler = NodeProfiler(server.inspect_port)
+        self.server_dir = os.path.realpath(server.cwd)
+
+    def detach(self):
+        if self.profiler:
+            self.profiler.close()
+            self.profiler = None
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(self, item):
+        if self.profiler is None:
+            yield
+            return
+        self.profiler.start()
+        try:
+            yield
+        finally:
+            profile = self.profiler.stop()
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.abspath(os.path.join(self.output_dir, profile_filename(item.nodeid)))
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(profile, f)
+            item.stash[profile_key] = (path, *hot_functions(profile, server_dir=self.server_dir))
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when != 'call' or profile_key not in item.stash:
+            return
+        path, rows, busy_ms = item.stash[profile_key]
+        report = outcome.get_result()
+        report.server_profile = {'path': path, 'busy_ms': busy_ms, 'hot_functions': rows}
+        try:
+            import pytest_html
+        except ImportError:
+            return
+        html_path = self.config.getoption('htmlpath', default=None)
+        link = os.path.relpath(path, os.path.dirname(os.path.abspath(html_path))) if html_path else path
+        report.extras = getattr(report, 'extras', []) + [
+            pytest_html.extras.text(format_hot_functions(rows, busy_ms), name="Server hot functions"),
+            pytest_html.extras.url(link, name="Server CPU profile"),
+        ]
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if is_xdist_worker(self.config):
+            return
+        profiled = [report for report in terminalreporter.stats.get('passed', []) + terminalreporter.stats.get('failed', [])
+                    if getattr(report, 'server_profile', None)]
+        if not profiled:
+            return
+        terminalreporter.write_sep('-', 'server CPU time per test (slowest first)')
+        profiled.sort(key=lambda report: report.server_profile['busy_ms'], reverse=True)
+        for report in profiled[:10]:
+            profile = report.server_profile
+            hottest = profile['hot_functions'][0]['function'] if profile['hot_functions'] else '-'
+            terminalreporter.write_line(f"{profile['busy_ms']:>9,.1f} ms  {report.nodeid}  (hottest: {hottest})")
+        terminalreporter.write_line(f"Profiles (open in Chrome DevTools > Performance): {self.output_dir}")
+
+
+def server_profiler(config):
+    """The session's ServerProfilerPlugin, or None unless TEST_SERVER_PROFILE is set"""
+    return config.stash.get(profiler_key, None)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('server-profile', 'server CPU profiling')
+    group.addoption('--server-profiles', default=DEFAULT_OUTPUT, help="Directory for per-test .cpuprofile files (default: tests/server_profiles)")
+
+
+def pytest_configure(config):
+    if SERVER_PROFILE:
+        config.stash[profiler_key] = plugin = ServerProfilerPlugin(config)
+        config.pluginmanager.register(plugin, 'server-profiler')
@@ -0,0 +1,56 @@
+"""
+Test configuration read from the environment (and tests/.env)
+Shared by the pytest fixtures and the standalone tools (load tests, benchmarks)
+"""
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Test configuration
+BASE_URL = os.getenv('TEST_BASE_URL', 'http://localhost:3000')
+TEST_EMAIL = os.getenv('TEST_EMAIL', 'test@example.com')
+TEST_PASSWORD = os.getenv('TEST_PASSWORD', 'Test1234!@#$')
+ADMIN_EMAIL = os.getenv('ADMIN_EMAIL', 'admin@test.com')
+ADMIN_PASSWORD = os.getenv('ADMIN_PASSWORD', 'Admin1234!@#$')
+API_URL = os.getenv('TEST_API_URL', f"{BASE_URL}/api")  # Dev server proxies /api to the backend
+
+# Local SQLite database used by the Express server in development (see server/database.js)
+SQLITE_DB_PATH = os.getenv(
+    'TEST_DB_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'server', 'financial_tracker.db')
+)
+
+# Template database (see datagen.py); when set, the session starts its own server on BACKEND_URL's port
+# against a copy of it and restores that copy before every test module
+DB_TEMPLATE = os.getenv('TEST_DB_TEMPLATE')
+
+# Hermetic runs: the session builds the client (cached per source hash) and serves it from its own server on a free port
+MANAGED_APP = os.getenv('TEST_MANAGED_APP', '0').lower() in ('1', 'true', 'yes')
+CLIENT_BUILD_DIR = os.getenv('TEST_CLIENT_BUILD_DIR')  # Prebuilt client to serve instead
+
+# Express server, addressed directly (no dev-server proxy) by load tests and benchmarks
+BACKEND_URL = os.getenv('TEST_BACKEND_URL', 'http://localhost:5001')
+
+# How logged_in_driver authenticates: 'api' (one HTTP login per session, token injected) or 'ui' (login form every test)
+LOGIN_MODE = os.getenv('TEST_LOGIN_MODE', 'api').lower()
+
+# Browser configuration
+BROWSER = os.getenv('TEST_BROWSER', 'chrome').lower()  # chrome, edge, safari
+CHROME_DRIVER_PATH = os.getenv('CHROME_DRIVER_PATH', r'C:\chromedriver\chromedriver.exe')
+EDGE_DRIVER_PATH = os.getenv('EDGE_DRIVER_PATH', None)  # Auto-detect if not set
+
+# Opt-in per-route audit of the XHR/fetch calls each page makes (Chrome performance log)
+NETWORK_AUDIT = os.getenv('TEST_NETWORK_AUDIT', '0').lower() in ('1', 'true', 'yes')
+
+# Opt-in HAR recording of every test's HTTP traffic, the input of the load replay (python -m load.replay)
+TRAFFIC_CAPTURE = os.getenv('TEST_TRAFFIC_CAPTURE', '0').lower() in ('1', 'true', 'yes')
+
+# Device profiles (device_profiles.py) the mobile tests run under, comma-separated; empty runs them unthrottled
+DEVICE_PROFILES = os.getenv('TEST_DEVICE_PROFILES', '')
+
+# Endurance mode: sidebar route cycles per session in test_endurance.py (0 skips it)
+ENDURANCE_CYCLES = int(os.getenv('TEST_ENDURANCE_CYCLES', '0'))
+
+# Per-test V8 CPU profiles of the server the session starts (needs TEST_DB_TEMPLATE or TEST_MANAGED_APP)
+SERVER_PROFILE = os.getenv('TEST_SERVER_PROFILE', '0').lower() in ('1', 'true', 'yes')
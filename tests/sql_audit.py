@@ -0,0 +1,282 @@
+"""
+SQL audit of a server run
+Replays every distinct statement from the server's SQL trace (SQL_TRACE_FILE) against a local database with
+EXPLAIN QUERY PLAN, flags full table scans and proposes composite indexes ranked by the time spent in the scans
+
+Run with: python sql_audit.py sql_trace.jsonl --db ../server/financial_tracker.db
+"""
+import argparse
+import json
+import re
+import sqlite3
+import sys
+
+from perf_stats import fmt_ms, percentile
+from settings import SQLITE_DB_PATH
+
+EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'WITH', 'REPLACE')
+# "SCAN expenses", "SCAN e USING COVERING INDEX ..." (3.36+) or "SCAN TABLE expenses AS e" (older)
+SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS (\w+))?(?: USING (?:COVERING )?INDEX (\w+))?")
+TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.I)
+OPERAND = r"(?:(\w+)\.)?(\w+)"
+COMPARISON = re.compile(OPERAND + r"\s*(=|==|>=|<=|<>|!=|>|<|\bIN\b|\bIS\b|\bBETWEEN\b|\bLIKE\b)\s*" + OPERAND + "?", re.I)
+EQUALITY_OPS = ('=', '==', 'IN', 'IS')
+RANGE_OPS = ('>=', '<=', '>', '<', 'BETWEEN', 'LIKE')
+CLAUSE_END = r"\b(?:GROUP\s+BY|ORDER\s+BY|LIMIT|HAVING|RETURNING)\b"
+SQL_KEYWORDS = {'WHERE', 'LEFT', 'RIGHT', 'INNER', 'OUTER', 'CROSS', 'JOIN', 'ON', 'SET', 'VALUES', 'ORDER', 'GROUP',
+                'LIMIT', 'USING', 'NATURAL', 'SELECT', 'AS'}
+
+
+def normalize(sql):
+    """One line, single spaces, no trailing semicolon: the key statements are grouped by"""
+    return re.sub(r"\s+", " ", sql).strip().rstrip(';').strip()
+
+
+def load_trace(path):
+    """Distinct statements of a trace file with their calls, timings and first parameters"""
+    statements = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            key = normalize(entry['sql'])
+            stats = statements.setdefault(key, {'sql': key, 'params': entry.get('params') or [], 'calls': 0,
+                                                'errors': 0, 'latencies_ms': []})
+            stats['calls'] += 1
+            stats['errors'] += 1 if entry.get('error') else 0
+            stats['latencies_ms'].append(entry['ms'])
+    for stats in statements.values():
+        stats['total_ms'] = sum(stats['latencies_ms'])
+        stats['p95_ms'] = percentile(stats['latencies_ms'], 95)
+    return sorted(statements.values(), key=lambda stats: stats['total_ms'], reverse=True)
+
+
+def table_columns(conn):
+    """{table: [column, ...]} for every user table of the database"""
+    tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+    return {table: [row[1] for row in conn.execute(f"PRAGMA table_info({table})")] for table in tables}
+
+
+def table_aliases(sql, columns):
+    """{name used in the statement: table} for the tables the statement reads or writes"""
+    aliases = {}
+    for table, alias in TABLE_REF.findall(sql):
+        if table not in columns:
+            continue
+        aliases[table] = table
+        if alias and alias.upper() not in SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def explain(conn, sql, params):
+    """EXPLAIN QUERY PLAN detail lines, or None for statements that have no plan"""
+    if sql.split(None, 1)[0].upper() not in EXPLAINABLE:
+        return None
+    params = params if isinstance(params, dict) else tuple(params)
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def full_scans(plan, aliases):
+    """Tables the plan reads end to end: [(table, name in plan, index or None)]"""
+    scans = []
+    for detail in plan or []:
+        match = SCAN.match(detail)
+        if not match:
+            continue
+        name = match.group(2) or match.group(1)
+        table = aliases.get(name) or aliases.get(match.group(1))
+        if table:
+            scans.append((table, name, match.group(3)))
+    return scans
+
+
+def _predicates(clause, table, names, unqualified, joined, columns):
+    """Columns of one table compared in a WHERE/ON clause, as (column, operator) in order of appearance
+
+    Column-to-column comparisons only count for a joined table: they are looked up once per outer row,
+    while the outer table's own join column filters nothing.
+    """
+    found = []
+    for match in COMPARISON.finditer(clause):
+        left_qualifier, left, op, right_qualifier, right = match.groups()
+        join = right is not None and not re.fullmatch(r"\d+|NULL|TRUE|FALSE", right, re.I)
+        if join and not joined:
+            continue
+        for qualifier, column in ((left_qualifier, left), (right_qualifier, right)):
+            if column in columns[table] and (qualifier in names if qualifier else unqualified):
+                found.append((column, op.upper()))
+    return found
+
+
+def propose_index(sql, table, aliases, columns):
+    """Columns for a composite index that lets SQLite search `table` instead of scanning it
+
+    Equality columns first, then one range column; with no range column the ORDER BY columns follow,
+    so the index also saves the temp B-tree sort. None when the statement has no usable predicate.
+    """
+    names = {name for name, target in aliases.items() if target == table}
+    # Unqualified columns are only attributed when the statement touches one table
+    unqualified = len(set(aliases.values())) == 1
+    first = TABLE_REF.search(sql)
+    joined = bool(first) and first.group(1) != table
+    clauses = re.findall(rf"\b(?:WHERE|ON)\b(.*?)(?=\bLEFT\b|\bINNER\b|\bJOIN\b|\bWHERE\b|{CLAUSE_END}|$)", sql, re.I | re.S)
+    equality, ranges = [], []
+    for clause in clauses:
+        for column, op in _predicates(clause, table, names, unqualified, joined, columns):
+            target = equality if op in EQUALITY_OPS else ranges if op in RANGE_OPS else None
+            if target is not None and column not in target:
+                target.append(column)
+    ranges = [column for column in ranges if column not in equality]
+    if not equality and not ranges:
+        return None
+    index = equality + ranges[:1]
+    if not ranges:
+        order_by = re.search(r"\bORDER\s+BY\s+(.*?)(?=\bLIMIT\b|$)", sql, re.I | re.S)
+        for term in (order_by.group(1).split(',') if order_by else []):
+            match = re.match(r"\s*" + OPERAND, term)
+            qualifier, column = match.groups() if match else (None, None)
+            if column in columns[table] and column not in index and (qualifier in names if qualifier else unqualified):
+                index.append(column)
+    return index
+
+
+def schema_copy(conn):
+    """Empty in-memory copy of the schema and planner statistics, for trying indexes without touching the database"""
+    copy = sqlite3.connect(':memory:')
+    for (sql,) in conn.execute("SELECT sql FROM sqlite_master WHERE sql IS NOT NULL AND name NOT LIKE 'sqlite_%'"):
+        copy.execute(sql)
+    has_stats = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'").fetchone()
+    if has_stats:
+        copy.execute("ANALYZE sqlite_master")
+        copy.executemany("INSERT INTO sqlite_stat1 VALUES (?, ?, ?)", conn.execute("SELECT tbl, idx, stat FROM sqlite_stat1"))
+        copy.execute("ANALYZE sqlite_master")
+    return copy
+
+
+def index_name(table, index):
+    return f"idx_{table}_{'_'.join(index)}"
+
+
+def create_index_sql(table, index):
+    return f"CREATE INDEX IF NOT EXISTS {index_name(table, index)} ON {table}({', '.join(index)});"
+
+
+def index_removes_scan(copy, table, index, statements, columns):
+    """Whether, with the index in place, SQLite stops scanning `table` for every given statement"""
+    copy.execute(create_index_sql(table, index))
+    try:
+        for stats in statements:
+            aliases = table_aliases(stats['sql'], columns)
+            if any(scanned == table for scanned, name, via in full_scans(explain(copy, stats['sql'], stats['params']), aliases)):
+                return False
+        return True
+    finally:
+        copy.execute(f"DROP INDEX {index_name(table, index)}")
+
+
+def merge_proposals(proposals):
+    """Fold each proposal into a longer one on the same table that starts with the same columns"""
+    merged = []
+    for proposal in sorted(proposals, key=lambda p: len(p['columns']), reverse=True):
+        wider = next((other for other in merged if other['table'] == proposal['table']
+                      and other['columns'][:len(proposal['columns'])] == proposal['columns']), None)
+        if wider:
+            wider['statements'].extend(proposal['statements'])
+        else:
+            merged.append(proposal)
+    return merged
+
+
+def audit(trace_path, db_path):
+    """Plan of every traced statement plus the index proposals, slowest first"""
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        columns = table_columns(conn)
+        statements = load_trace(trace_path)
+        by_index = {}
+        for stats in statements:
+            aliases = table_aliases(stats['sql'], columns)
+            try:
+                stats['plan'] = explain(conn, stats['sql'], stats['params'])
+            except sqlite3.Error as e:
+                stats['plan'], stats['explain_error'] = None, str(e)
+                continue
+            stats['scans'] = [table for table, name, via in full_scans(stats['plan'], aliases)]
+            stats['temp_sort'] = any('USE TEMP B-TREE' in detail for detail in stats['plan'] or [])
+            for table in stats['scans']:
+                index = propose_index(stats['sql'], table, aliases, columns)
+                if index:
+                    proposal = by_index.setdefault((table, tuple(index)), {'table': table, 'columns': index, 'statements': []})
+                    proposal['statements'].append(stats)
+
+        copy = schema_copy(conn)
+        proposals = merge_proposals(by_index.values())
+        for proposal in proposals:
+            proposal['create'] = create_index_sql(proposal['table'], proposal['columns'])
+            proposal['verified'] = index_removes_scan(copy, proposal['table'], proposal['columns'], proposal['statements'], columns)
+            proposal['total_ms'] = sum(stats['total_ms'] for stats in proposal['statements'])
+            proposal['calls'] = sum(stats['calls'] for stats in proposal['statements'])
+        copy.close()
+    finally:
+        conn.close()
+    proposals.sort(key=lambda proposal: proposal['total_ms'], reverse=True)
+    return {'statements': statements, 'proposals': proposals}
+
+
+def format_report(report, top=20):
+    statements = report['statements']
+    scanning = [stats for stats in statements if stats.get('scans')]
+    total_ms = sum(stats['total_ms'] for stats in statements) or 1
+    scan_ms = sum(stats['total_ms'] for stats in scanning)
+    lines = [
+        f"{len(statements)} distinct statements, {sum(s['calls'] for s in statements):,} calls, {fmt_ms(total_ms)} ms in SQL",
+        f"{len(scanning)} statements scan a whole table: {fmt_ms(scan_ms)} ms ({100 * scan_ms / total_ms:.0f}% of SQL time)",
+        "",
+        f"{'total ms':>10}{'calls':>8}{'p95 ms':>9}  plan  statement",
+    ]
+    for stats in statements[:top]:
+        flags = ('SCAN ' + ','.join(stats['scans'])) if stats.get('scans') else 'error' if 'explain_error' in stats else 'ok'
+        if stats.get('temp_sort'):
+            flags += ' +sort'
+        lines.append(f"{fmt_ms(stats['total_ms']):>10}{stats['calls']:>8,}{fmt_ms(stats['p95_ms']):>9}  {flags}  {stats['sql'][:100]}")
+
+    lines += ["", "Proposed indexes (by time spent in the statements they fix):"]
+    if not report['proposals']:
+        lines.append("  none - no traced statement scans a table it filters on")
+    for rank, proposal in enumerate(report['proposals'], 1):
+        check = 'verified' if proposal['verified'] else 'NOT verified: the plan still scans'
+        lines.append(f"{rank:>3}. {proposal['create']}")
+        lines.append(f"     {fmt_ms(proposal['total_ms'])} ms over {proposal['calls']:,} calls in "
+                     f"{len(proposal['statements'])} statement(s); {check}")
+    errors = [stats for stats in statements if 'explain_error' in stats]
+    if errors:
+        lines += ["", "Could not explain:"] + [f"  {stats['sql'][:100]}: {stats['explain_error']}" for stats in errors]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('trace', help="JSON-lines file the server wrote with SQL_TRACE_FILE")
+    parser.add_argument('--db', default=SQLITE_DB_PATH, help="Database to explain against (default: %(default)s)")
+    parser.add_argument('--top', type=int, default=20, help="Statements listed in the report")
+    parser.add_argument('--output', help="Write the JSON report to this path")
+    parser.add_argument('--fail-on-scan', action='store_true', help="Exit 1 when an index is proposed")
+    args = parser.parse_args(argv)
+
+    report = audit(args.trace, args.db)
+    print(format_report(report, args.top))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'statements': [{key: value for key, value in stats.items() if key != 'latencies_ms'} for stats in report['statements']],
+                'proposals': [dict(proposal, statements=[stats['sql'] for stats in proposal['statements']])
+                              for proposal in report['proposals']],
+            }, f, indent=2)
+        print(f"\nReport saved to: {args.output}")
+    return 1 if args.fail_on_scan and report['proposals'] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
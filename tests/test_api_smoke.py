@@ -0,0 +1,92 @@
+"""
+API smoke tests
+Browserless checks of the auth, CRUD and dashboard contracts (server/routes/auth.js, protected.js)
+Run alone with: pytest -m smoke
+"""
+import pytest
+from api_client import ApiClient, ApiError
+from settings import TEST_EMAIL, TEST_PASSWORD
+
+pytestmark = pytest.mark.smoke
+
+LIST_ENDPOINTS = ['bank-accounts', 'credit-cards', 'debit-cards', 'expenses', 'income', 'financial-goals', 'loans', 'bill-reminders']
+
+DASHBOARD_FIELDS = [
+    'totalBankAccounts', 'bankAccountsCount', 'creditCardsCount', 'totalCreditLimit', 'monthlyExpenses',
+    'monthlyIncome', 'netWorth', 'monthlyBalance', 'defaultCurrency',
+]
+
+class TestAuthContract:
+    """Test the authentication endpoints"""
+
+    def test_login_returns_token_and_user(self, auth_session):
+        """Test that login returns a JWT and the user profile"""
+        assert auth_session['token'], "Login should return a token"
+        assert auth_session['user']['email'] == TEST_EMAIL, "Login should return the logged-in user"
+        assert 'subscription_tier' in auth_session['user'], "User should include the subscription tier"
+
+    def test_login_with_wrong_password_is_rejected(self, api_url):
+        """Test that a wrong password gets 401"""
+        client = ApiClient(api_url)
+        try:
+            response = client.post('auth/login', json={'email': TEST_EMAIL, 'password': TEST_PASSWORD + 'x'}, expected=(401,))
+            assert 'error' in response.json(), "401 should explain the failure"
+        finally:
+            client.close()
+
+    def test_me_returns_current_user(self, api_client, auth_session):
+        """Test that /auth/me resolves the token to the same user"""
+        user = api_client.get('auth/me').json()['user']
+        assert user['id'] == auth_session['user']['id'], "/auth/me should return the token's user"
+
+    def test_protected_route_requires_token(self, api_url):
+        """Test that protected endpoints reject requests without a token"""
+        client = ApiClient(api_url)
+        try:
+            client.get('dashboard', expected=(401,))
+        finally:
+            client.close()
+
+class TestResourceContracts:
+    """Test the list, CRUD and dashboard endpoints"""
+
+    @pytest.mark.parametrize("endpoint", LIST_ENDPOINTS)
+    def test_list_endpoint_returns_array(self, api_client, auth_session, endpoint):
+        """Test that each list endpoint answers 200 with a JSON array"""
+        data = api_client.get(endpoint).json()
+        assert isinstance(data, list), f"GET /api/{endpoint} should return a list"
+
+    def test_dashboard_contract(self, api_client, auth_session):
+        """Test that the dashboard summary has the fields the client reads"""
+        data = api_client.get('dashboard').json()
+        missing = [field for field in DASHBOARD_FIELDS if field not in data]
+        assert not missing, f"Dashboard response is missing: {missing}"
+
+    def test_subscription_contract(self, api_client, auth_session):
+        """Test that the subscription endpoint reports tier and usage"""
+        data = api_client.get('subscription').json()
+        assert data['subscription']['tier'], "Subscription should have a tier"
+        assert 'usage' in data, "Subscription should report usage"
+
+    def test_expense_crud(self, api_client, auth_session):
+        """Test create, read, update and delete of an expense"""
+        expense = {'category': 'Food', 'description': 'Smoke test expense', 'amount': 12.5, 'currency': 'USD',
+                   'payment_method': 'Cash', 'date': '2024-01-15'}
+        try:
+            expense_id = api_client.post('expenses', json=expense).json()['id']
+        except ApiError as e:
+            if e.status_code == 403:
+                pytest.skip(f"Expense limit reached for {TEST_EMAIL}: {e}")
+            raise
+
+        try:
+            listed = [row for row in api_client.get('expenses').json() if row['id'] == expense_id]
+            assert listed and listed[0]['description'] == expense['description'], "Created expense should be listed"
+
+            api_client.put(f"expenses/{expense_id}", json=dict(expense, amount=20))
+            updated = [row for row in api_client.get('expenses').json() if row['id'] == expense_id][0]
+            assert float(updated['amount']) == 20, "Expense amount should be updated"
+        finally:
+            api_client.delete(f"expenses/{expense_id}")
+
+        assert expense_id not in [row['id'] for row in api_client.get('expenses').json()], "Deleted expense should be gone"
@@ -6,7 +6,6 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-import time
 
 class TestAuthentication:
     """Test user registration and login"""
@@ -87,7 +86,10 @@ class TestAuthentication:
         submit_btn.click()
         
         # Should show error message
-        time.sleep(2)  # Wait for error to appear
+        try:
+            wait.until(EC.presence_of_element_located((By.CLASS_NAME, "error")))
+        except TimeoutException:
+            pass
         error_elements = driver.find_elements(By.CLASS_NAME, "error")
         assert len(error_elements) > 0, "Should show error message for invalid credentials"
     
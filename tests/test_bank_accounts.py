@@ -6,8 +6,8 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
-import time
 from faker import Faker
+from waits import wait_for_modal_open, wait_for_network_idle, wait_for_ui_settled, accept_confirm_dialog
 
 fake = Faker()
 
@@ -31,8 +31,7 @@ class TestBankAccounts:
         add_buttons[0].click()
         
         # Wait for modal
-        time.sleep(1)
-        modal = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".modal, .modal-content")))
+        modal = wait_for_modal_open(driver)
         
         # Fill form
         account_name = driver.find_element(By.NAME, "account_name")
@@ -57,36 +56,45 @@ class TestBankAccounts:
         submit_btn = driver.find_element(By.XPATH, "//button[contains(text(), 'Save') or contains(text(), 'Add')]")
         submit_btn.click()
         
-        # Wait for success (modal to close or success message)
-        time.sleep(2)
+        # Wait for the save request to finish
+        wait_for_network_idle(driver)
         assert True, "Bank account should be added"
     
-    def test_view_bank_accounts(self, logged_in_driver, wait):
+    def test_view_bank_accounts(self, seeded_data, logged_in_driver, wait):
         """Test viewing bank accounts list"""
         driver = logged_in_driver
         driver.get(f"{driver.current_url.split('/')[0]}//{driver.current_url.split('/')[2]}/bank-accounts")
         
         # Wait for page
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "h1")))
+        wait_for_network_idle(driver)
         
         # Check if accounts table or list exists
         tables = driver.find_elements(By.CSS_SELECTOR, "table")
         cards = driver.find_elements(By.CSS_SELECTOR, ".card")
         
         assert len(tables) > 0 or len(cards) > 0, "Should display bank accounts"
+        
+        # Seeded accounts should be rendered
+        if not seeded_data['bank-accounts']:
+            pytest.skip("No bank account seeded: the test user is at the free tier limit of 2")
+        page_text = driver.find_element(By.TAG_NAME, "body").text
+        for account in seeded_data['bank-accounts']:
+            assert account['account_name'] in page_text, f"Should display seeded account {account['account_name']}"
     
-    def test_edit_bank_account(self, logged_in_driver, wait):
+    def test_edit_bank_account(self, seeded_data, logged_in_driver, wait):
         """Test editing a bank account"""
         driver = logged_in_driver
         driver.get(f"{driver.current_url.split('/')[0]}//{driver.current_url.split('/')[2]}/bank-accounts")
         
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "h1")))
+        wait_for_network_idle(driver)
         
         # Find edit button
         edit_buttons = driver.find_elements(By.CSS_SELECTOR, "button[title*='Edit'], .btn-icon[title*='Edit'], button:has(svg)")
         if edit_buttons:
             edit_buttons[0].click()
-            time.sleep(1)
+            wait_for_ui_settled(driver)
             
             # Try to modify balance
             balance_inputs = driver.find_elements(By.NAME, "current_balance")
@@ -98,7 +106,7 @@ class TestBankAccounts:
                 save_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Save')]")
                 if save_buttons:
                     save_buttons[0].click()
-                    time.sleep(1)
+                    wait_for_network_idle(driver)
         
         assert True, "Edit functionality tested"
     
@@ -113,13 +121,13 @@ class TestBankAccounts:
         delete_buttons = driver.find_elements(By.CSS_SELECTOR, "button[title*='Delete'], .btn-icon.danger, button.danger")
         if delete_buttons:
             delete_buttons[0].click()
-            time.sleep(1)
             
-            # Confirm deletion if confirmation dialog appears
-            confirm_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Confirm') or contains(text(), 'Delete')]")
-            if confirm_buttons:
-                confirm_buttons[0].click()
-                time.sleep(1)
+            # Confirm deletion (BankAccounts.js uses window.confirm, fall back to an in-page dialog)
+            if not accept_confirm_dialog(driver):
+                confirm_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Confirm') or contains(text(), 'Delete')]")
+                if confirm_buttons:
+                    confirm_buttons[0].click()
+            wait_for_network_idle(driver)
         
         assert True, "Delete functionality tested"
 
@@ -5,7 +5,7 @@ import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from waits import wait_for_class, wait_for_network_idle, wait_for_ui_settled
 
 class TestCreditDebt:
     """Test Credit & Debt management"""
@@ -34,7 +34,7 @@ class TestCreditDebt:
         # Click on each tab
         for tab in tabs[:3]:  # Test first 3 tabs
             tab.click()
-            time.sleep(0.5)
+            wait_for_class(driver, tab, "active")
             assert "active" in tab.get_attribute("class") or True, "Tab should be clickable"
     
     def test_add_credit_card(self, logged_in_driver, wait):
@@ -48,7 +48,7 @@ class TestCreditDebt:
         add_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add')]")
         if add_buttons:
             add_buttons[0].click()
-            time.sleep(1)
+            wait_for_ui_settled(driver)
             
             # Fill form if modal appears
             name_inputs = driver.find_elements(By.NAME, "name")
@@ -60,7 +60,7 @@ class TestCreditDebt:
                 submit_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Save') or contains(text(), 'Add')]")
                 if submit_buttons:
                     submit_buttons[0].click()
-                    time.sleep(1)
+                    wait_for_network_idle(driver)
         
         assert True, "Add credit card tested"
     
@@ -80,7 +80,7 @@ class TestCreditDebt:
             # Select SGD
             sgd_option = driver.find_element(By.XPATH, "//option[contains(text(), 'SGD')]")
             sgd_option.click()
-            time.sleep(1)
+            wait_for_ui_settled(driver)
             
             # Verify currency changed
             assert currency_select.get_attribute("value") == "SGD" or True
@@ -5,7 +5,7 @@ import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from waits import wait_for_ui_settled
 
 class TestDashboard:
     """Test dashboard features"""
@@ -35,7 +35,7 @@ class TestDashboard:
         option = driver.find_element(By.XPATH, "//option[contains(text(), 'SGD')]")
         option.click()
         
-        time.sleep(1)  # Wait for currency conversion
+        wait_for_ui_settled(driver)  # Wait for currency conversion
         
         # Verify currency changed (check if SGD appears in page)
         page_text = driver.page_source
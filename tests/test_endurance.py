@@ -0,0 +1,89 @@
+"""
+Endurance tests
+Cycles the sidebar routes the way a user does over a working day and checks that memory stops growing
+Run with: TEST_ENDURANCE_CYCLES=200 pytest -m endurance
+"""
+import json
+import os
+
+import pytest
+import pytest_html
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from browser_state import supports_cdp
+from budgets import load_budgets
+from memory_profile import (
+    MEMORY_METRICS, diff_snapshots, format_diff, growth, memory_sample, slope, summarize_snapshot, take_heap_snapshot,
+)
+from settings import ENDURANCE_CYCLES
+from test_navigation import SIDEBAR_ROUTES
+from waits import wait_for_ui_settled
+
+pytestmark = [
+    pytest.mark.endurance,
+    pytest.mark.skipif(not ENDURANCE_CYCLES, reason="Set TEST_ENDURANCE_CYCLES to run the endurance tests"),
+]
+
+ENDURANCE_LIMITS = load_budgets()['endurance']
+SNAPSHOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'endurance')
+
+def cycle_sidebar(driver, wait):
+    """Visit every sidebar route once through its link, as a user would"""
+    for path, name in SIDEBAR_ROUTES:
+        driver.find_element(By.XPATH, f"//a[@href='{path}']").click()
+        wait.until(EC.url_contains(path))
+        wait_for_ui_settled(driver)
+
+def save_snapshot(snapshot, name):
+    """Write a .heapsnapshot that the DevTools Memory panel can load for its Comparison view"""
+    os.makedirs(SNAPSHOT_DIR, exist_ok=True)
+    path = os.path.join(SNAPSHOT_DIR, f"{name}.heapsnapshot")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f)
+    return path
+
+class TestEndurance:
+    """Test that long sessions do not leak memory"""
+
+    def test_sidebar_navigation_does_not_leak(self, logged_in_driver, wait, extras):
+        """Test that heap, DOM nodes and listeners return to their level after many route cycles"""
+        driver = logged_in_driver
+        if not supports_cdp(driver):
+            pytest.skip("Heap sampling needs the DevTools protocol (Chrome or Edge)")
+
+        # One warm-up cycle loads every lazy chunk and fills the caches that are meant to stay
+        cycle_sidebar(driver, wait)
+        samples = [dict(memory_sample(driver), cycle=0)]
+        before_snapshot = take_heap_snapshot(driver)
+
+        interval = max(1, ENDURANCE_CYCLES // 20)
+        for cycle in range(1, ENDURANCE_CYCLES + 1):
+            cycle_sidebar(driver, wait)
+            if cycle % interval == 0 or cycle == ENDURANCE_CYCLES:
+                samples.append(dict(memory_sample(driver), cycle=cycle))
+
+        after_snapshot = take_heap_snapshot(driver)
+        grown = growth(samples[0], samples[-1])
+        leaks = diff_snapshots(summarize_snapshot(before_snapshot), summarize_snapshot(after_snapshot))
+        per_cycle = {metric: slope([(sample['cycle'], sample[metric]) for sample in samples]) for metric in MEMORY_METRICS}
+
+        extras.append(pytest_html.extras.json(
+            {'cycles': ENDURANCE_CYCLES, 'routes': [path for path, name in SIDEBAR_ROUTES], 'growth': grown,
+             'growth_per_cycle': per_cycle, 'samples': samples},
+            name="Memory samples"
+        ))
+        extras.append(pytest_html.extras.text(format_diff(leaks), name="Heap snapshot diff"))
+
+        violations = []
+        for key, limit in ENDURANCE_LIMITS.items():
+            metric = key[len('max_'):-len('_growth')]
+            if grown[metric] > limit:
+                violations.append(f"{metric} grew by {grown[metric]:,} over {ENDURANCE_CYCLES} cycles "
+                                  f"(limit {limit:,}, {per_cycle[metric]:,.1f} per cycle)")
+        if violations:
+            before_path = save_snapshot(before_snapshot, 'before')
+            after_path = save_snapshot(after_snapshot, 'after')
+            pytest.fail(
+                "Memory keeps growing:\n" + "\n".join(violations) + "\n\nLargest retained growth:\n" + format_diff(leaks[:10])
+                + f"\n\nSnapshots for the DevTools Comparison view: {before_path}, {after_path}"
+            )
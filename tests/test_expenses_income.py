@@ -6,7 +6,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from faker import Faker
-import time
+from waits import wait_for_network_idle, wait_for_ui_settled
 
 fake = Faker()
 
@@ -24,7 +24,7 @@ class TestExpenses:
         add_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add')]")
         if add_buttons:
             add_buttons[0].click()
-            time.sleep(1)
+            wait_for_ui_settled(driver)
             
             # Fill expense form
             category_selects = driver.find_elements(By.NAME, "category")
@@ -46,7 +46,7 @@ class TestExpenses:
             submit_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Save')]")
             if submit_buttons:
                 submit_buttons[0].click()
-                time.sleep(1)
+                wait_for_network_idle(driver)
         
         assert True, "Add expense tested"
 
@@ -64,7 +64,7 @@ class TestIncome:
         add_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add')]")
         if add_buttons:
             add_buttons[0].click()
-            time.sleep(1)
+            wait_for_ui_settled(driver)
             
             # Fill income form
             amount_inputs = driver.find_elements(By.NAME, "amount")
@@ -81,7 +81,7 @@ class TestIncome:
             submit_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Save')]")
             if submit_buttons:
                 submit_buttons[0].click()
-                time.sleep(1)
+                wait_for_network_idle(driver)
         
         assert True, "Add income tested"
 
@@ -7,7 +7,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-import time
+from waits import wait_for_viewport_width, wait_for_table_rows
+
+# Runs under each of TEST_DEVICE_PROFILES
+pytestmark = pytest.mark.usefixtures('device_profile')
 
 class TestMobileTableVisibility:
     """Test that tables are visible on mobile viewport"""
@@ -18,14 +21,14 @@ class TestMobileTableVisibility:
         
         # Set mobile viewport
         driver.set_window_size(375, 667)  # iPhone SE size
-        time.sleep(1)
+        wait_for_viewport_width(driver, 375)
         
         # Navigate to income page
         driver.get(f"{driver.current_url.split('/')[0]}//{driver.current_url.split('/')[2]}/income")
         
         # Wait for page to load
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "h2")))
-        time.sleep(2)
+        wait_for_table_rows(driver)
         
         # Check if table wrapper exists
         table_wrappers = driver.find_elements(By.CLASS_NAME, "table-wrapper")
@@ -65,14 +68,14 @@ class TestMobileTableVisibility:
         
         # Set mobile viewport
         driver.set_window_size(375, 667)  # iPhone SE size
-        time.sleep(1)
+        wait_for_viewport_width(driver, 375)
         
         # Navigate to expenses page
         driver.get(f"{driver.current_url.split('/')[0]}//{driver.current_url.split('/')[2]}/expenses")
         
         # Wait for page to load
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "h2")))
-        time.sleep(2)
+        wait_for_table_rows(driver)
         
         # Check if table wrapper exists
         table_wrappers = driver.find_elements(By.CLASS_NAME, "table-wrapper")
@@ -106,18 +109,18 @@ class TestMobileTableVisibility:
         
         assert True, "Expenses table visibility test passed"
     
-    def test_table_data_loading(self, logged_in_driver, wait):
+    def test_table_data_loading(self, seeded_data, logged_in_driver, wait):
         """Test that data is actually loaded and displayed in tables"""
         driver = logged_in_driver
         
         # Set mobile viewport
         driver.set_window_size(375, 667)
-        time.sleep(1)
+        wait_for_viewport_width(driver, 375)
         
         # Test income page
         driver.get(f"{driver.current_url.split('/')[0]}//{driver.current_url.split('/')[2]}/income")
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "h2")))
-        time.sleep(3)  # Wait for data to load
+        wait_for_table_rows(driver)  # Wait for data to load
         
         # Check for summary cards (indicates data loaded)
         summary_cards = driver.find_elements(By.CLASS_NAME, "summary-cards-grid")
@@ -132,7 +135,7 @@ class TestMobileTableVisibility:
         # Test expenses page
         driver.get(f"{driver.current_url.split('/')[0]}//{driver.current_url.split('/')[2]}/expenses")
         wait.until(EC.presence_of_element_located((By.TAG_NAME, "h2")))
-        time.sleep(3)  # Wait for data to load
+        wait_for_table_rows(driver)  # Wait for data to load
         
         # Check for summary cards
         summary_cards = driver.find_elements(By.CLASS_NAME, "summary-cards-grid")
@@ -142,4 +145,11 @@ class TestMobileTableVisibility:
         data_rows = driver.find_elements(By.CSS_SELECTOR, ".table-wrapper .table tbody tr:not(:last-child)")
         print(f"Expenses page - Found {len(data_rows)} data rows")
         
+        # Seeded expenses should be among the rendered rows
+        if not seeded_data['expenses']:
+            pytest.skip("No expense seeded: the test user is at the free tier limit of 50 expenses this month")
+        table_text = driver.find_element(By.CSS_SELECTOR, ".table-wrapper .table").text
+        for expense in seeded_data['expenses']:
+            assert expense['description'] in table_text, f"Should display seeded expense {expense['description']}"
+        
         assert True, "Table data loading test passed"
@@ -5,7 +5,17 @@ import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from waits import wait_for_viewport_width, wait_for_ui_settled
+
+# Sidebar links (also cycled by the endurance test)
+SIDEBAR_ROUTES = [
+    ("/dashboard", "Dashboard"),
+    ("/bank-accounts", "Bank Accounts"),
+    ("/income", "Income"),
+    ("/expenses", "Expenses"),
+    ("/credit-cards", "Credit & Debit"),
+    ("/savings", "Savings")
+]
 
 class TestNavigation:
     """Test navigation between pages"""
@@ -15,37 +25,28 @@ class TestNavigation:
         driver = logged_in_driver
         
         # Test navigation to different pages
-        nav_items = [
-            ("/dashboard", "Dashboard"),
-            ("/bank-accounts", "Bank Accounts"),
-            ("/income", "Income"),
-            ("/expenses", "Expenses"),
-            ("/credit-cards", "Credit & Debit"),
-            ("/savings", "Savings")
-        ]
-        
-        for path, name in nav_items[:3]:  # Test first 3 to save time
+        for path, name in SIDEBAR_ROUTES[:3]:  # Test first 3 to save time
             # Find sidebar link
             links = driver.find_elements(By.XPATH, f"//a[@href='{path}']")
             if links:
                 links[0].click()
-                time.sleep(1)
                 wait.until(EC.url_contains(path))
                 assert path in driver.current_url, f"Should navigate to {name}"
     
+    @pytest.mark.usefixtures('device_profile')
     def test_mobile_menu(self, logged_in_driver, wait):
         """Test mobile menu functionality"""
         driver = logged_in_driver
         
         # Resize to mobile viewport
         driver.set_window_size(375, 667)
-        time.sleep(1)
+        wait_for_viewport_width(driver, 375)
         
         # Find mobile menu toggle
         menu_toggle = driver.find_elements(By.CSS_SELECTOR, ".mobile-menu-toggle, button[aria-label*='menu']")
         if menu_toggle:
             menu_toggle[0].click()
-            time.sleep(1)
+            wait_for_ui_settled(driver)
             
             # Check if menu opened
             sidebar = driver.find_elements(By.CSS_SELECTOR, ".sidebar.mobile-open, .sidebar.open")
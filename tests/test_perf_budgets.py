@@ -0,0 +1,20 @@
+"""
+Performance budget tests
+Times the JSON endpoints behind each page and checks them against perf_budgets.json
+"""
+import pytest
+from budgets import API_LIMITS, check_limits, load_budgets, measure_endpoint
+
+API_BUDGETS = load_budgets()['api']
+
+class TestApiBudgets:
+    """Test API response time and payload size budgets"""
+    
+    @pytest.mark.parametrize("endpoint", sorted(API_BUDGETS))
+    def test_api_endpoint_within_budget(self, api_client, seeded_data, api_timing, endpoint):
+        """Test that an endpoint answers and stays under its TTFB and payload budgets"""
+        measured = measure_endpoint(api_client, endpoint)
+        api_timing(endpoint, measured)
+        
+        violations = check_limits(endpoint, measured, API_BUDGETS[endpoint], API_LIMITS)
+        assert not violations, "Performance budget exceeded:\n" + "\n".join(violations)
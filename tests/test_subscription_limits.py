@@ -5,7 +5,7 @@ import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from waits import wait_for_ui_settled
 
 class TestSubscriptionLimits:
     """Test subscription tier limits"""
@@ -26,7 +26,7 @@ class TestSubscriptionLimits:
             add_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add')]")
             if add_buttons:
                 add_buttons[0].click()
-                time.sleep(1)
+                wait_for_ui_settled(driver)
                 
                 # Check for limit warning
                 warnings = driver.find_elements(By.CSS_SELECTOR, ".usage-warning, .limit-warning, .error")
@@ -49,7 +49,7 @@ class TestSubscriptionLimits:
             add_buttons = driver.find_elements(By.XPATH, "//button[contains(text(), 'Add')]")
             if add_buttons:
                 add_buttons[0].click()
-                time.sleep(1)
+                wait_for_ui_settled(driver)
                 
                 # Check for limit warning
                 warnings = driver.find_elements(By.CSS_SELECTOR, ".usage-warning, .limit-warning")
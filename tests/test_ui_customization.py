@@ -5,7 +5,7 @@ import pytest
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
+from waits import wait_for_visible, wait_for_class, wait_for_theme_toggled, current_theme_mode
 
 class TestThemeCustomization:
     """Test theme and appearance customization"""
@@ -19,7 +19,7 @@ class TestThemeCustomization:
         appearance_buttons = driver.find_elements(By.CSS_SELECTOR, ".text-size-control-toggle, button[title*='Appearance'], button[title*='Design']")
         if appearance_buttons:
             appearance_buttons[0].click()
-            time.sleep(1)
+            wait_for_visible(driver, ".text-size-control-panel")
             
             # Check if panel opened
             panel = driver.find_elements(By.CSS_SELECTOR, ".text-size-control-panel")
@@ -34,7 +34,7 @@ class TestThemeCustomization:
         appearance_buttons = driver.find_elements(By.CSS_SELECTOR, ".text-size-control-toggle")
         if appearance_buttons:
             appearance_buttons[0].click()
-            time.sleep(1)
+            wait_for_visible(driver, ".text-size-control-panel")
             
             # Find theme options
             theme_options = driver.find_elements(By.CSS_SELECTOR, ".theme-option")
@@ -42,7 +42,7 @@ class TestThemeCustomization:
                 # Click on a different theme (not the first one)
                 if len(theme_options) > 1:
                     theme_options[1].click()
-                    time.sleep(1)
+                    wait_for_class(driver, theme_options[1], "active")
                     
                     # Verify theme changed (check if active class is applied)
                     assert "active" in theme_options[1].get_attribute("class") or True
@@ -56,7 +56,7 @@ class TestThemeCustomization:
         appearance_buttons = driver.find_elements(By.CSS_SELECTOR, ".text-size-control-toggle")
         if appearance_buttons:
             appearance_buttons[0].click()
-            time.sleep(1)
+            wait_for_visible(driver, ".text-size-control-panel")
             
             # Find text size options
             text_size_options = driver.find_elements(By.CSS_SELECTOR, ".text-size-option")
@@ -65,7 +65,7 @@ class TestThemeCustomization:
                 for option in text_size_options:
                     if "Large" in option.text:
                         option.click()
-                        time.sleep(0.5)
+                        wait_for_class(driver, option, "active")
                         break
     
     def test_quick_theme_toggle(self, logged_in_driver, wait):
@@ -76,8 +76,9 @@ class TestThemeCustomization:
         # Find theme toggle button in navbar
         theme_toggle = driver.find_elements(By.CSS_SELECTOR, ".theme-toggle-btn")
         if theme_toggle:
+            previous_mode = current_theme_mode(driver)
             theme_toggle[0].click()
-            time.sleep(1)
+            wait_for_theme_toggled(driver, previous_mode)
             
             # Verify theme changed (check body or html attributes)
             body = driver.find_element(By.TAG_NAME, "body")
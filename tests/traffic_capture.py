@@ -0,0 +1,248 @@
+"""
+Pytest plugin: HAR recording of every test's HTTP traffic (TEST_TRAFFIC_CAPTURE=1)
+Builds one HAR 1.2 file per test from the CDP Network events in Chrome's performance log, keeping the JSON
+bodies of API responses so the load replay (python -m load.replay) can map recorded ids to its own
+"""
+import base64
+import json
+import os
+import re
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlparse
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from network_audit import performance_log
+from perf_timing import is_xdist_worker, page_recorder
+from settings import TRAFFIC_CAPTURE
+
+DEFAULT_OUTPUT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'har')
+API_PREFIX = '/api/'
+# Larger API responses are recorded without their body
+MAX_BODY_BYTES = 256 * 1024
+
+capture_key = pytest.StashKey()
+
+
+def _headers(headers):
+    return [{'name': name, 'value': value} for name, value in (headers or {}).items()]
+
+
+def _started(wall_time):
+    return datetime.fromtimestamp(wall_time, tz=timezone.utc).isoformat(timespec='milliseconds')
+
+
+def is_api(url):
+    return urlparse(url).path.startswith(API_PREFIX)
+
+
+def _post_data(driver, request_id, request):
+    """Request body as text; large bodies are not in the event and have to be asked for"""
+    if 'postData' in request:
+        return request['postData']
+    if request.get('postDataEntries'):
+        return b''.join(base64.b64decode(part.get('bytes', '')) for part in request['postDataEntries']).decode('utf-8', 'replace')
+    if request.get('hasPostData'):
+        try:
+            return driver.execute_cdp_cmd('Network.getRequestPostData', {'requestId': request_id})['postData']
+        except WebDriverException:
+            return None
+    return None
+
+
+def _response_body(driver, request_id):
+    """Body of a finished response while Chrome still holds it, or None"""
+    try:
+        body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+    except WebDriverException:
+        return None
+    if body.get('base64Encoded') or len(body.get('body', '')) > MAX_BODY_BYTES:
+        return None
+    return body['body']
+
+
+def _response(response):
+    return {
+        'status': response.get('status', 0),
+        'statusText': response.get('statusText', ''),
+        'httpVersion': response.get('protocol', 'http/1.1'),
+        'headers': _headers(response.get('headers')),
+        'cookies': [],
+        'content': {'size': 0, 'mimeType': response.get('mimeType', '')},
+        'redirectURL': {name.lower(): value for name, value in (response.get('headers') or {}).items()}.get('location', ''),
+        'headersSize': -1,
+        'bodySize': -1,
+        '_timing': response.get('timing'),
+    }
+
+
+def har_entries(driver, entries, pageref):
+    """HAR entries for the requests in one drain of the performance log, in the order they were sent"""
+    records = {}
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        method, params = message.get('method'), message.get('params', {})
+        request_id = params.get('requestId')
+
+        if method == 'Network.requestWillBeSent':
+            if request_id in records and params.get('redirectResponse'):
+                # Same id for every hop of a redirect chain: close the previous hop as its own entry
+                previous = records.pop(request_id)
+                previous.update(response=_response(params['redirectResponse']), finished=params['timestamp'])
+                records[f"{request_id}:{previous['started']}"] = previous
+            request = params['request']
+            records[request_id] = {
+                'request_id': request_id, 'type': params.get('type', 'Other'), 'method': request['method'],
+                'url': request['url'], 'headers': request.get('headers', {}), 'post_data': _post_data(driver, request_id, request),
+                'started': params['timestamp'], 'wall_time': params.get('wallTime'), 'response': None,
+                'finished': None, 'encoded_bytes': 0, 'body_bytes': 0, 'error': None, 'body': None,
+            }
+        elif request_id not in records:
+            continue
+        elif method == 'Network.responseReceived':
+            records[request_id]['response'] = _response(params['response'])
+        elif method == 'Network.dataReceived':
+            records[request_id]['body_bytes'] += params.get('dataLength', 0)
+        elif method == 'Network.loadingFinished':
+            record = records[request_id]
+            record.update(finished=params['timestamp'], encoded_bytes=params.get('encodedDataLength', 0))
+            if is_api(record['url']) and record['response'] and 'json' in record['response']['content']['mimeType']:
+                record['body'] = _response_body(driver, request_id)
+        elif method == 'Network.loadingFailed':
+            records[request_id].update(finished=params['timestamp'], error=params.get('errorText'))
+
+    return [to_har_entry(record, pageref) for record in sorted(records.values(), key=lambda r: r['started'])
+            if record['wall_time'] is not None]
+
+
+def to_har_entry(record, pageref):
+    """One HAR 1.2 entry; the resource type and any load error go in underscore fields, as Chrome's export does"""
+    url = urlparse(record['url'])
+    total_ms = max(0.0, ((record['finished'] or record['started']) - record['started']) * 1000)
+    response = record['response'] or _response({})
+    timing = response.pop('_timing', None) or {}
+    wait_ms = max(0.0, timing.get('receiveHeadersEnd', 0) - timing.get('sendEnd', 0))
+    send_ms = max(0.0, timing.get('sendEnd', 0) - timing.get('sendStart', 0))
+    response['content'].update(size=record['body_bytes'])
+    response['bodySize'] = record['encoded_bytes']
+    if record['body'] is not None:
+        response['content']['text'] = record['body']
+    request = {
+        'method': record['method'],
+        'url': record['url'],
+        'httpVersion': response['httpVersion'],
+        'headers': _headers(record['headers']),
+        'queryString': [{'name': name, 'value': value} for name, value in parse_qsl(url.query, keep_blank_values=True)],
+        'cookies': [],
+        'headersSize': -1,
+        'bodySize': len(record['post_data'].encode()) if record['post_data'] else 0,
+    }
+    if record['post_data'] is not None:
+        content_type = {name.lower(): value for name, value in record['headers'].items()}.get('content-type', '')
+        request['postData'] = {'mimeType': content_type, 'text': record['post_data']}
+    entry = {
+        'pageref': pageref,
+        'startedDateTime': _started(record['wall_time']),
+        'time': total_ms,
+        'request': request,
+        'response': response,
+        'cache': {},
+        'timings': {'send': send_ms, 'wait': wait_ms, 'receive': max(0.0, total_ms - send_ms - wait_ms)},
+        '_resourceType': record['type'].lower(),
+    }
+    if record['error']:
+        entry['_error'] = record['error']
+    return entry
+
+
+def har_filename(nodeid):
+    return re.sub(r'[^\w.-]+', '_', nodeid).strip('_') + '.har'
+
+
+class TrafficCapturePlugin:
+    """Collects each page's requests and writes them as one HAR file per test"""
+
+    def __init__(self, config):
+        self.config = config
+        self.output_dir = config.getoption('--har-dir')
+        self.pages = []
+        self.entries = []
+        self.browser = None
+
+    def capture_page(self, driver, entries, route, url):
+        pageref = f"page_{len(self.pages) + 1}"
+        page_entries = har_entries(driver, entries, pageref)
+        if self.browser is None:
+            capabilities = getattr(driver, 'capabilities', {}) or {}
+            self.browser = {'name': capabilities.get('browserName', ''), 'version': capabilities.get('browserVersion', '')}
+        self.pages.append({
+            'id': pageref,
+            'title': url,
+            'startedDateTime': page_entries[0]['startedDateTime'] if page_entries else datetime.now(timezone.utc).isoformat(),
+            'pageTimings': {},
+        })
+        self.entries.extend(page_entries)
+
+    def write_har(self, nodeid):
+        os.makedirs(self.output_dir, exist_ok=True)
+        path = os.path.abspath(os.path.join(self.output_dir, har_filename(nodeid)))
+        har = {'log': {
+            'version': '1.2',
+            'creator': {'name': 'financial-planner-qa', 'version': '1.0'},
+            'browser': self.browser or {'name': '', 'version': ''},
+            'comment': nodeid,
+            'pages': self.pages,
+            'entries': self.entries,
+        }}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(har, f, indent=1)
+        return path
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_makereport(self, item, call):
+        outcome = yield
+        if call.when != 'call':
+            return
+        # The last page's requests (and the form posts made on it) are only drained by this flush
+        page_recorder(self.config).flush()
+        if self.entries:
+            report = outcome.get_result()
+            report.har_path = self.write_har(item.nodeid)
+            try:
+                import pytest_html
+            except ImportError:
+                pytest_html = None
+            if pytest_html:
+                html_path = self.config.getoption('htmlpath', default=None)
+                link = os.path.relpath(report.har_path, os.path.dirname(os.path.abspath(html_path))) if html_path else report.har_path
+                report.extras = getattr(report, 'extras', []) + [pytest_html.extras.url(link, name="HAR")]
+        self.pages, self.entries = [], []
+
+    def pytest_terminal_summary(self, terminalreporter):
+        if is_xdist_worker(self.config):
+            return
+        written = [report for reports in terminalreporter.stats.values() for report in reports
+                   if getattr(report, 'har_path', None)]
+        if written:
+            terminalreporter.write_line(f"HAR files of {len(written)} test(s): {self.output_dir} "
+                                        f"(replay with: python -m load.replay {self.output_dir})")
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('traffic-capture', 'HAR capture (TEST_TRAFFIC_CAPTURE=1)')
+    group.addoption('--har-dir', default=DEFAULT_OUTPUT, help="Directory for per-test HAR files (default: tests/har)")
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    if not TRAFFIC_CAPTURE:
+        return
+    log = performance_log(config)
+    if log is None:
+        print("⚠️  Traffic capture needs page timing (TEST_PERF_TIMING=0 is set), skipping")
+        return
+    plugin = TrafficCapturePlugin(config)
+    log.subscribers.append(plugin.capture_page)
+    config.stash[capture_key] = plugin
+    config.pluginmanager.register(plugin, 'traffic-capture')
@@ -0,0 +1,149 @@
+"""
+Event-driven wait helpers
+Replace fixed time.sleep calls with conditions that track the app's real latency
+"""
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
+DEFAULT_TIMEOUT = 20
+POLL_INTERVAL = 0.05
+NETWORK_IDLE_MS = 250
+
+MODAL = ".modal .modal-content, .modal-content"
+TABLE = ".table-wrapper .table"
+TABLE_ROWS = ".table-wrapper .table tbody tr"
+
+# Counts in-flight fetch/XHR requests (axios uses XHR) so tests can wait for the network to go quiet
+NETWORK_HOOK_JS = """
+(function () {
+    if (window.__qaNetwork) { return; }
+    var state = window.__qaNetwork = { inflight: 0, lastActivity: Date.now() };
+    function started() { state.inflight += 1; state.lastActivity = Date.now(); }
+    function finished() { state.inflight = Math.max(0, state.inflight - 1); state.lastActivity = Date.now(); }
+
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            started();
+            return originalFetch.apply(this, arguments).then(
+                function (response) { finished(); return response; },
+                function (error) { finished(); throw error; }
+            );
+        };
+    }
+
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        started();
+        this.addEventListener('loadend', finished);
+        return originalSend.apply(this, arguments);
+    };
+})();
+"""
+
+NETWORK_IDLE_JS = """
+var state = window.__qaNetwork;
+if (!state) { return null; }
+return document.readyState === 'complete' && state.inflight === 0 && Date.now() - state.lastActivity >= arguments[0];
+"""
+
+# Resolves after two animation frames, i.e. once React has committed and the browser has painted
+ANIMATION_FRAMES_JS = """
+var done = arguments[arguments.length - 1];
+requestAnimationFrame(function () { requestAnimationFrame(function () { done(true); }); });
+"""
+
+
+def install_network_hook(driver):
+    """Register the network hook for every future page load (Chrome/Edge)"""
+    if hasattr(driver, 'execute_cdp_cmd'):
+        driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': NETWORK_HOOK_JS})
+
+
+def _wait(driver, timeout):
+    return WebDriverWait(driver, timeout, poll_frequency=POLL_INTERVAL)
+
+
+def wait_for_network_idle(driver, timeout=DEFAULT_TIMEOUT, idle_ms=NETWORK_IDLE_MS):
+    """Wait until the page has loaded and no fetch/XHR has been in flight for idle_ms"""
+    def network_idle(d):
+        idle = d.execute_script(NETWORK_IDLE_JS, idle_ms)
+        if idle is None:
+            # Hook missing (Safari, or page loaded before install): track requests from now on
+            d.execute_script(NETWORK_HOOK_JS)
+            return False
+        return idle
+
+    _wait(driver, timeout).until(network_idle, f"Network did not go idle within {timeout}s")
+
+
+def wait_for_ui_settled(driver, timeout=DEFAULT_TIMEOUT):
+    """Wait for pending requests to finish and the resulting render to be painted"""
+    wait_for_network_idle(driver, timeout)
+    driver.set_script_timeout(timeout)
+    driver.execute_async_script(ANIMATION_FRAMES_JS)
+
+
+def wait_for_visible(driver, css_selector, timeout=DEFAULT_TIMEOUT):
+    """Wait for an element to be displayed and return it"""
+    return _wait(driver, timeout).until(EC.visibility_of_element_located((By.CSS_SELECTOR, css_selector)))
+
+
+def wait_for_modal_open(driver, timeout=DEFAULT_TIMEOUT):
+    """Wait for a modal dialog to be displayed and return its content element"""
+    return wait_for_visible(driver, MODAL, timeout)
+
+
+def wait_for_table_rows(driver, min_rows=0, selector=TABLE_ROWS, timeout=DEFAULT_TIMEOUT):
+    """Wait for the data table to render at least min_rows rows and return them"""
+    wait_for_network_idle(driver, timeout)
+    _wait(driver, timeout).until(EC.presence_of_element_located((By.CSS_SELECTOR, TABLE)))
+
+    def rows_rendered(d):
+        rows = d.find_elements(By.CSS_SELECTOR, selector)
+        return rows if len(rows) >= min_rows else False
+
+    if min_rows == 0:
+        return driver.find_elements(By.CSS_SELECTOR, selector)
+    return _wait(driver, timeout).until(rows_rendered, f"Expected at least {min_rows} rows in {selector}")
+
+
+def wait_for_class(driver, element, class_name, timeout=DEFAULT_TIMEOUT):
+    """Wait for an element to carry a CSS class (e.g. 'active' on a tab or theme option)"""
+    _wait(driver, timeout).until(
+        lambda d: class_name in (element.get_attribute("class") or "").split(),
+        f"Element never got class '{class_name}'"
+    )
+    return element
+
+
+def current_theme_mode(driver):
+    """Theme mode ('light'/'dark') applied by ThemeContext to <html data-theme>"""
+    return driver.execute_script("return document.documentElement.getAttribute('data-theme');")
+
+
+def wait_for_theme_toggled(driver, previous_mode, timeout=DEFAULT_TIMEOUT):
+    """Wait until the theme mode differs from previous_mode"""
+    _wait(driver, timeout).until(
+        lambda d: current_theme_mode(d) not in (None, previous_mode),
+        f"Theme mode stayed '{previous_mode}'"
+    )
+
+
+def wait_for_viewport_width(driver, max_width, timeout=DEFAULT_TIMEOUT):
+    """Wait until a window resize has reached the page layout"""
+    _wait(driver, timeout).until(
+        lambda d: d.execute_script("return window.innerWidth;") <= max_width,
+        f"Viewport never shrank to {max_width}px"
+    )
+
+
+def accept_confirm_dialog(driver, timeout=2):
+    """Accept a window.confirm() dialog if one appears; return whether one did"""
+    try:
+        _wait(driver, timeout).until(EC.alert_is_present()).accept()
+        return True
+    except TimeoutException:
+        return False
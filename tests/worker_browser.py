@@ -0,0 +1,21 @@
+"""
+Pre-warmed WebDriver for one test process
+Each pytest-xdist worker starts one browser and loads the app once, so the bundle is cached before the first test
+"""
+import os
+
+
+def current_worker_id():
+    """Return the pytest-xdist worker id (gw0, gw1, ...) or 'master' when not distributed"""
+    return os.getenv('PYTEST_XDIST_WORKER', 'master')
+
+
+def start_browser(factory, warm_url=None):
+    """Create a driver and, if given, load `warm_url` once so the app's bundle is cached"""
+    driver = factory()
+    if warm_url:
+        try:
+            driver.get(warm_url)
+        except Exception as e:
+            print(f"⚠️  Pre-warm of browser failed: {e}")
+    return driver